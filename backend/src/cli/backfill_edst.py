@@ -0,0 +1,27 @@
+"""UT日ごとのEDstを計算し、Storage/edstに保存するコマンド
+
+Usage:
+  inv backfill-edst --start 2014-01-01 --end 2014-12-31
+"""
+
+import argparse
+
+from src.service.ee_index.calc_edst import backfill_edst_store
+from src.utils.date import str_to_datetime
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--start", required=True, help="YYYY-MM-DD (UT)")
+    parser.add_argument("--end", required=True, help="YYYY-MM-DD (UT)")
+    parser.add_argument("--force", action="store_true", help="保存済みの日も再計算する")
+    args = parser.parse_args()
+
+    start_date = str_to_datetime(args.start).date()
+    end_date = str_to_datetime(args.end).date()
+    written = backfill_edst_store(start_date, end_date, force=args.force)
+    print(f"[Info] {written} days of EDst were saved.")
+
+
+if __name__ == "__main__":
+    main()
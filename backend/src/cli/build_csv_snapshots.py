@@ -0,0 +1,81 @@
+"""Storage内のCSVから、読み込み用のスナップショット(xxx.snapshot.npz, xxx.snapshot/)を作成するコマンド
+
+スナップショットは読み込み時にも自動で作成・更新されるため、このコマンドは
+デプロイ時などにまとめて作成しておく場合に使用する。
+
+Usage:
+  inv build-csv-snapshots
+"""
+
+import argparse
+import os
+
+from src.repository.csv_snapshot import (
+    CsvParser,
+    build_mmap_snapshot,
+    build_snapshot,
+    load_csv_columns,
+    load_csv_columns_mmap,
+)
+from src.repository.ee_from_kato import KatoEeRepository, read_kato_csv
+from src.repository.eej_event_category import (
+    EejCategoryRepository,
+    read_eej_category_csv,
+)
+from src.repository.peak_euel import (
+    PeakEuelRepository,
+    peak_euel_csv_paths,
+    read_peak_euel_csv,
+)
+from src.repository.peculiar_eej import PeculiarEejRepository, read_peculiar_eej_csv
+from src.service.kp import read_kp_csv
+from src.service.ssw import read_ssw_csv
+from src.service.sunspot import read_sunspot_csv
+from src.utils.path import generate_parent_abs_path
+
+
+def snapshot_sources() -> list[tuple[str, CsvParser]]:
+    sources: list[tuple[str, CsvParser]] = [
+        (generate_parent_abs_path("/Storage/kpdata.csv"), read_kp_csv),
+        (generate_parent_abs_path("/Storage/sunspot.csv"), read_sunspot_csv),
+        (generate_parent_abs_path("/Storage/ssw.csv"), read_ssw_csv),
+        (EejCategoryRepository().csv_path, read_eej_category_csv),
+        (PeculiarEejRepository().csv_path, read_peculiar_eej_csv),
+    ]
+    for csv_path in peak_euel_csv_paths(PeakEuelRepository().csv_dir):
+        sources.append((csv_path, read_peak_euel_csv))
+    return sources
+
+
+def mmap_snapshot_sources() -> list[tuple[str, CsvParser]]:
+    """memmapで読み込むCSV"""
+    return [
+        (csv_path, read_kato_csv)
+        for csv_path in KatoEeRepository.STATION_PATHS.values()
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--force", action="store_true", help="最新のスナップショットも作り直す"
+    )
+    args = parser.parse_args()
+
+    for sources, build, load in (
+        (snapshot_sources(), build_snapshot, load_csv_columns),
+        (mmap_snapshot_sources(), build_mmap_snapshot, load_csv_columns_mmap),
+    ):
+        for csv_path, parse in sources:
+            if not os.path.exists(csv_path):
+                print(f"[Info] Skipped (not found): {csv_path}")
+                continue
+            if args.force:
+                build(csv_path, parse)
+            else:
+                load(csv_path, parse)
+            print(f"[Info] Snapshot is up to date: {csv_path}")
+
+
+if __name__ == "__main__":
+    main()
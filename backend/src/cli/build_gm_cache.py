@@ -0,0 +1,42 @@
+"""観測点・年ごとのh/d/z/fのキャッシュをStorage/gm_cacheに作成するコマンド
+
+Usage:
+  inv build-gm-cache --start-year 2014 --end-year 2015
+  inv build-gm-cache --start-year 2014 --end-year 2014 --stations ANC,HUA
+"""
+
+import argparse
+
+from src.domain.magdas_station import EeIndexStation
+from src.repository.gm_cache import GMYearCacheRepository
+from src.repository.gm_data import build_gm_year_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--start-year", type=int, required=True)
+    parser.add_argument("--end-year", type=int, required=True)
+    parser.add_argument(
+        "--stations", default="all", help="カンマ区切りの観測点コード (default: all)"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="最新のキャッシュも作り直す"
+    )
+    args = parser.parse_args()
+
+    if args.stations == "all":
+        stations = list(EeIndexStation)
+    else:
+        stations = [EeIndexStation[code] for code in args.stations.split(",")]
+
+    cache = GMYearCacheRepository()
+    for station in stations:
+        for year in range(args.start_year, args.end_year + 1):
+            if not args.force and cache.is_fresh(station.code, year):
+                continue
+            print(f"[Info] Building cache: {station.code} {year}")
+            build_gm_year_cache(station.code, year)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""複数の観測点のEE-indexを、観測点・月ごとのIAGA形式のファイルにまとめたzipを作成するコマンド
+
+Usage:
+  inv export-ee-bulk --start 2014-01-01 --end 2014-12-31 --output ee_index_2014.zip
+  inv export-ee-bulk --start 2014-01-01 --end 2014-01-31 --stations ANC,HUA --output out.zip
+"""
+
+import argparse
+
+from src.usecase.ee_bulk_export import EeBulkExportUsecase, parse_stations
+from src.utils.date import str_to_datetime
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--start", required=True, help="YYYY-MM-DD (UT)")
+    parser.add_argument("--end", required=True, help="YYYY-MM-DD (UT)")
+    parser.add_argument(
+        "--stations", default="all", help="カンマ区切りの観測点コード (default: all)"
+    )
+    parser.add_argument("--output", required=True, help="出力するzipのパス")
+    args = parser.parse_args()
+
+    usecase = EeBulkExportUsecase(
+        parse_stations(args.stations.split(",")),
+        str_to_datetime(args.start).date(),
+        str_to_datetime(args.end).date(),
+    )
+    result = usecase.export(
+        args.output,
+        on_progress=lambda done, total: print(f"[Info] {done}/{total}", end="\r"),
+    )
+    print(f"\n[Info] {len(result.filenames)} files were saved to {result.path}.")
+
+
+if __name__ == "__main__":
+    main()
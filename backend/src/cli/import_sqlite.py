@@ -0,0 +1,126 @@
+"""Storage内のCSVをSQLiteのデータベースにインポートするコマンド
+
+MAGDAS_STORAGE_BACKEND=sqlite の場合に使用するデータベース(既定ではStorage/magdas.sqlite3)を
+作成し、指定したテーブルの内容をCSVの内容に置き換える。テーブルごとに1つの
+トランザクションで置き換えるため、インポート中も置き換え前の内容を読み込める。
+
+Caution:
+  SQLiteのみに追加した特異型EEJは、peculiar_eejテーブルのインポートで失われる。
+
+Usage:
+  inv import-sqlite
+  inv import-sqlite --tables kp,peak_euel
+"""
+
+import argparse
+from typing import Callable, Dict, Iterator, List
+
+import numpy as np
+from src.constants.storage import SQLITE_PATH
+from src.repository.csv_snapshot import load_csv_columns
+from src.repository.eej_event_category import (
+    EejCategoryRepository,
+    read_eej_category_csv,
+)
+from src.repository.peak_euel import (
+    PeakEuelRepository,
+    peak_euel_csv_paths,
+    read_peak_euel_csv,
+)
+from src.repository.peculiar_eej import PeculiarEejRepository, read_peculiar_eej_csv
+from src.repository.sqlite_storage import TABLE_COLUMNS, SqliteStorage, to_real
+from src.service.kp import read_kp_csv
+from src.utils.path import generate_parent_abs_path
+
+
+def _date_texts(values: np.ndarray) -> List[str]:
+    return np.datetime_as_string(values.astype("datetime64[D]"), unit="D").tolist()
+
+
+def _reals(values: np.ndarray) -> List[float | None]:
+    return [to_real(value) for value in values.astype(float).tolist()]
+
+
+def eej_category_rows() -> Iterator[tuple]:
+    columns = load_csv_columns(EejCategoryRepository().csv_path, read_eej_category_csv)
+    yield from zip(
+        _date_texts(columns["date"]),
+        _reals(columns["min_edst"]),
+        _reals(columns["max_kp"]),
+        columns["category"].tolist(),
+    )
+
+
+def peculiar_eej_rows() -> Iterator[tuple]:
+    columns = load_csv_columns(PeculiarEejRepository().csv_path, read_peculiar_eej_csv)
+    yield from zip(
+        _date_texts(columns["Date"]),
+        columns["Region"].tolist(),
+        columns["Type"].tolist(),
+    )
+
+
+def kp_rows() -> Iterator[tuple]:
+    columns = load_csv_columns(
+        generate_parent_abs_path("/Storage/kpdata.csv"), read_kp_csv
+    )
+    times = np.datetime_as_string(
+        columns["DATETIME_UT"].astype("datetime64[s]"), unit="s"
+    ).tolist()
+    yield from zip(times, _reals(columns["kp"]))
+
+
+def peak_euel_rows() -> Iterator[tuple]:
+    csv_dir = PeakEuelRepository().csv_dir
+    paths = peak_euel_csv_paths(csv_dir)
+    if not paths:
+        raise FileNotFoundError(f"CSV files not found in {csv_dir}.")
+    for path in paths:
+        columns = load_csv_columns(path, read_peak_euel_csv)
+        yield from zip(
+            _date_texts(columns["date"]),
+            columns["station_code"].tolist(),
+            _reals(columns["peak_euel"]),
+        )
+
+
+TABLE_ROWS: Dict[str, Callable[[], Iterator[tuple]]] = {
+    "eej_category": eej_category_rows,
+    "peculiar_eej": peculiar_eej_rows,
+    "kp": kp_rows,
+    "peak_euel": peak_euel_rows,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--tables",
+        default="all",
+        help=f"カンマ区切りのテーブル名 ({', '.join(TABLE_COLUMNS)}) または all",
+    )
+    parser.add_argument(
+        "--path",
+        default=SQLITE_PATH or generate_parent_abs_path("/Storage/magdas.sqlite3"),
+        help="データベースのパス",
+    )
+    args = parser.parse_args()
+
+    tables = list(TABLE_ROWS) if args.tables == "all" else args.tables.split(",")
+    for table in tables:
+        if table not in TABLE_ROWS:
+            parser.error(f"Invalid table: {table}")
+
+    storage = SqliteStorage(args.path)
+    for table in tables:
+        try:
+            count = storage.replace_rows(table, TABLE_ROWS[table]())
+        except FileNotFoundError as e:
+            print(f"[Info] Skipped {table}: {e}")
+            continue
+        print(f"[Info] Imported {count} rows into {table}")
+    storage.close()
+
+
+if __name__ == "__main__":
+    main()
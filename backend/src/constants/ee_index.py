@@ -1,3 +1,5 @@
+import os
+
 # raw data threshold
 MIN_RAW_H = 0
 MAX_RAW_H = 64000
@@ -8,3 +10,6 @@ MAX_ER = 300
 
 # EEJ Value
 EEJ_THRESHOLD = 10
+
+# EDstの計算で観測点ごとの処理を並列に実行するスレッド数(1の場合は逐次実行)
+EDST_WORKERS = int(os.environ.get("MAGDAS_EDST_WORKERS", "8"))
@@ -0,0 +1,7 @@
+import os
+
+# バックグラウンドジョブを実行するプロセス数
+JOB_WORKERS = int(os.environ.get("MAGDAS_JOB_WORKERS", "2"))
+
+# 完了したジョブの成果物を保持する時間(秒)
+JOB_TTL_SEC = int(os.environ.get("MAGDAS_JOB_TTL_SEC", str(24 * 60 * 60)))
@@ -0,0 +1,10 @@
+import os
+
+# 分類・指数のテーブルの取得元 ("csv" または "sqlite")
+STORAGE_BACKEND = os.environ.get("MAGDAS_STORAGE_BACKEND", "csv")
+
+# STORAGE_BACKENDが"sqlite"の場合のデータベースのパス (未指定の場合はStorage/magdas.sqlite3)
+SQLITE_PATH = os.environ.get("MAGDAS_SQLITE_PATH", "")
+
+# 磁場データのキャッシュ(Storage/gm_cache)の作成元の.mgdファイルの更新時刻を、全て確認し直す間隔(秒)
+GM_CACHE_RECHECK_SEC = float(os.environ.get("MAGDAS_GM_CACHE_RECHECK_SEC", "60"))
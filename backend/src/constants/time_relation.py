@@ -2,6 +2,8 @@ import datetime
 from dataclasses import dataclass
 from enum import Enum, IntEnum
 
+import numpy as np
+
 
 class TimeUnit(IntEnum):
     """Time unit in seconds."""
@@ -43,6 +45,26 @@ class TimeRange:
         else:
             return self.start <= time or time <= self.end
 
+    def contains_array(self, minutes_of_day: np.ndarray) -> np.ndarray:
+        """Vectorized version of contains.
+
+        Args:
+            minutes_of_day: minutes from 00:00 (0-1439). Each value is treated as HH:MM:00.
+        Returns:
+            Boolean mask with the same shape as minutes_of_day.
+        """
+        seconds = np.asarray(minutes_of_day) * TimeUnit.ONE_MINUTE.sec
+        start = _seconds_of_day(self.start)
+        end = _seconds_of_day(self.end)
+        if start <= end:
+            return (start <= seconds) & (seconds <= end)
+        else:
+            return (start <= seconds) | (seconds <= end)
+
+
+def _seconds_of_day(t: datetime.time) -> float:
+    return t.hour * 3600 + t.minute * 60 + t.second + t.microsecond / 1e6
+
 
 EEJ_DETECTION_START_TIME = datetime.time(9, 0)
 EEJ_DETECTION_END_TIME = datetime.time(14, 59)
@@ -0,0 +1,42 @@
+"""EDstの計算のベンチマーク
+
+観測点ごとの処理を逐次実行した場合と、スレッドで並列に実行した場合を比較する。
+年ごとのキャッシュ(Storage/gm_cache)は使用せず、.mgdファイルから読み込む。
+
+Usage:
+  inv run "src/dev/benchmark/bench_edst_parallel.py 2014-04-01 30"
+"""
+
+import sys
+import time
+from datetime import timedelta
+from unittest import mock
+
+import numpy as np
+from src.domain.station_params import Period
+from src.repository.gm_data import GMPeriodRepository
+from src.service.ee_index.calc_edst import Edst
+from src.utils.date import str_to_datetime
+
+
+def bench(period: Period, workers: int) -> tuple[float, np.ndarray]:
+    start = time.perf_counter()
+    edst = Edst(period, use_store=False, workers=workers).calc_edst()
+    return time.perf_counter() - start, edst
+
+
+if __name__ == "__main__":
+    start_ut = str_to_datetime(sys.argv[1] if len(sys.argv) > 1 else "2014-04-01")
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    period = Period(start_ut, start_ut + timedelta(days=days, minutes=-1))
+
+    with mock.patch.object(
+        GMPeriodRepository, "_get_many_from_cache", return_value=None
+    ):
+        serial_sec, serial = bench(period, workers=1)
+        print(f"workers= 1: {serial_sec:.3f} s")
+        for workers in (2, 4, 8, 16):
+            sec, edst = bench(period, workers=workers)
+            if not np.array_equal(serial, edst, equal_nan=True):
+                raise ValueError(f"Results differ: workers={workers}")
+            print(f"workers={workers:>2}: {sec:.3f} s ({serial_sec / sec:.1f}x)")
@@ -0,0 +1,65 @@
+"""EEJ検知のベンチマーク
+
+LTの日ごとにBestEuelSelectorForEej・EejDetectionで計算した場合と、
+EejDetectionRangeで期間をまとめて計算した場合を比較する。
+
+Usage:
+  inv run "src/dev/benchmark/bench_eej_detection_range.py 2014-03-30 9"
+"""
+
+import sys
+import time
+from datetime import timedelta
+
+import numpy as np
+from src.domain.magdas_station import EeIndexStation
+from src.domain.region import Region
+from src.service.calc_eej_detection import (
+    BestEuelSelectorForEej,
+    EejDetection,
+    calc_euel_peak_diff,
+)
+from src.service.calc_eej_detection_range import EejDetectionRange
+from src.utils.date import str_to_datetime
+
+REGION = Region.SOUTH_AMERICA
+DIP_STATIONS = [EeIndexStation.ANC, EeIndexStation.HUA]
+OFFDIP_STATIONS = [EeIndexStation.EUS]
+
+
+def detect_daily(dates) -> list[str]:
+    labels = []
+    for lt_date in dates:
+        dip = BestEuelSelectorForEej(
+            REGION, DIP_STATIONS, lt_date, True
+        ).select_euel_data()
+        offdip = BestEuelSelectorForEej(
+            REGION, OFFDIP_STATIONS, lt_date, False
+        ).select_euel_data()
+        peak_diff = calc_euel_peak_diff(dip, offdip, lt_date)
+        labels.append(EejDetection(peak_diff, lt_date).classify_eej_category().label)
+    return labels
+
+
+if __name__ == "__main__":
+    start = str_to_datetime(sys.argv[1] if len(sys.argv) > 1 else "2014-03-30").date()
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 9
+    end = start + timedelta(days=days - 1)
+
+    t = time.perf_counter()
+    detection = EejDetectionRange(
+        REGION, DIP_STATIONS, OFFDIP_STATIONS, start, end
+    ).detect()
+    range_labels = [category.label for category in detection.categories()]
+    range_sec = time.perf_counter() - t
+
+    t = time.perf_counter()
+    daily_labels = detect_daily(detection.dates)
+    daily_sec = time.perf_counter() - t
+
+    if range_labels != daily_labels:
+        raise ValueError("Results differ")
+    print(f"days={days}")
+    print(f"daily: {daily_sec:.3f} s ({daily_sec / days * 1000:.1f} ms/day)")
+    print(f"range: {range_sec:.3f} s ({range_sec / days * 1000:.1f} ms/day)")
+    print(f"{daily_sec / range_sec:.1f}x, categories: {np.unique(range_labels)}")
@@ -0,0 +1,72 @@
+"""IAGA-2002形式の整形のベンチマーク
+
+1分ごとにdataclassを作成し、f-stringで1行ずつ整形する旧実装と、日ごとのテンプレートに
+値をまとめて埋め込む現在の実装(EeIndexIagaService.build_iaga_file)を1, 30, 365日で比較する。
+
+Usage:
+  inv run src/dev/benchmark/bench_iaga_formatter.py
+"""
+
+import io
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from src.domain.magdas_station import EeIndexStation
+from src.service.file_exporter.build_iaga import EeIndexIagaService, IagaValues
+
+
+def legacy_build_iaga_file(station, start_ut, end_ut, iaga_values) -> bytes:
+    """旧実装(比較用)"""
+    service = EeIndexIagaService()
+    meta = service._build_iaga_meta_data(station, "EEI", 8888.88)
+    buf = io.StringIO()
+    buf.write(service._build_iaga_header(meta))
+    idx = 0
+    for day in range((end_ut - start_ut).days + 1):
+        base_date = start_ut + timedelta(days=day)
+        doy = base_date.timetuple().tm_yday
+        for m in range(1440):
+            time_str = f"{m // 60:02d}:{m % 60:02d}:00.000"
+            date_str = base_date.strftime("%Y-%m-%d")
+            buf.write(
+                f"{date_str:<11}{time_str:<13}{str(doy).zfill(3):<7}"
+                f"{iaga_values.edst_1h[idx]:<10.2f}{iaga_values.edst_6h[idx]:<10.2f}"
+                f"{iaga_values.er[idx]:<10.2f}{iaga_values.euel[idx]:<10.2f}\n"
+            )
+            idx += 1
+    return buf.getvalue().encode("utf-8")
+
+
+def bench(func, *args) -> tuple[float, bytes]:
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    station = EeIndexStation.ANC
+    start_ut = datetime(2014, 1, 1)
+    rng = np.random.default_rng(0)
+    service = EeIndexIagaService()
+
+    for days in (1, 30, 365):
+        end_ut = start_ut + timedelta(days=days - 1, hours=23, minutes=59)
+        arrays = [rng.normal(0, 100, days * 1440) for _ in range(4)]
+        for array in arrays:
+            array[rng.random(len(array)) < 0.05] = np.nan
+        legacy_values = IagaValues(*(array.tolist() for array in arrays))
+        current_values = IagaValues(*arrays)
+
+        legacy_sec, legacy = bench(
+            legacy_build_iaga_file, station, start_ut, end_ut, legacy_values
+        )
+        current_sec, current = bench(
+            service.build_iaga_file, station, start_ut, end_ut, current_values
+        )
+        if legacy != current:
+            raise ValueError(f"Results differ: {days} days")
+        print(
+            f"{days:>3} days: legacy {legacy_sec:.3f} s, current {current_sec:.3f} s "
+            f"({legacy_sec / current_sec:.1f}x, {len(current) / 1e6:.1f} MB)"
+        )
@@ -0,0 +1,61 @@
+"""移動平均のベンチマーク
+
+pandasのrollingで1系列ずつ計算した場合と、calc_moving_avgs(NumPyの累積和)で
+計算した場合を比較する。EDstの1時間・6時間移動平均(1系列, 2つの窓)と、
+EEJ検知のような (日数, 1440) の2次元配列の1時間移動平均を計測する。
+
+Usage:
+  inv run "src/dev/benchmark/bench_moving_avg.py 365"
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from src.constants.time_relation import TimeUnit
+from src.service.calc_utils.moving_avg import calc_moving_avgs
+
+EDST_WINDOWS = [
+    (TimeUnit.ONE_HOUR.min, TimeUnit.THIRTY_MINUTES.min),
+    (TimeUnit.SIX_HOURS.min, TimeUnit.THREE_HOURS.min),
+]
+
+
+def pandas_moving_avg(data: np.ndarray, window: int, nan_threshold: int) -> np.ndarray:
+    s = pd.Series(data)
+    return s.rolling(window, min_periods=nan_threshold, center=True).mean().to_numpy()
+
+
+def bench(label: str, run_pandas, run_numpy) -> None:
+    start = time.perf_counter()
+    expected = run_pandas()
+    pandas_sec = time.perf_counter() - start
+    start = time.perf_counter()
+    result = run_numpy()
+    numpy_sec = time.perf_counter() - start
+    for e, r in zip(expected, result):
+        np.testing.assert_allclose(r, e, rtol=1e-9, atol=1e-9)
+    print(
+        f"{label}: pandas {pandas_sec:.3f} s, numpy {numpy_sec:.3f} s "
+        f"({pandas_sec / numpy_sec:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 365
+    rng = np.random.default_rng(0)
+    data = rng.normal(-20, 15, (days, TimeUnit.ONE_DAY.min))
+    data[rng.random(data.shape) < 0.1] = np.nan
+
+    edst = data.reshape(-1)
+    bench(
+        f"EDst 1h/6h ({edst.size} min)",
+        lambda: [pandas_moving_avg(edst, w, n) for w, n in EDST_WINDOWS],
+        lambda: calc_moving_avgs(edst, EDST_WINDOWS),
+    )
+    bench(
+        f"2-D 1h ({days} x 1440)",
+        lambda: [np.array([pandas_moving_avg(row, *EDST_WINDOWS[0]) for row in data])],
+        lambda: calc_moving_avgs(data, EDST_WINDOWS[:1]),
+    )
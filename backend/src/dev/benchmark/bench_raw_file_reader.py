@@ -0,0 +1,62 @@
+""".mgdファイル読み込みのベンチマーク
+
+1byteずつheaderを走査する旧実装と、header部分をまとめて読み込みbytes.findで
+デリミタを探す現在の実装(read_raw_min_data)を比較する。
+
+Usage:
+  inv run "src/dev/benchmark/bench_raw_file_reader.py Storage/magdas/ANC/Min/2014"
+"""
+
+import sys
+import time
+from glob import glob
+
+import numpy as np
+from src.repository.raw_file_reader import read_raw_min_data
+from src.utils.path import generate_parent_abs_path
+
+
+def legacy_read_raw_min_data(path):
+    """旧実装(比較用)"""
+    with open(path, "rb") as file:
+        while True:
+            buf = file.read(1)
+            if buf == bytes(b"\x1a"):
+                buf = file.read(1)
+                break
+        data = np.fromfile(file, np.float32)
+    return data
+
+
+def bench(func, paths, repeat) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for path in paths:
+            func(path)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    directory = (
+        sys.argv[1]
+        if len(sys.argv) > 1
+        else generate_parent_abs_path("/Storage/magdas/ANC/Min")
+    )
+    paths = sorted(glob(f"{directory}/**/*.mgd", recursive=True))
+    if not paths:
+        raise FileNotFoundError(f"No .mgd files found in {directory}")
+    repeat = 5
+
+    for path in paths:
+        legacy = legacy_read_raw_min_data(path)
+        current = read_raw_min_data(path).reshape(-1)
+        if not np.array_equal(legacy, current, equal_nan=True):
+            raise ValueError(f"Results differ: {path}")
+
+    legacy_sec = bench(legacy_read_raw_min_data, paths, repeat)
+    current_sec = bench(read_raw_min_data, paths, repeat)
+    n = len(paths) * repeat
+    print(f"files: {len(paths)} x {repeat}")
+    print(f"legacy : {legacy_sec:.3f} s ({legacy_sec / n * 1e6:.1f} us/file)")
+    print(f"current: {current_sec:.3f} s ({current_sec / n * 1e6:.1f} us/file)")
+    print(f"speedup: {legacy_sec / current_sec:.1f}x")
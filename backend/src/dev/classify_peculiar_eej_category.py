@@ -8,12 +8,8 @@ from src.domain.magdas_station import EeIndexStation
 from src.domain.region import Region
 from src.domain.station_params import Period
 from src.model.peculiar_eej import PeculiarEejModel
-from src.service.calc_eej_detection import (
-    BestEuelSelectorForEej,
-    EejDetection,
-    EuelData,
-    calc_euel_peak_diff,
-)
+from src.service.calc_eej_detection import EuelData
+from src.service.calc_eej_detection_range import EejDetectionRange
 from src.service.peculiar_eej import PeculiarEejService
 
 
@@ -63,27 +59,18 @@ class ClassificationPeculiarEej:
         self.region = region
 
     def aggregate_peculiar_eej_data(self) -> List[PeculiarEejModel]:
+        # 期間全体のEUEL・EDstをまとめて計算する
+        detection = EejDetectionRange(
+            self.region,
+            self.dip_stations,
+            self.offdip_stations,
+            self.lt_period.start.date(),
+            self.lt_period.end.date(),
+        ).detect()
         peculiar_eej_data_list: List[PeculiarEejModel] = []
-        for lt_date in (
-            self.lt_period.start.date() + timedelta(days=i)
-            for i in range(
-                (self.lt_period.end.date() - self.lt_period.start.date()).days + 1
-            )
+        for day, (lt_date, eej_type) in enumerate(
+            zip(detection.dates, detection.categories())
         ):
-            print(f"[Debug] Processing date: {lt_date}")
-            # 使用するEUELのデータを取得
-            dip_euel_selector = BestEuelSelectorForEej(
-                self.region, dip_stations, lt_date, True
-            )
-            offdip_euel_selector = BestEuelSelectorForEej(
-                self.region, offdip_stations, lt_date, False
-            )
-            dip_euel = dip_euel_selector.select_euel_data()
-            offdip_euel = offdip_euel_selector.select_euel_data()
-            peak_diff = calc_euel_peak_diff(dip_euel, offdip_euel, lt_date)
-            # EEJの種類を分類
-            eej_detection = EejDetection(peak_diff, lt_date)
-            eej_type = eej_detection.classify_eej_category()
             if eej_type.label != "peculiar":
                 continue
             # 特異型EEJの中で未発達型か突発型かを分類
@@ -93,8 +80,8 @@ class ClassificationPeculiarEej:
                     + timedelta(minutes=i)
                     for i in range(1440)
                 ],
-                dip_euel_data=dip_euel,
-                offdip_euel_data=offdip_euel,
+                dip_euel_data=detection.dip.euel_data(day, self.region),
+                offdip_euel_data=detection.offdip.euel_data(day, self.region),
             )
             peculiar_eej_data = PeculiarEejModel(
                 date=lt_date,
@@ -1,63 +1,37 @@
 import csv
-from datetime import datetime, timedelta
+from datetime import datetime
 
-import numpy as np
-from numpy.typing import NDArray
 from src.domain.station_params import EeIndexStation, Period
-from src.service.calc_eej_detection import BestEuelSelectorForEej, DaytimeInterval
+from src.service.calc_eej_detection_range import EuelForEejRange
 
 
-def get_timestamp(start: datetime, end: datetime) -> NDArray[np.datetime64]:
-    return np.array(
-        [
-            start + timedelta(minutes=i)
-            for i in range(int((end - start).total_seconds() / 60) + 1)
-        ]
-    )
+def write_station_peak_euel_to_csv(
+    writer, lt_period: Period, stations: list[EeIndexStation]
+):
+    """EEJ検知のための昼間の最大のEUELを、期間でまとめて計算して書き込む"""
+    euel_range = EuelForEejRange(stations, lt_period.start.date(), lt_period.end.date())
+    peaks = euel_range.calc_peak_euel()
+    for station in stations:
+        for current_date, max_euel in zip(euel_range.dates, peaks[station]):
+            writer.writerow([current_date.isoformat(), station.code, max_euel])
 
 
 def write_dip_station_peak_euel_to_csv(
     writer, ut_period: Period, dip_station: EeIndexStation
 ):
     """EEJ検知のための昼間の最大のEUELを計算"""
-    current_date = ut_period.start.date()
-    while current_date <= ut_period.end.date():
-        euel_selector = BestEuelSelectorForEej([dip_station], current_date, is_dip=True)
-        euel_data = euel_selector.select_euel_data()
-
-        day_start = datetime.combine(current_date, datetime.min.time())
-        day_end = day_start + timedelta(days=1) - timedelta(minutes=1)
-        timestamp = get_timestamp(day_start, day_end)
-
-        is_noon = np.array([DaytimeInterval.contains(dt.time()) for dt in timestamp])
-        filtered = euel_data.array[is_noon]
-        max_euel = np.max(filtered) if filtered.size > 0 else np.nan
-
-        writer.writerow([current_date.isoformat(), dip_station.code, max_euel])
-        current_date += timedelta(days=1)
+    if not dip_station.is_dip():
+        raise ValueError(f"{dip_station.code} is not in dip region")
+    write_station_peak_euel_to_csv(writer, ut_period, [dip_station])
 
 
 def write_offdip_station_peak_euel_to_csv(
     writer, ut_period: Period, offdip_station: EeIndexStation
 ):
     """EEJ検知のための昼間の最大のEUELを計算"""
-    current_date = ut_period.start.date()
-    while current_date <= ut_period.end.date():
-        euel_selector = BestEuelSelectorForEej(
-            [offdip_station], current_date, is_dip=False
-        )
-        euel_data = euel_selector.select_euel_data()
-
-        day_start = datetime.combine(current_date, datetime.min.time())
-        day_end = day_start + timedelta(days=1) - timedelta(minutes=1)
-        timestamp = get_timestamp(day_start, day_end)
-
-        is_noon = np.array([DaytimeInterval.contains(dt.time()) for dt in timestamp])
-        filtered = euel_data.array[is_noon]
-        max_euel = np.max(filtered) if filtered.size > 0 else np.nan
-
-        writer.writerow([current_date.isoformat(), offdip_station.code, max_euel])
-        current_date += timedelta(days=1)
+    if not offdip_station.is_offdip():
+        raise ValueError(f"{offdip_station.code} is not in off-dip region")
+    write_station_peak_euel_to_csv(writer, ut_period, [offdip_station])
 
 
 ut_param = Period(
@@ -1,41 +1,51 @@
 """前後10%にラインを引いてヒストグラムを描画"""
 
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+from src.domain.magdas_station import EeIndexStation
 from src.domain.station_params import Period
+from src.repository.peak_euel import PeakEuelRepository
 
+DIP_STATIONS = [EeIndexStation.ANC, EeIndexStation.HUA]
+OFFDIP_STATION = EeIndexStation.EUS
 
-def main(period: Period):
-    dip_df = pd.read_csv(
-        "Storage/peak_euel/south_america_dip_station_peak_euel.csv",
-        skipinitialspace=True,
+
+def load_peak_euel(period: Period) -> pd.DataFrame:
+    """期間の日ごとの、dipの観測点の最大のEUELの平均とoff-dipの観測点の最大のEUEL"""
+    dates = [
+        period.start.date() + timedelta(days=i)
+        for i in range((period.end.date() - period.start.date()).days + 1)
+    ]
+    repository = PeakEuelRepository()
+    dip_peaks = np.stack(
+        [repository.peak_euel_of_days(station.code, dates) for station in DIP_STATIONS]
     )
-    offdip_df = pd.read_csv(
-        "Storage/peak_euel/south_america_offdip_station_peak_euel.csv",
-        skipinitialspace=True,
+    # 全てのdipの観測点が欠損の日はNaN
+    dip_count = np.sum(~np.isnan(dip_peaks), axis=0)
+    with np.errstate(invalid="ignore"):
+        dip_mean = np.nansum(dip_peaks, axis=0) / dip_count
+    return pd.DataFrame(
+        {
+            "date": pd.to_datetime(dates),
+            "peak_euel_dip_mean": dip_mean,
+            "peak_euel_offdip": repository.peak_euel_of_days(
+                OFFDIP_STATION.code, dates
+            ),
+        }
     )
 
-    dip_df["date"] = pd.to_datetime(dip_df["date"])
-    offdip_df["date"] = pd.to_datetime(offdip_df["date"])
+
+def main(period: Period):
+    peak_euel_df = load_peak_euel(period)
 
     disturbance_df = pd.read_csv("Storage/disturbance.csv", skipinitialspace=True)
     disturbance_df["date"] = pd.to_datetime(disturbance_df["date"])
     quiet_df = disturbance_df[disturbance_df["category"] == "quiet"]
 
-    dip_df = dip_df[(dip_df["date"] >= period.start) & (dip_df["date"] <= period.end)]
-    offdip_df = offdip_df[
-        (offdip_df["date"] >= period.start) & (offdip_df["date"] <= period.end)
-    ]
-
-    # Group by date and calculate the mean for the dip stations
-    dip_df_mean = dip_df.groupby("date")["peak_euel"].mean().reset_index()
-
-    merged_df = pd.merge(
-        dip_df_mean, offdip_df, on="date", suffixes=("_dip_mean", "_offdip")
-    )
-    merged_df = pd.merge(merged_df, quiet_df, on="date")
+    merged_df = pd.merge(peak_euel_df, quiet_df, on="date")
 
     peak_euel_dip = merged_df["peak_euel_dip_mean"]
     peak_euel_offdip = merged_df["peak_euel_offdip"]
@@ -1,14 +1,17 @@
 """Magdasの観測データが存在するか確認するコード"""
 
+from datetime import datetime
 from typing import Optional
 
 import pandas as pd
+from src.domain.station_params import Period
+from src.repository.peak_euel import PeakEuelRepository
 from src.utils.path import generate_parent_abs_path
 
 
 class StationData:
-    def __init__(self, csv_path: str):
-        self.df = pd.read_csv(csv_path, parse_dates=["date"])
+    def __init__(self, csv_dir: str):
+        self.repository = PeakEuelRepository(csv_dir)
 
     def query(
         self,
@@ -16,21 +19,24 @@ class StationData:
         end_date: Optional[str] = None,
         station_code: Optional[str] = None,
     ) -> pd.DataFrame:
-        df = self.df
-        if start_date:
-            df = df[df["date"] >= pd.to_datetime(start_date)]
-        if end_date:
-            df = df[df["date"] <= pd.to_datetime(end_date)]
-        if station_code:
-            df = df[df["station_code"] == station_code]
-        return df.reset_index(drop=True)
+        """期間(日付の両端を含む)と観測点で絞り込んだ昼間の最大のEUEL (観測点・日付順)"""
+        start = datetime.fromisoformat(start_date) if start_date else datetime.min
+        end = (
+            datetime.fromisoformat(end_date).replace(hour=23, minute=59)
+            if end_date
+            else datetime.max.replace(second=0, microsecond=0)
+        )
+        rows = self.repository.select(Period(start, end), station_code)
+        df = pd.DataFrame(
+            [row.model_dump() for row in rows],
+            columns=["date", "station_code", "peak_euel"],
+        )
+        df["date"] = pd.to_datetime(df["date"])
+        return df
 
 
 if __name__ == "__main__":
-    path = generate_parent_abs_path(
-        "/Storage/peak_euel/southeast_asia_dip_station_peak_euel.csv"
-    )
-    data = StationData(path)
+    data = StationData(generate_parent_abs_path("/Storage/peak_euel"))
     result = data.query(
         start_date="2000-01-01", end_date="2000-01-10", station_code="BCL"
     )
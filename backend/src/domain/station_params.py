@@ -37,10 +37,7 @@ class Period:
     def get_minute_list(self) -> NDArray[np.datetime64]:
         start = np.datetime64(self.start, "m")
         length = self.total_minutes() + 1  # include start and end
-        return np.array(
-            [start + np.timedelta64(i, "m") for i in range(length)],
-            dtype="datetime64[m]",
-        )
+        return start + np.arange(length, dtype=np.int64)
 
 
 @dataclass
@@ -0,0 +1,42 @@
+from typing import List
+
+from fastapi import HTTPException
+from pydantic import BaseModel, Field
+from src.handler.job_status_handler import JobStatusResp
+from src.service.job_queue import get_job_queue
+from src.usecase.ee_bulk_export import (
+    EeBulkExportUsecase,
+    parse_stations,
+    run_bulk_export_job,
+)
+from src.utils.date import str_to_datetime
+
+
+class EeBulkExportReq(BaseModel):
+    stations: List[str] = Field(
+        ..., min_length=1, description='観測点コードのリスト、または["all"]'
+    )
+    startDate: str = Field(..., description="YYYY-MM-DD")
+    endDate: str = Field(..., description="YYYY-MM-DD")
+
+
+def handle_post_ee_bulk_export(req: EeBulkExportReq) -> JobStatusResp:
+    """複数の観測点のIAGA形式のzipを作成するジョブを登録する
+
+    進捗は handle_get_job_status、結果は handle_get_job_result で取得する
+    """
+    try:
+        stations = parse_stations(req.stations)
+        start_date = str_to_datetime(req.startDate).date()
+        end_date = str_to_datetime(req.endDate).date()
+        EeBulkExportUsecase(stations, start_date, end_date)
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    job = get_job_queue().submit(
+        run_bulk_export_job,
+        station_codes=tuple(station.code for station in stations),
+        start_date=start_date,
+        end_date=end_date,
+    )
+    return JobStatusResp.from_job(job)
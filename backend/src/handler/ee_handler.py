@@ -1,15 +1,27 @@
-from fastapi import Depends, Query
-from fastapi.responses import JSONResponse
+from typing import Literal, Optional
+
+import numpy as np
+import orjson
+from fastapi import Depends, Header, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 from src.domain.magdas_station import EeIndexStation
+from src.service.ee_index.calc_ee_daily import EeComputationMode
 from src.usecase.ee_by_days import EeIndexByDaysUsecase
-from src.utils.date import str_to_datetime
+from src.utils.binary_columns import BINARY_MEDIA_TYPE, encode_columns
+from src.utils.date import MinuteLabelRange, str_to_datetime
+
+# 列指向のJSON。Acceptヘッダーまたは format=columnar で指定する
+COLUMNAR_MEDIA_TYPE = "application/vnd.magdas.columnar+json"
 
 
 class EeIndexDateRangeReq(BaseModel):
     start_date: str
     days: int = Field(default=1, ge=1, le=30)  # Limit to 30 days maximum
     station_code: str
+    label_format: Literal["list", "compact"] = "list"
+    format: Literal["json", "columnar", "binary"] = "json"
+    mode: EeComputationMode = EeComputationMode.WHOLE_PERIOD
 
     @classmethod
     def from_query(
@@ -21,8 +33,35 @@ class EeIndexDateRangeReq(BaseModel):
             default=1,
             description="Number of days to fetch (1, 3, 7, or 30)",
         ),
+        label_format: Literal["list", "compact"] = Query(
+            alias="labelFormat",
+            default="list",
+            description="list: minuteLabels, compact: minuteLabelRange(start, step, count)",
+        ),
+        format: Literal["json", "columnar", "binary"] = Query(
+            alias="format",
+            default="json",
+            description="json: EeIndexByRangeResp, columnar: start, stepMinutes, count と値の配列, binary: time, er, edst, euel の列のバイナリ",
+        ),
+        mode: EeComputationMode = Query(
+            alias="mode",
+            default=EeComputationMode.WHOLE_PERIOD,
+            description="whole_period: 期間全体の中央値をベースラインとする, daily: UT日ごとの中央値をベースラインとし、観測点・日ごとの計算結果を再利用する",
+        ),
+        accept: Optional[str] = Header(default=None),
     ):
-        return cls(start_date=start_date, station_code=station_code, days=days)
+        if accept and COLUMNAR_MEDIA_TYPE in accept:
+            format = "columnar"
+        elif accept and BINARY_MEDIA_TYPE in accept:
+            format = "binary"
+        return cls(
+            start_date=start_date,
+            station_code=station_code,
+            days=days,
+            label_format=label_format,
+            format=format,
+            mode=mode,
+        )
 
 
 class EeIndex(BaseModel):
@@ -33,20 +72,61 @@ class EeIndex(BaseModel):
 
 class EeIndexByRangeResp(BaseModel):
     values: EeIndex
-    minuteLabels: list[str]
+    minuteLabels: Optional[list[str]] = None
+    minuteLabelRange: Optional[MinuteLabelRange] = None
+
+
+def _columnar_response(ee_index: EeIndexByDaysUsecase) -> Response:
+    """pydanticを経由せず、NumPy配列をそのままorjsonでシリアライズする
+
+    {"start", "stepMinutes", "count", "er", "edst", "euel"} の形式で、NaNはnullになる
+    """
+    arrays = ee_index.get_ee_arrays()
+    columns = {
+        name: np.ascontiguousarray(values, dtype=np.float32)
+        for name, values in (
+            ("er", arrays.er),
+            ("edst", arrays.edst),
+            ("euel", arrays.euel),
+        )
+    }
+    label_range = MinuteLabelRange.from_start(ee_index.start_ut, len(columns["er"]))
+    content = orjson.dumps(
+        {
+            "start": label_range.start,
+            "stepMinutes": label_range.stepMinutes,
+            "count": label_range.count,
+            **columns,
+        },
+        option=orjson.OPT_SERIALIZE_NUMPY,
+    )
+    return Response(content=content, media_type=COLUMNAR_MEDIA_TYPE)
+
+
+def _binary_response(ee_index: EeIndexByDaysUsecase) -> StreamingResponse:
+    arrays = ee_index.get_ee_arrays()
+    columns = {"er": arrays.er, "edst": arrays.edst, "euel": arrays.euel}
+    return StreamingResponse(
+        encode_columns(ee_index.start_ut, columns), media_type=BINARY_MEDIA_TYPE
+    )
 
 
 def handle_get_ee_by_range(
     req: EeIndexDateRangeReq = Depends(EeIndexDateRangeReq.from_query),
-) -> EeIndexByRangeResp:
+) -> EeIndexByRangeResp | Response:
     start_ut = str_to_datetime(req.start_date)
     days = req.days
     station = EeIndexStation[req.station_code]
 
-    ee_index = EeIndexByDaysUsecase(start_ut, days, station)
-    ee_data = ee_index.get_ee_data()
+    ee_index = EeIndexByDaysUsecase(start_ut, days, station, mode=req.mode)
+    if req.format == "columnar":
+        return _columnar_response(ee_index)
+    if req.format == "binary":
+        return _binary_response(ee_index)
+    ee_data = ee_index.get_ee_data(compact_labels=req.label_format == "compact")
 
     return EeIndexByRangeResp(
         values=EeIndex(er=ee_data.er, edst=ee_data.edst, euel=ee_data.euel),
         minuteLabels=ee_data.minuteLabels,
+        minuteLabelRange=ee_data.minuteLabelRange,
     )
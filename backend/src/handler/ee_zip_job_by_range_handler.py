@@ -0,0 +1,24 @@
+from fastapi import Depends
+from src.domain.magdas_station import EeIndexStation
+from src.handler.ee_zip_by_range_handler import DownloadEeIndexReq
+from src.handler.job_status_handler import JobStatusResp
+from src.service.job_queue import get_job_queue
+from src.usecase.ee_zip import run_ee_zip_job
+from src.utils.date import str_to_datetime
+
+
+def handle_post_ee_zip_job_by_range(
+    request: DownloadEeIndexReq = Depends(DownloadEeIndexReq.from_query),
+) -> JobStatusResp:
+    """handle_get_ee_zip_content_by_rangeと同じzipを作成するジョブを登録する"""
+    station = EeIndexStation[request.station_code]
+    start_date = str_to_datetime(request.start_date).date()
+    end_date = str_to_datetime(request.end_date).date()
+
+    job = get_job_queue().submit(
+        run_ee_zip_job,
+        station_code=station.code,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    return JobStatusResp.from_job(job)
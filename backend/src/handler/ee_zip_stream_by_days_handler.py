@@ -0,0 +1,25 @@
+from fastapi import Depends
+from fastapi.responses import StreamingResponse
+from src.domain.magdas_station import EeIndexStation
+from src.handler.ee_zip_by_days_handler import DownloadEeIndexReq
+from src.usecase.ee_zip import EeIndexZipUsecase
+from src.utils.date import str_to_datetime
+
+
+def handle_get_ee_zip_stream_by_days(
+    request: DownloadEeIndexReq = Depends(DownloadEeIndexReq.from_query),
+) -> StreamingResponse:
+    """IAGA形式のzipをbase64のJSONではなくapplication/zipでストリーミングする"""
+    station = EeIndexStation[request.station_code]
+    date = str_to_datetime(request.start_date)
+
+    ee_zip_usecase = EeIndexZipUsecase(station)
+    ee_zip_stream = ee_zip_usecase.stream_ee_zip_by_days(date, request.days)
+
+    return StreamingResponse(
+        ee_zip_stream.chunks,
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="{ee_zip_stream.filename}"'
+        },
+    )
@@ -1,9 +1,11 @@
-from typing import List
+from typing import List, Literal, Optional
 
-from fastapi import Depends, Query
+from fastapi import Depends, Header, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from src.domain.region import Region
 from src.usecase.eej import EejRow, EejUsecase
+from src.utils.binary_columns import BINARY_MEDIA_TYPE, encode_columns
 from src.utils.date import str_to_datetime
 
 
@@ -11,6 +13,7 @@ class EejReq(BaseModel):
     start_date: str
     days: int = Field(default=1, ge=1, le=30)  # Limit to 30 days maximum
     region: str
+    format: Literal["json", "binary"] = "json"
 
     @classmethod
     def from_query(
@@ -22,8 +25,16 @@ class EejReq(BaseModel):
             description="Number of days to fetch (1, 3, 7, or 30)",
         ),
         region: str = Query(alias="region", default="south_america"),
+        format: Literal["json", "binary"] = Query(
+            alias="format",
+            default="json",
+            description="json: EejResp, binary: time, dipEuel, offdipEuel の列のバイナリ",
+        ),
+        accept: Optional[str] = Header(default=None),
     ):
-        return cls(start_date=start_date, days=days, region=region)
+        if accept and BINARY_MEDIA_TYPE in accept:
+            format = "binary"
+        return cls(start_date=start_date, days=days, region=region, format=format)
 
 
 class EejResp(BaseModel):
@@ -37,5 +48,15 @@ def handle_get_eej_by_range(req: EejReq = Depends(EejReq.from_query)):
     region = Region.from_code(req.region)
 
     eej_usecase = EejUsecase(start_lt, days, region)
+    if req.format == "binary":
+        eej_arrays = eej_usecase.execute_arrays()
+        columns = {
+            "dipEuel": eej_arrays.dip_euel,
+            "offdipEuel": eej_arrays.offdip_euel,
+        }
+        meta = {"peculiarEejDates": eej_arrays.peculiar_eej_dates}
+        return StreamingResponse(
+            encode_columns(start_lt, columns, meta), media_type=BINARY_MEDIA_TYPE
+        )
     eej_result = eej_usecase.execute()
     return EejResp(data=eej_result.data, peculiarEejDates=eej_result.peculiarEejDates)
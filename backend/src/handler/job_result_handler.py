@@ -0,0 +1,21 @@
+from fastapi import HTTPException
+from fastapi.responses import FileResponse
+from src.repository.job_store import JobState
+from src.service.job_queue import get_job_queue
+
+
+def handle_get_job_result(job_id: str) -> FileResponse:
+    """完了したジョブの成果物を返す。TTLを過ぎて削除されたジョブは404"""
+    job_queue = get_job_queue()
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} is not found.")
+    if job.state != JobState.DONE or job.artifact is None:
+        raise HTTPException(
+            status_code=409, detail=f"Job {job_id} is {job.state.value}."
+        )
+    return FileResponse(
+        job_queue.job_store.artifact_path(job_id, job.artifact),
+        media_type="application/zip",
+        filename=job.artifact,
+    )
@@ -0,0 +1,34 @@
+from typing import Optional
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from src.repository.job_store import JobStatus
+from src.service.job_queue import get_job_queue
+
+
+class JobStatusResp(BaseModel):
+    jobId: str
+    state: str
+    progress: int
+    total: int
+    fileName: Optional[str] = None
+    error: Optional[str] = None
+
+    @classmethod
+    def from_job(cls, job: JobStatus) -> "JobStatusResp":
+        return cls(
+            jobId=job.job_id,
+            state=job.state.value,
+            progress=job.progress,
+            total=job.total,
+            fileName=job.artifact,
+            error=job.error,
+        )
+
+
+def handle_get_job_status(job_id: str) -> JobStatusResp:
+    """ジョブの状態(pending, running, done, failed)と進捗を返す"""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} is not found.")
+    return JobStatusResp.from_job(job)
@@ -0,0 +1,53 @@
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+import orjson
+from fastapi.testclient import TestClient
+from src.usecase.ee_by_days import EeArrays, EeIndexByDaysUsecase
+
+from main import app
+
+
+def fake_ee_arrays(self: EeIndexByDaysUsecase) -> EeArrays:
+    # 期間の終端を含むため、日数 × 1440 + 1 個
+    count = self.days * 1440 + 1
+    values = np.arange(count, dtype=float)
+    return EeArrays(er=values, edst=values, euel=values)
+
+
+class TestEeHandlerCount(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(
+            EeIndexByDaysUsecase, "get_ee_arrays", fake_ee_arrays
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+        self.params = {"startDate": "2014-04-01", "stationCode": "ANC", "days": 2}
+
+    def test_columnar_count(self):
+        res = self.client.get("/ee-index", params={**self.params, "format": "columnar"})
+        self.assertEqual(res.status_code, 200)
+        body = orjson.loads(res.content)
+        self.assertEqual(body["count"], len(body["er"]))
+        self.assertEqual(body["count"], 2 * 1440 + 1)
+
+    def test_compact_count(self):
+        res = self.client.get(
+            "/ee-index", params={**self.params, "labelFormat": "compact"}
+        )
+        self.assertEqual(res.status_code, 200)
+        body = res.json()
+        label_range = body["minuteLabelRange"]
+        self.assertEqual(label_range["count"], len(body["values"]["er"]))
+        self.assertEqual(label_range["count"], 2 * 1440 + 1)
+        self.assertEqual(
+            datetime.fromisoformat(label_range["start"].replace(" ", "T")),
+            datetime(2014, 4, 1),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,9 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class PeakEuelModel(BaseModel):
+    date: date
+    station_code: str
+    peak_euel: float
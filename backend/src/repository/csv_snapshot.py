@@ -0,0 +1,185 @@
+import json
+import os
+import threading
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+# CSVを解釈してDataFrameを返す関数。数値・日時・文字列の列のみを扱う
+CsvParser = Callable[[str], pd.DataFrame]
+
+SNAPSHOT_SUFFIX = ".snapshot.npz"
+# 列ごとの.npyをmemmapで読み込むスナップショットのディレクトリ
+MMAP_SNAPSHOT_SUFFIX = ".snapshot"
+
+# 同じプロセス内での書き込みの競合を防ぐ
+_write_lock = threading.Lock()
+
+
+def snapshot_path(csv_path: str) -> str:
+    """CSVと同じディレクトリに置くスナップショットのパス (xxx.csv -> xxx.snapshot.npz)"""
+    root, _ = os.path.splitext(csv_path)
+    return f"{root}{SNAPSHOT_SUFFIX}"
+
+
+def mmap_snapshot_dir(csv_path: str) -> str:
+    """memmap用のスナップショットのディレクトリ (xxx.csv -> xxx.snapshot/)"""
+    root, _ = os.path.splitext(csv_path)
+    return f"{root}{MMAP_SNAPSHOT_SUFFIX}"
+
+
+def _csv_fingerprint(csv_path: str) -> np.ndarray:
+    stat = os.stat(csv_path)
+    return np.array([stat.st_mtime_ns, stat.st_size], dtype=np.int64)
+
+
+def _to_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    columns = {}
+    for name in df.columns:
+        values = df[name].to_numpy()
+        # 文字列の列はpickleを使わずに保存できるようUnicodeの配列にする
+        if values.dtype == object:
+            values = values.astype(str)
+        columns[str(name)] = values
+    return columns
+
+
+def _write_snapshot(csv_path: str, columns: Dict[str, np.ndarray]) -> None:
+    path = snapshot_path(csv_path)
+    # 列名には"/"などが含まれるため、npzのキーは連番にして列名を別に保存する
+    arrays = {f"c{i}": values for i, values in enumerate(columns.values())}
+    tmp_path = f"{path}.tmp"
+    with _write_lock:
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                __columns__=np.array(list(columns), dtype=str),
+                __source__=_csv_fingerprint(csv_path),
+                **arrays,
+            )
+        os.replace(tmp_path, path)
+
+
+def _read_snapshot(csv_path: str) -> Dict[str, np.ndarray] | None:
+    """CSVから作成した時点のスナップショットがあれば読み込む。CSVが更新されていればNone"""
+    path = snapshot_path(csv_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            if not np.array_equal(npz["__source__"], _csv_fingerprint(csv_path)):
+                return None
+            names = npz["__columns__"]
+            return {str(name): npz[f"c{i}"] for i, name in enumerate(names)}
+    except (OSError, ValueError, KeyError):
+        # 書き込み途中・形式の異なるファイルは作り直す
+        return None
+
+
+def build_snapshot(csv_path: str, parse: CsvParser) -> Dict[str, np.ndarray]:
+    """CSVを解釈してスナップショットを作成し、列を返す"""
+    columns = _to_columns(parse(csv_path))
+    try:
+        _write_snapshot(csv_path, columns)
+    except OSError as e:
+        # 書き込めない環境でもCSVの内容は返す
+        print(f"[Warning] Failed to write snapshot of {csv_path}: {e}")
+    return columns
+
+
+def load_csv_columns(csv_path: str, parse: CsvParser) -> Dict[str, np.ndarray]:
+    """CSVの列を型付きのNumPy配列で返す
+
+    CSVをデータの正とし、CSVと同じディレクトリにnpz形式のスナップショットを保存する。
+    スナップショットはCSVの更新時刻・サイズを記録しており、CSVが変更された場合は
+    次の読み込み時にparseで作り直す。
+
+    Args:
+      parse: CSVを解釈する関数。スナップショットが無い・古い場合のみ呼ばれる
+    Return:
+      列名 -> 配列 (CSVの列の順)
+    """
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"{csv_path} not found.")
+    columns = _read_snapshot(csv_path)
+    if columns is None:
+        columns = build_snapshot(csv_path, parse)
+    return columns
+
+
+def load_csv_frame(csv_path: str, parse: CsvParser) -> pd.DataFrame:
+    """load_csv_columnsの結果をDataFrameで返す"""
+    return pd.DataFrame(load_csv_columns(csv_path, parse))
+
+
+def _write_mmap_snapshot(csv_path: str, columns: Dict[str, np.ndarray]) -> None:
+    directory = mmap_snapshot_dir(csv_path)
+    meta_path = os.path.join(directory, "meta.json")
+    with _write_lock:
+        os.makedirs(directory, exist_ok=True)
+        # 作成中に読み込まれないよう、列名とCSVの更新時刻・サイズのmeta.jsonを最後に書き込む
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        for i, values in enumerate(columns.values()):
+            path = os.path.join(directory, f"c{i}.npy")
+            tmp_path = f"{path}.tmp.npy"
+            np.save(tmp_path, values)
+            os.replace(tmp_path, path)
+        tmp_path = f"{meta_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "columns": list(columns),
+                    "source": _csv_fingerprint(csv_path).tolist(),
+                },
+                f,
+            )
+        os.replace(tmp_path, meta_path)
+
+
+def _read_mmap_snapshot(csv_path: str) -> Dict[str, np.ndarray] | None:
+    """CSVから作成した時点のmemmap用のスナップショットがあれば読み込む。CSVが更新されていればNone"""
+    directory = mmap_snapshot_dir(csv_path)
+    meta_path = os.path.join(directory, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["source"] != _csv_fingerprint(csv_path).tolist():
+            return None
+        return {
+            name: np.load(os.path.join(directory, f"c{i}.npy"), mmap_mode="r")
+            for i, name in enumerate(meta["columns"])
+        }
+    except (OSError, ValueError, KeyError):
+        # 書き込み途中・形式の異なるファイルは作り直す
+        return None
+
+
+def build_mmap_snapshot(csv_path: str, parse: CsvParser) -> Dict[str, np.ndarray]:
+    """CSVを解釈してmemmap用のスナップショットを作成し、列を返す"""
+    columns = _to_columns(parse(csv_path))
+    try:
+        _write_mmap_snapshot(csv_path, columns)
+    except OSError as e:
+        # 書き込めない環境でもCSVの内容は返す
+        print(f"[Warning] Failed to write snapshot of {csv_path}: {e}")
+        return columns
+    return _read_mmap_snapshot(csv_path) or columns
+
+
+def load_csv_columns_mmap(csv_path: str, parse: CsvParser) -> Dict[str, np.ndarray]:
+    """load_csv_columnsと同じ列を、memmapの読み取り専用の配列で返す
+
+    行数の多いCSVの一部の行だけを使う場合に、全ての行を読み込まないために使用する。
+    CSVと同じディレクトリのxxx.snapshot/に列ごとの.npyを保存し、作り直す条件は
+    load_csv_columnsと同じ。
+    """
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"{csv_path} not found.")
+    columns = _read_mmap_snapshot(csv_path)
+    if columns is None:
+        columns = build_mmap_snapshot(csv_path, parse)
+    return columns
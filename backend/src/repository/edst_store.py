@@ -0,0 +1,96 @@
+import os
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+from src.constants.time_relation import TimeUnit
+from src.domain.magdas_station import EeIndexStation
+from src.repository.gm_data import find_min_files
+from src.utils.path import generate_parent_abs_path
+
+
+@dataclass
+class DailyEdst:
+    ut_date: date
+    edst: np.ndarray  # (1440,) float64
+    min_edst: float  # NaNを除いた1日の最小値。全ての分が欠損の場合はNaN
+    complete: bool  # 全ての分にEDstがあるか
+
+    def get_min_edst(self, ignore_nan: bool = True) -> float:
+        """1日の最小値。ignore_nan=Falseの場合、欠損が1分でもあればNaN (np.minと同じ)"""
+        if ignore_nan or self.complete:
+            return self.min_edst
+        return np.nan
+
+
+class EdstStoreRepository:
+    """UT日ごとに計算済みのEDstを保存・取得するリポジトリ
+
+    Storage/edst/{YYYY}/{YYYYMMDD}.npz に1日1ファイルで保存する。
+    各ファイルは以下を持つ。
+      edst: 1440分のEDst (float64。計算したEDstと同じ値を返すため)
+      min_edst: NaNを除いた1日の最小値
+      complete: 全ての分にEDstがあるか
+      fingerprint: 計算に使用した全観測点の.mgdファイル名と更新時刻
+
+    .mgdファイルの追加・削除・更新があった日はfingerprintが一致しなくなり、
+    キャッシュミスとして扱う。
+    """
+
+    def __init__(self, root: str | None = None):
+        self.root = root or generate_parent_abs_path("/Storage/edst")
+
+    def _path(self, ut_date: date) -> str:
+        return os.path.join(
+            self.root, ut_date.strftime("%Y"), f"{ut_date.strftime('%Y%m%d')}.npz"
+        )
+
+    def fingerprint(self, ut_date: date) -> str:
+        """その日の全観測点の.mgdファイル名と更新時刻(ns)を連結した文字列"""
+        entries = []
+        for station in EeIndexStation:
+            for filename in sorted(find_min_files(station.code, ut_date)):
+                mtime_ns = os.stat(filename).st_mtime_ns
+                entries.append(f"{os.path.basename(filename)}:{mtime_ns}")
+        return ";".join(entries)
+
+    def get(self, ut_date: date) -> DailyEdst | None:
+        """保存済みかつ元データが更新されていない場合のみ値を返す"""
+        path = self._path(ut_date)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as npz:
+            # completeの無いファイルは最小値の定義が異なる、float32のファイルは精度が異なる
+            # 古い形式のため再計算する
+            if "complete" not in npz.files or npz["edst"].dtype != np.float64:
+                return None
+            if str(npz["fingerprint"]) != self.fingerprint(ut_date):
+                return None
+            edst = npz["edst"]
+            min_edst = float(npz["min_edst"])
+            complete = bool(npz["complete"])
+        edst.flags.writeable = False
+        return DailyEdst(
+            ut_date=ut_date, edst=edst, min_edst=min_edst, complete=complete
+        )
+
+    def put(self, ut_date: date, edst: np.ndarray, fingerprint: str) -> None:
+        """
+        Args:
+          fingerprint: 計算前に取得したfingerprint。計算中の更新を見逃さないため
+        """
+        if len(edst) != TimeUnit.ONE_DAY.min:
+            raise ValueError("edst must have 1440 elements.")
+        path = self._path(ut_date)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        edst = np.asarray(edst, dtype=np.float64)
+        is_nan = np.isnan(edst)
+        np.savez(
+            tmp_path,
+            edst=edst,
+            min_edst=np.float64(np.nan if is_nan.all() else np.nanmin(edst)),
+            complete=np.bool_(not is_nan.any()),
+            fingerprint=np.array(fingerprint),
+        )
+        os.replace(tmp_path, path)
@@ -1,8 +1,23 @@
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
-from domain.station_params import Period
 from pydantic import BaseModel
+from src.domain.station_params import Period
+from src.repository.csv_snapshot import load_csv_columns_mmap
+
+
+def read_kato_csv(path: str) -> pd.DataFrame:
+    """日時順に並べる。期間の行をsearchsortedで探すため"""
+    df = pd.read_csv(
+        path,
+        usecols=["DATETIME", "EUEL1m", "EDst1m"],
+        parse_dates=["DATETIME"],
+        na_values=["", " "],
+        dtype={"EUEL1m": "float64", "EDst1m": "float64"},
+        float_precision="round_trip",
+    )
+    return df.sort_values("DATETIME", kind="stable", ignore_index=True)
 
 
 class KatoEeData(BaseModel):
@@ -24,24 +39,22 @@ class KatoEeRepository:
         self.csv_path = self.STATION_PATHS[station_code]
 
     def select_by_range(self, period: Period) -> list[KatoEeData]:
-        result: list[KatoEeData] = []
-
-        for chunk in pd.read_csv(
-            self.csv_path,
-            parse_dates=["DATETIME"],
-            na_values=["", " "],
-            dtype={"EUEL1m": "float64", "EDst1m": "float64"},
-            chunksize=200_000,
-        ):
-            filtered = chunk[
-                (chunk["DATETIME"] >= period.start) & (chunk["DATETIME"] <= period.end)
-            ]
-            if filtered.empty:
-                continue
-
-            result.extend(
-                KatoEeData(dt=row.DATETIME, euel_data=row.EUEL1m, edst_data=row.EDst1m)
-                for row in filtered.itertuples(index=False)
+        """期間(両端を含む)の分値
+
+        Note:
+          複数年の分値のCSVのため、列をmemmapで開き、日時順の列から期間の行だけを読み込む
+        """
+        columns = load_csv_columns_mmap(self.csv_path, read_kato_csv)
+        times = columns["DATETIME"]
+        lo = np.searchsorted(times, np.datetime64(period.start).astype(times.dtype))
+        hi = np.searchsorted(
+            times, np.datetime64(period.end).astype(times.dtype), side="right"
+        )
+        return [
+            KatoEeData(dt=dt, euel_data=euel, edst_data=edst)
+            for dt, euel, edst in zip(
+                pd.to_datetime(times[lo:hi]).to_pydatetime(),
+                columns["EUEL1m"][lo:hi].tolist(),
+                columns["EDst1m"][lo:hi].tolist(),
             )
-
-        return result
+        ]
@@ -1,48 +1,197 @@
-import csv
-from datetime import datetime
-from typing import List
+import os
+import threading
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List
 
+import numpy as np
+import pandas as pd
 from src.domain.station_params import Period
 from src.model.eej_category import EejCategoryModel, EejEventCategory
+from src.repository.csv_snapshot import load_csv_columns
+from src.repository.sqlite_storage import SqliteStorage, get_sqlite_storage
+
+
+def read_eej_category_csv(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path, dtype={"category": str}, float_precision="round_trip")
+    df["date"] = pd.to_datetime(df["date"], format="%Y-%m-%d")
+    return df
+
+
+@dataclass(frozen=True)
+class EejCategoryTable:
+    """日付順に並べたEEJの分類の列と、分類ごとの行番号のインデックス
+
+    Attributes:
+      dates: (日数,) datetime64[D] の日付(昇順)
+      category_rows: 分類 -> その分類の行番号(日付順)
+      source: 読み込んだCSVの (更新時刻(ns), サイズ)
+    """
+
+    dates: np.ndarray
+    min_edst: np.ndarray
+    max_kp: np.ndarray
+    categories: np.ndarray
+    category_rows: Dict[str, np.ndarray]
+    source: tuple[int, int]
+
+    @classmethod
+    def from_columns(
+        cls, columns: Dict[str, np.ndarray], source: tuple[int, int]
+    ) -> "EejCategoryTable":
+        dates = columns["date"].astype("datetime64[D]")
+        order = np.argsort(dates, kind="stable")
+        categories = columns["category"][order]
+        table = cls(
+            dates=dates[order],
+            min_edst=columns["min_edst"].astype(float)[order],
+            max_kp=columns["max_kp"].astype(float)[order],
+            categories=categories,
+            category_rows={
+                category.value: np.flatnonzero(categories == category.value)
+                for category in EejEventCategory
+            },
+            source=source,
+        )
+        for array in (table.dates, table.min_edst, table.max_kp, table.categories):
+            array.flags.writeable = False
+        return table
+
+    def rows(
+        self, start: date | None, end: date | None, category: str | None
+    ) -> np.ndarray:
+        """start以上end以下の日付で、分類がcategoryの行番号 (Noneは条件なし)"""
+        if category is None:
+            rows, dates = None, self.dates
+        else:
+            rows = self.category_rows.get(category, np.array([], dtype=np.intp))
+            dates = self.dates[rows]
+        lo = 0 if start is None else np.searchsorted(dates, np.datetime64(start, "D"))
+        hi = (
+            len(dates)
+            if end is None
+            else np.searchsorted(dates, np.datetime64(end, "D"), side="right")
+        )
+        return np.arange(lo, hi) if rows is None else rows[lo:hi]
+
+    def to_models(self, rows: np.ndarray) -> List[EejCategoryModel]:
+        return [
+            EejCategoryModel(
+                date=row_date,
+                min_edst=min_edst,
+                kp=max_kp,
+                category=EejEventCategory(category),
+            )
+            for row_date, min_edst, max_kp, category in zip(
+                self.dates[rows].tolist(),
+                self.min_edst[rows].tolist(),
+                self.max_kp[rows].tolist(),
+                self.categories[rows].tolist(),
+            )
+        ]
+
+
+# CSVのパス -> 読み込み済みのテーブル。リクエスト間で共有する
+_tables: Dict[str, EejCategoryTable] = {}
+_tables_lock = threading.Lock()
 
 
 class EejCategoryRepository:
-    def __init__(self):
-        self.csv_path = "Storage/eej_category.csv"
+    """日ごとのEEJの分類(eej_category.csv)を取得するリポジトリ
 
-    def _fetch_all_from_storage(self) -> List[EejCategoryModel]:
-        data: List[EejCategoryModel] = []
+    Note:
+      CSVは1回だけ読み込み、日付順の列と分類ごとのインデックスを保持して共有する。
+      CSVの更新時刻・サイズが変わった場合は読み込み直す。テーブルは読み取り専用で、
+      読み込み直しは新しいテーブルへの置き換えのため、参照中のテーブルには影響しない。
+      MAGDAS_STORAGE_BACKENDがsqliteの場合はSQLiteのeej_categoryテーブルから取得する。
+    """
+
+    def __init__(
+        self,
+        csv_path: str = "Storage/eej_category.csv",
+        storage: SqliteStorage | None = None,
+    ):
+        self.csv_path = csv_path
+        self.storage = storage or get_sqlite_storage()
+
+    def _table(self) -> EejCategoryTable:
+        key = os.path.abspath(self.csv_path)
         try:
-            with open(self.csv_path, mode="r", newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    category_enum = EejEventCategory(row["category"])
-                    date = datetime.strptime(row["date"], "%Y-%m-%d").date()
-                    data.append(
-                        EejCategoryModel(
-                            date=date,
-                            min_edst=float(row["min_edst"]),
-                            kp=float(row["max_kp"]),
-                            category=category_enum,
-                        )
-                    )
+            stat = os.stat(self.csv_path)
         except FileNotFoundError:
             raise FileNotFoundError(f"{self.csv_path} not found.")
-        return data
+        source = (stat.st_mtime_ns, stat.st_size)
+        table = _tables.get(key)
+        if table is not None and table.source == source:
+            return table
+        with _tables_lock:
+            table = _tables.get(key)
+            if table is None or table.source != source:
+                columns = load_csv_columns(self.csv_path, read_eej_category_csv)
+                table = EejCategoryTable.from_columns(columns, source)
+                _tables[key] = table
+        return table
+
+    def _fetch_all_from_storage(self) -> List[EejCategoryModel]:
+        return self.select(None, None)
+
+    def _rows(
+        self, period: Period | None, category: str | None
+    ) -> tuple[EejCategoryTable, np.ndarray]:
+        table = self._table()
+        return table, table.rows(*_date_range(period), category)
 
     def select(self, period: Period, category: str) -> List[EejCategoryModel]:
-        """条件に応じて絞り込み"""
-        data = self._fetch_all_from_storage()  # ← CSV/DB/Firestore など、取得元は自由
-        result = []
-        start_date = period.start
-        end_date = period.end
-
-        for row in data:
-            if category is not None and row.category.value != category:
-                continue
-            if start_date is not None and row.date < start_date.date():
-                continue
-            if end_date is not None and row.date > end_date.date():
-                continue
-            result.append(row)
-        return result
+        """期間(日付の両端を含む)と分類で絞り込み。categoryがNoneの場合は全ての分類"""
+        if self.storage is not None:
+            return [
+                EejCategoryModel(
+                    date=row_date,
+                    min_edst=min_edst,
+                    kp=max_kp,
+                    category=EejEventCategory(row_category),
+                )
+                for row_date, min_edst, max_kp, row_category in (
+                    self.storage.select_eej_categories(*_date_range(period), category)
+                )
+            ]
+        table, rows = self._rows(period, category)
+        return table.to_models(rows)
+
+    def select_dates(self, period: Period, category: str) -> List[date]:
+        """selectの日付のみ。モデルを作成しない"""
+        if self.storage is not None:
+            return [
+                date.fromisoformat(row[0])
+                for row in self.storage.select_eej_categories(
+                    *_date_range(period), category
+                )
+            ]
+        table, rows = self._rows(period, category)
+        return table.dates[rows].tolist()
+
+    def count(self, period: Period, category: str | None = None) -> int:
+        """期間(日付の両端を含む)の分類ごとの日数。モデルを作成しない"""
+        if self.storage is not None:
+            counts = self.storage.count_eej_categories(*_date_range(period))
+            return sum(counts.values()) if category is None else counts.get(category, 0)
+        _, rows = self._rows(period, category)
+        return len(rows)
+
+    def count_by_category(self, period: Period) -> Dict[EejEventCategory, int]:
+        """期間(日付の両端を含む)の各分類の日数"""
+        if self.storage is not None:
+            counts = self.storage.count_eej_categories(*_date_range(period))
+            return {
+                category: counts.get(category.value, 0) for category in EejEventCategory
+            }
+        return {
+            category: self.count(period, category.value)
+            for category in EejEventCategory
+        }
+
+
+def _date_range(period: Period | None) -> tuple[date | None, date | None]:
+    start = period.start.date() if period and period.start else None
+    end = period.end.date() if period and period.end else None
+    return start, end
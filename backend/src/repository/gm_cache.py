@@ -0,0 +1,162 @@
+import os
+import time
+from datetime import date
+from typing import Literal
+
+import numpy as np
+from src.constants.storage import GM_CACHE_RECHECK_SEC
+from src.constants.time_relation import TimeUnit
+from src.utils.path import generate_parent_abs_path
+
+GMComponent = Literal["h", "d", "z", "f"]
+GM_COMPONENTS: tuple[GMComponent, ...] = ("h", "d", "z", "f")
+# 磁場データの型。.mgdの生データ・キャッシュ・期間の切り出し結果で共通
+GM_DTYPE = np.float32
+
+
+def days_in_year(year: int) -> int:
+    return (date(year + 1, 1, 1) - date(year, 1, 1)).days
+
+
+def _stat_signature(path: str) -> tuple[int, int, int] | None:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+# (キャッシュのディレクトリ, 元データのディレクトリ, 観測点コード, 年)
+#   -> (確認した時刻, 確認時のディレクトリ・fingerprintファイルの状態, 最新か)
+_fresh_checks: dict[tuple[str, str, str, int], tuple[float, tuple, bool]] = {}
+
+
+class GMYearCacheRepository:
+    """観測点・年ごとにサニタイズ済みの h/d/z/f を保存するキャッシュ
+
+    Storage/gm_cache/{CODE}/{YYYY}_{component}.npy に (年の日数, 1440) の float32 で保存し、
+    memmapで読み込む。ファイルが存在しない日は全てNaN。
+    Storage/gm_cache/{CODE}/{YYYY}_fingerprint.txt には作成時の元データ
+    (.mgdファイル名と更新時刻)を保存し、元データが変更されたキャッシュは使用しない。
+    """
+
+    def __init__(
+        self,
+        root: str | None = None,
+        raw_root: str | None = None,
+        recheck_sec: float = GM_CACHE_RECHECK_SEC,
+    ):
+        """
+        Args:
+          root: キャッシュのディレクトリ。Noneの場合はStorage/gm_cache
+          raw_root: 元データ(.mgd)のディレクトリ。Noneの場合はStorage/magdas
+          recheck_sec: is_freshで全ての.mgdファイルの更新時刻を確認し直す間隔(秒)
+        """
+        self.root = root or generate_parent_abs_path("/Storage/gm_cache")
+        self.raw_root = raw_root or generate_parent_abs_path("/Storage/magdas")
+        self.recheck_sec = recheck_sec
+
+    def _path(self, station_code: str, year: int, name: str) -> str:
+        return os.path.join(self.root, station_code, f"{year}_{name}")
+
+    def _raw_dir(self, station_code: str, year: int) -> str:
+        return os.path.join(self.raw_root, station_code, "Min", str(year))
+
+    def fingerprint(self, station_code: str, year: int) -> str:
+        """その年の.mgdファイル名と更新時刻(ns)を連結した文字列"""
+        raw_dir = self._raw_dir(station_code, year)
+        if not os.path.isdir(raw_dir):
+            return ""
+        with os.scandir(raw_dir) as it:
+            entries = sorted(
+                f"{e.name}:{e.stat().st_mtime_ns}"
+                for e in it
+                if e.name.endswith(".mgd")
+            )
+        return ";".join(entries)
+
+    def is_fresh(self, station_code: str, year: int) -> bool:
+        """キャッシュが存在し、作成後に元データが変更されていないか
+
+        Note:
+          全ての.mgdファイルの更新時刻の確認(fingerprint)はプロセスごとにrecheck_sec間隔で行う。
+          間隔内は元データのディレクトリとfingerprintファイルの状態だけを確認するため、
+          ファイルの追加・削除・置き換えとキャッシュの再作成はすぐに反映され、
+          同じファイルへの上書きはrecheck_sec以内に反映される
+        """
+        key = (self.root, self.raw_root, station_code, year)
+        fingerprint_path = self._path(station_code, year, "fingerprint.txt")
+        # 比較中の変更を見逃さないよう、比較の前に状態を取得する
+        signature = (
+            _stat_signature(self._raw_dir(station_code, year)),
+            _stat_signature(fingerprint_path),
+        )
+        now = time.monotonic()
+        checked = _fresh_checks.get(key)
+        if (
+            checked is not None
+            and checked[1] == signature
+            and now - checked[0] < self.recheck_sec
+        ):
+            return checked[2]
+
+        fresh = self._matches_fingerprint(station_code, year, fingerprint_path)
+        _fresh_checks[key] = (now, signature, fresh)
+        return fresh
+
+    def _matches_fingerprint(
+        self, station_code: str, year: int, fingerprint_path: str
+    ) -> bool:
+        if not os.path.exists(fingerprint_path):
+            return False
+        with open(fingerprint_path, encoding="utf-8") as f:
+            return f.read() == self.fingerprint(station_code, year)
+
+    def load(
+        self,
+        station_code: str,
+        year: int,
+        component: GMComponent,
+        check_fresh: bool = True,
+    ) -> np.memmap | None:
+        """最新のキャッシュが存在する場合のみ (年の日数, 1440) のmemmapを返す
+
+        Args:
+          check_fresh: Falseの場合、is_freshで確認済みとして元データとの比較を省略する
+        """
+        if check_fresh and not self.is_fresh(station_code, year):
+            return None
+        return np.load(
+            self._path(station_code, year, f"{component}.npy"), mmap_mode="r"
+        )
+
+    def save(
+        self,
+        station_code: str,
+        year: int,
+        components: dict[str, np.ndarray],
+        fingerprint: str,
+    ) -> None:
+        """
+        Args:
+          components: {"h": (年の日数, 1440), ...}
+          fingerprint: 作成前に取得したfingerprint。作成中の更新を見逃さないため
+        """
+        shape = (days_in_year(year), TimeUnit.ONE_DAY.min)
+        os.makedirs(os.path.join(self.root, station_code), exist_ok=True)
+        # 作成中に読み込まれないよう、fingerprintを最後に書き込む
+        fingerprint_path = self._path(station_code, year, "fingerprint.txt")
+        if os.path.exists(fingerprint_path):
+            os.remove(fingerprint_path)
+        for component in GM_COMPONENTS:
+            values = components[component]
+            if values.shape != shape:
+                raise ValueError(f"{component} must have shape {shape}.")
+            path = self._path(station_code, year, f"{component}.npy")
+            tmp_path = f"{path}.tmp.npy"
+            np.save(tmp_path, values.astype(GM_DTYPE, copy=False))
+            os.replace(tmp_path, path)
+        tmp_path = f"{fingerprint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(fingerprint)
+        os.replace(tmp_path, fingerprint_path)
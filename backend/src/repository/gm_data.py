@@ -1,16 +1,53 @@
+from collections import Counter
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from glob import glob
-from typing import Literal
+from typing import Iterable
 
 import numpy as np
 from src.constants.ee_index import MAX_RAW_H, MIN_RAW_H
 from src.constants.time_relation import TimeUnit
 from src.domain.station_params import StationParam
+from src.repository.gm_cache import (
+    GM_COMPONENTS,
+    GM_DTYPE,
+    GMComponent,
+    GMYearCacheRepository,
+    days_in_year,
+)
 from src.repository.raw_file_reader import read_raw_min_data
 from src.utils.path import generate_parent_abs_path
 
 
+def find_min_files(
+    station_code: str, ut_date: date, raw_root: str | None = None
+) -> list[str]:
+    """指定した観測点・UT日付の分値ファイル(.mgd)のパスを取得
+
+    Args:
+      raw_root: .mgdファイルのディレクトリ。Noneの場合はStorage/magdas
+    """
+    year = ut_date.strftime("%Y")
+    month = ut_date.strftime("%m")
+    day = ut_date.strftime("%d")
+    raw_root = raw_root or generate_parent_abs_path("/Storage/magdas")
+    return glob(
+        f"{raw_root}/{station_code}/Min/{year}/{station_code}_MIN_{year}{month}{day}*.mgd"
+    )
+
+
+def find_sec_files(station_code: str, ut_date: date) -> list[str]:
+    """指定した観測点・UT日付の秒値ファイル(.mgd)のパスを取得"""
+    year = ut_date.strftime("%Y")
+    month = ut_date.strftime("%m")
+    day = ut_date.strftime("%d")
+    return glob(
+        generate_parent_abs_path(
+            f"/Storage/magdas/{station_code}/Sec/{year}/{station_code}_SEC_{year}{month}{day}*.mgd"
+        )
+    )
+
+
 @dataclass
 class GM:
     h: np.ndarray
@@ -20,26 +57,24 @@ class GM:
 
 
 class GMDataLoader:
-    def __init__(self, station_code: str, ut_date: date):
+    # (観測点コード, UT日付)ごとの読み込み回数。重複読み込みの検知(テスト)に使用
+    load_counter: Counter[tuple[str, date]] = Counter()
+
+    def __init__(self, station_code: str, ut_date: date, raw_root: str | None = None):
         self.station_code = station_code
         self.ut_date = ut_date
+        self.raw_root = raw_root
         self.gm = self._load_gm()
 
     def _load_gm(self) -> GM:
-        year = self.ut_date.strftime("%Y")
-        month = self.ut_date.strftime("%m")
-        day = self.ut_date.strftime("%d")
-        filenames = glob(
-            generate_parent_abs_path(
-                f"/Storage/magdas/{self.station_code}/Min/{year}/{self.station_code}_MIN_{year}{month}{day}*.mgd"
-            )
-        )
+        GMDataLoader.load_counter[(self.station_code, self.ut_date)] += 1
+        filenames = find_min_files(self.station_code, self.ut_date, self.raw_root)
         if len(filenames) > 1:
             raise FileNotFoundError(
                 f"Multiple files found for {self.station_code} at {self.ut_date}: {filenames}"
             )
         if len(filenames) == 0:
-            nan_arr = np.full(TimeUnit.ONE_DAY.min, np.NaN)
+            nan_arr = np.full(TimeUnit.ONE_DAY.min, np.NaN, dtype=GM_DTYPE)
             return GM(nan_arr, nan_arr, nan_arr, nan_arr)
         try:
             raw_data = read_raw_min_data(filenames[0])[:, :4]  # Get only h, d, z, f
@@ -47,12 +82,13 @@ class GMDataLoader:
             h, d, z, f = data.T
             return GM(h, d, z, f)
         except ValueError:  # Handle file format errors
-            nan_arr = np.full(TimeUnit.ONE_DAY.min, np.NaN)
+            nan_arr = np.full(TimeUnit.ONE_DAY.min, np.NaN, dtype=GM_DTYPE)
             return GM(nan_arr, nan_arr, nan_arr, nan_arr)
 
     def _sanitize(self, data: np.ndarray) -> np.ndarray:
         """Sanitize the data by replacing invalid values with NaN."""
-        return np.where((data <= MIN_RAW_H) | (data >= MAX_RAW_H), np.NaN, data)
+        sanitized = np.where((data <= MIN_RAW_H) | (data >= MAX_RAW_H), np.NaN, data)
+        return sanitized.astype(GM_DTYPE, copy=False)
 
     @property
     def h(self) -> np.ndarray:
@@ -75,33 +111,112 @@ class GMDataLoader:
 
 
 class GMPeriodRepository:
-    def __init__(self, params: StationParam):
+    def __init__(
+        self,
+        params: StationParam,
+        cache: GMYearCacheRepository | None = None,
+    ):
+        """
+        Args:
+          cache: 観測点・年ごとのキャッシュ。.mgdファイルもcache.raw_rootから読み込む
+        """
         self.station = params.station
         self.start_ut = params.period.start
         self.end_ut = params.period.end
+        self.cache = cache or GMYearCacheRepository()
 
     def _get_idx(self, ut: datetime) -> int:
         return ut.hour * TimeUnit.ONE_HOUR.min + ut.minute
 
-    def get(self, component: Literal["h", "d", "z", "f"]) -> np.ndarray:
-        start_date, end_date = self.start_ut.date(), self.end_ut.date()
-        if start_date == end_date:
-            start_idx = self._get_idx(self.start_ut)
-            end_idx = self._get_idx(self.end_ut)
-            gm_loader = GMDataLoader(self.station.code, start_date)
-            return getattr(gm_loader, component)[start_idx : end_idx + 1]
+    def _minute_offset(self, origin: datetime, ut: datetime) -> int:
+        return int((ut - origin).total_seconds()) // TimeUnit.ONE_MINUTE.sec
+
+    def _empty_values(self, components: Iterable[GMComponent]) -> dict[str, np.ndarray]:
+        length = self._minute_offset(self.start_ut, self.end_ut) + 1
+        return {component: np.empty(length, dtype=GM_DTYPE) for component in components}
+
+    def get(self, component: GMComponent) -> np.ndarray:
+        return self.get_many((component,))[component]
+
+    def get_many(
+        self, components: Iterable[GMComponent] = GM_COMPONENTS
+    ) -> dict[str, np.ndarray]:
+        """複数の成分をファイルの1回の読み込みで取得
 
-        values = np.array([], dtype=np.float32)
+        Return:
+          {成分: 期間の分値(GM_DTYPE)}。出力は期間の長さで確保してから日ごとに埋める
+        """
+        components = tuple(components)
+        cached_values = self._get_many_from_cache(components)
+        if cached_values is not None:
+            return cached_values
+
+        values = self._empty_values(components)
+        start_date, end_date = self.start_ut.date(), self.end_ut.date()
+        pos = 0
         for i in range((end_date - start_date).days + 1):
             current_date = start_date + timedelta(days=i)
-            gm_loader = GMDataLoader(self.station.code, current_date)
-            day_data = getattr(gm_loader, component)
-            if current_date == start_date:  # 初日
-                start_idx = self._get_idx(self.start_ut)
-                values = np.concatenate((values, day_data[start_idx:]))
-            elif current_date == end_date:  # 最終日
-                end_idx = self._get_idx(self.end_ut)
-                values = np.concatenate((values, day_data[: end_idx + 1]))
-            else:
-                values = np.concatenate((values, day_data))
+            gm_loader = GMDataLoader(
+                self.station.code, current_date, self.cache.raw_root
+            )
+            # 初日は開始時刻から、最終日は終了時刻まで
+            start_idx = self._get_idx(self.start_ut) if i == 0 else 0
+            end_idx = (
+                self._get_idx(self.end_ut)
+                if current_date == end_date
+                else TimeUnit.ONE_DAY.min - 1
+            )
+            n = end_idx - start_idx + 1
+            for component in components:
+                day_data = getattr(gm_loader, component)
+                values[component][pos : pos + n] = day_data[start_idx : end_idx + 1]
+            pos += n
+        return values
+
+    def _get_many_from_cache(
+        self, components: tuple[GMComponent, ...]
+    ) -> dict[str, np.ndarray] | None:
+        """期間内の全ての年のキャッシュが最新の場合、.mgdを読まずにmemmapから切り出す"""
+        cache = self.cache
+        years = range(self.start_ut.year, self.end_ut.year + 1)
+        if not all(cache.is_fresh(self.station.code, year) for year in years):
+            return None
+
+        values = self._empty_values(components)
+        pos = 0
+        for year in years:
+            year_start = datetime(year, 1, 1)
+            start_idx = self._minute_offset(year_start, max(self.start_ut, year_start))
+            end_idx = self._minute_offset(
+                year_start, min(self.end_ut, datetime(year, 12, 31, 23, 59))
+            )
+            n = end_idx - start_idx + 1
+            for component in components:
+                year_values = cache.load(
+                    self.station.code, year, component, check_fresh=False
+                )
+                values[component][pos : pos + n] = year_values.reshape(-1)[
+                    start_idx : end_idx + 1
+                ]
+            pos += n
         return values
+
+
+def build_gm_year_cache(
+    station_code: str, year: int, cache: GMYearCacheRepository | None = None
+) -> None:
+    """観測点・年ごとのh/d/z/fのキャッシュを.mgdファイルから作成する"""
+    cache = cache or GMYearCacheRepository()
+    fingerprint = cache.fingerprint(station_code, year)
+    n_days = days_in_year(year)
+    components = {
+        component: np.full((n_days, TimeUnit.ONE_DAY.min), np.nan, dtype=GM_DTYPE)
+        for component in GM_COMPONENTS
+    }
+    for i in range(n_days):
+        gm_loader = GMDataLoader(
+            station_code, date(year, 1, 1) + timedelta(days=i), cache.raw_root
+        )
+        for component in GM_COMPONENTS:
+            components[component][i] = getattr(gm_loader, component)
+    cache.save(station_code, year, components, fingerprint)
@@ -0,0 +1,241 @@
+import json
+import os
+import shutil
+import socket
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Optional
+
+from src.utils.path import generate_parent_abs_path
+
+# このプロセスの起動ごとに異なる値。再起動後に同じpidが割り当てられた場合と区別する
+_BOOT_ID = uuid.uuid4().hex
+
+
+def current_owner() -> str:
+    """このプロセスを表すジョブの所有者 ({ホスト名}:{pid}:{起動ID})"""
+    return f"{socket.gethostname()}:{os.getpid()}:{_BOOT_ID}"
+
+
+def is_owner_alive(owner: str) -> bool:
+    """ジョブを登録したプロセスが動作中か
+
+    別のホストのプロセスは確認できないため動作中とみなす。
+    所有者の無いジョブ(所有者を記録する前の形式)は動作中とみなさない。
+    """
+    try:
+        host, pid, boot_id = owner.rsplit(":", 2)
+        pid = int(pid)
+    except ValueError:
+        return False
+    if host != socket.gethostname():
+        return True
+    if pid == os.getpid():
+        return boot_id == _BOOT_ID
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobState(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    @property
+    def is_active(self) -> bool:
+        """待機中・実行中か"""
+        return self in (JobState.PENDING, JobState.RUNNING)
+
+
+@dataclass
+class JobStatus:
+    """
+    Attributes:
+      progress: 完了した処理の数
+      total: 処理の総数(不明な場合は0)
+      key: 同じ処理のジョブを判定するためのキー
+      artifact: 成果物のファイル名(DONEの場合のみ)
+      owner: ジョブを登録したプロセス(current_owner)
+    """
+
+    job_id: str
+    state: JobState
+    key: str = ""
+    progress: int = 0
+    total: int = 0
+    artifact: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+    owner: str = ""
+
+
+class JobStoreRepository:
+    """バックグラウンドで実行するジョブの状態と成果物を保存するリポジトリ
+
+    Storage/jobs/{job_id}/status.json に状態を、同じディレクトリに成果物を保存する。
+    状態はファイルで共有するため、ジョブを実行するスレッド・プロセスと
+    状態を問い合わせるリクエストが別でもよい。
+    """
+
+    def __init__(self, root: str | None = None):
+        self.root = root or generate_parent_abs_path("/Storage/jobs")
+
+    def job_dir(self, job_id: str) -> str:
+        return os.path.join(self.root, job_id)
+
+    def artifact_path(self, job_id: str, filename: str) -> str:
+        return os.path.join(self.job_dir(job_id), filename)
+
+    def _status_path(self, job_id: str) -> str:
+        return os.path.join(self.job_dir(job_id), "status.json")
+
+    def create(self, key: str = "") -> JobStatus:
+        job_id = uuid.uuid4().hex
+        os.makedirs(self.job_dir(job_id), exist_ok=True)
+        now = time.time()
+        status = JobStatus(
+            job_id=job_id,
+            state=JobState.PENDING,
+            key=key,
+            created_at=now,
+            updated_at=now,
+            owner=current_owner(),
+        )
+        self._write(status)
+        return status
+
+    def get(self, job_id: str) -> JobStatus | None:
+        path = self._status_path(job_id)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        data["state"] = JobState(data["state"])
+        return JobStatus(**data)
+
+    def update(self, job_id: str, **fields) -> JobStatus:
+        status = self.get(job_id)
+        if status is None:
+            raise ValueError(f"Job {job_id} is not found.")
+        for key, value in fields.items():
+            setattr(status, key, value)
+        status.updated_at = time.time()
+        self._write(status)
+        return status
+
+    def _job_ids(self) -> list[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return os.listdir(self.root)
+
+    def find_active(self, key: str) -> JobStatus | None:
+        """keyが同じ待機中・実行中のジョブ。複数ある場合は最も新しいもの
+
+        状態はファイルで共有するため、別のプロセス(uvicornのワーカー)が登録したジョブも対象になる。
+        登録したプロセスが終了しているジョブは失敗とし(fail_orphaned)、対象にしない。
+        """
+        active = [
+            status
+            for status in (self.get(job_id) for job_id in self._job_ids())
+            if status is not None
+            and status.key == key
+            and status.state.is_active
+            and not self.fail_orphaned(status)
+        ]
+        return max(active, key=lambda status: status.created_at, default=None)
+
+    def fail_orphaned(self, status: JobStatus) -> bool:
+        """登録したプロセスが終了した待機中・実行中のジョブを失敗とする
+
+        再起動やワーカーの異常終了の後、ジョブの状態は更新されないまま残るため
+
+        Return:
+          失敗とした場合はTrue
+        """
+        if not status.state.is_active or is_owner_alive(status.owner):
+            return False
+        self.update(
+            status.job_id,
+            state=JobState.FAILED,
+            error="The process running the job has stopped.",
+        )
+        return True
+
+    def fail_all_orphaned(self) -> list[str]:
+        """全てのジョブに対するfail_orphaned
+
+        Return:
+          失敗としたジョブのID
+        """
+        return [
+            status.job_id
+            for status in (self.get(job_id) for job_id in self._job_ids())
+            if status is not None and self.fail_orphaned(status)
+        ]
+
+    def fail_stale(self, stale_sec: float) -> list[str]:
+        """stale_sec以上更新の無い待機中・実行中のジョブを失敗とする
+
+        登録したプロセスが動作中と判定される場合(別のホスト、pidの再利用)でも
+        いずれは失敗とするため
+
+        Return:
+          失敗としたジョブのID
+        """
+        now = time.time()
+        failed = []
+        for job_id in self._job_ids():
+            status = self.get(job_id)
+            if status is None or not status.state.is_active:
+                continue
+            if now - status.updated_at > stale_sec:
+                self.update(
+                    job_id,
+                    state=JobState.FAILED,
+                    error=f"No update for {int(now - status.updated_at)} seconds. "
+                    "The process running the job may have stopped.",
+                )
+                failed.append(job_id)
+        return failed
+
+    def purge_expired(self, ttl_sec: float) -> list[str]:
+        """完了・失敗してからttl_sec以上経過したジョブを成果物ごと削除する
+
+        ttl_sec以上更新の無い待機中・実行中のジョブは先に失敗とし(fail_stale)、
+        さらにttl_secが経過した後に削除する。
+
+        Return:
+          削除したジョブのID
+        """
+        self.fail_stale(ttl_sec)
+        now = time.time()
+        purged = []
+        for job_id in self._job_ids():
+            status = self.get(job_id)
+            if status is None:
+                # status.jsonの無いディレクトリは作成途中の可能性があるため更新時刻で判定
+                expired = now - os.path.getmtime(self.job_dir(job_id)) > ttl_sec
+            else:
+                expired = (
+                    not status.state.is_active and now - status.updated_at > ttl_sec
+                )
+            if expired:
+                shutil.rmtree(self.job_dir(job_id), ignore_errors=True)
+                purged.append(job_id)
+        return purged
+
+    def _write(self, status: JobStatus) -> None:
+        path = self._status_path(status.job_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({**asdict(status), "state": status.state.value}, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,200 @@
+import glob
+import os
+import threading
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+from src.domain.station_params import Period
+from src.model.peak_euel import PeakEuelModel
+from src.repository.csv_snapshot import load_csv_columns
+from src.repository.sqlite_storage import SqliteStorage, get_sqlite_storage
+
+
+def read_peak_euel_csv(path: str) -> pd.DataFrame:
+    # ヘッダーの列名の前に空白を含むファイルがある
+    df = pd.read_csv(
+        path,
+        skipinitialspace=True,
+        dtype={"station_code": str},
+        float_precision="round_trip",
+    )
+    df["date"] = pd.to_datetime(df["date"], format="%Y-%m-%d")
+    return df
+
+
+def peak_euel_csv_paths(csv_dir: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(csv_dir, "*.csv")))
+
+
+@dataclass(frozen=True)
+class PeakEuelTable:
+    """観測点・日付順に並べた昼間の最大のEUEL
+
+    Attributes:
+      dates: (件数,) datetime64[D] の日付
+      station_codes: (件数,) 観測点コード
+      values: (件数,) 最大のEUEL
+      station_slices: 観測点コード -> その観測点の行の範囲(日付順)
+      source: 読み込んだCSVの (パス, 更新時刻(ns), サイズ) のタプル
+    """
+
+    dates: np.ndarray
+    station_codes: np.ndarray
+    values: np.ndarray
+    station_slices: Dict[str, slice]
+    source: tuple
+
+    @classmethod
+    def from_columns(
+        cls, columns: Iterable[Dict[str, np.ndarray]], source: tuple
+    ) -> "PeakEuelTable":
+        columns = list(columns)
+        dates = np.concatenate(
+            [c["date"] for c in columns] or [np.array([], dtype="datetime64[D]")]
+        ).astype("datetime64[D]")
+        codes = np.concatenate(
+            [c["station_code"] for c in columns] or [np.array([], dtype=str)]
+        ).astype(str)
+        values = np.concatenate(
+            [c["peak_euel"] for c in columns] or [np.array([])]
+        ).astype(float)
+        order = np.lexsort((dates, codes))
+        dates, codes, values = dates[order], codes[order], values[order]
+        unique_codes, starts, counts = np.unique(
+            codes, return_index=True, return_counts=True
+        )
+        for array in (dates, codes, values):
+            array.flags.writeable = False
+        return cls(
+            dates=dates,
+            station_codes=codes,
+            values=values,
+            station_slices={
+                code: slice(start, start + count)
+                for code, start, count in zip(
+                    unique_codes.tolist(), starts.tolist(), counts.tolist()
+                )
+            },
+            source=source,
+        )
+
+    def rows(
+        self, station_code: str | None, start: date | None, end: date | None
+    ) -> np.ndarray:
+        """条件に合う行番号(観測点・日付順)。Noneは条件なし、期間は両端を含む"""
+        if station_code is None:
+            slices = list(self.station_slices.values())
+        else:
+            slices = [self.station_slices.get(station_code, slice(0, 0))]
+        rows = []
+        for station_slice in slices:
+            dates = self.dates[station_slice]
+            lo = (
+                0
+                if start is None
+                else np.searchsorted(dates, np.datetime64(start, "D"))
+            )
+            hi = (
+                len(dates)
+                if end is None
+                else np.searchsorted(dates, np.datetime64(end, "D"), side="right")
+            )
+            rows.append(np.arange(station_slice.start + lo, station_slice.start + hi))
+        return np.concatenate(rows) if rows else np.array([], dtype=np.intp)
+
+    def to_models(self, rows: np.ndarray) -> List[PeakEuelModel]:
+        return [
+            PeakEuelModel(date=row_date, station_code=code, peak_euel=peak_euel)
+            for row_date, code, peak_euel in zip(
+                self.dates[rows].tolist(),
+                self.station_codes[rows].tolist(),
+                self.values[rows].tolist(),
+            )
+        ]
+
+
+# CSVのディレクトリ -> 読み込み済みのテーブル。リクエスト間で共有する
+_tables: Dict[str, PeakEuelTable] = {}
+_tables_lock = threading.Lock()
+
+
+class PeakEuelRepository:
+    """観測点ごとの昼間の最大のEUEL(Storage/peak_euel/*.csv)を取得するリポジトリ
+
+    Note:
+      ディレクトリ内のCSVをまとめて1回だけ読み込み、観測点・日付順のテーブルとして共有する。
+      いずれかのCSVが追加・更新された場合は読み込み直す。
+      MAGDAS_STORAGE_BACKENDがsqliteの場合はSQLiteのpeak_euelテーブルから取得する。
+    """
+
+    def __init__(
+        self,
+        csv_dir: str = "Storage/peak_euel",
+        storage: SqliteStorage | None = None,
+    ):
+        self.csv_dir = csv_dir
+        self.storage = storage or get_sqlite_storage()
+
+    def _table(self) -> PeakEuelTable:
+        key = os.path.abspath(self.csv_dir)
+        paths = peak_euel_csv_paths(self.csv_dir)
+        if not paths:
+            raise FileNotFoundError(f"CSV files not found in {self.csv_dir}.")
+        source = tuple(
+            (path, stat.st_mtime_ns, stat.st_size)
+            for path, stat in ((path, os.stat(path)) for path in paths)
+        )
+        table = _tables.get(key)
+        if table is not None and table.source == source:
+            return table
+        with _tables_lock:
+            table = _tables.get(key)
+            if table is None or table.source != source:
+                table = PeakEuelTable.from_columns(
+                    (load_csv_columns(path, read_peak_euel_csv) for path in paths),
+                    source,
+                )
+                _tables[key] = table
+        return table
+
+    def select(
+        self, period: Period | None = None, station_code: str | None = None
+    ) -> List[PeakEuelModel]:
+        """期間(日付の両端を含む)と観測点で絞り込み (観測点・日付順)。Noneは条件なし"""
+        start = period.start.date() if period and period.start else None
+        end = period.end.date() if period and period.end else None
+        if self.storage is not None:
+            return [
+                PeakEuelModel(date=row_date, station_code=code, peak_euel=peak_euel)
+                for row_date, code, peak_euel in self.storage.select_peak_euel(
+                    station_code, start, end
+                )
+            ]
+        table = self._table()
+        return table.to_models(table.rows(station_code, start, end))
+
+    def peak_euel_of_days(self, station_code: str, dates: Iterable[date]) -> np.ndarray:
+        """(日付の数,) 日付ごとの観測点の最大のEUEL。データの無い日はNaN"""
+        days = np.asarray(list(dates), dtype="datetime64[D]")
+        result = np.full(len(days), np.nan)
+        if len(days) == 0:
+            return result
+        if self.storage is not None:
+            rows = self.storage.select_peak_euel(
+                station_code, days.min().item(), days.max().item()
+            )
+            known_dates = np.array([row[0] for row in rows], dtype="datetime64[D]")
+            known_values = np.array([row[2] for row in rows], dtype=float)
+        else:
+            table = self._table()
+            station_slice = table.station_slices.get(station_code, slice(0, 0))
+            known_dates = table.dates[station_slice]
+            known_values = table.values[station_slice]
+        idx = np.searchsorted(known_dates, days)
+        found = idx < len(known_dates)
+        found[found] = known_dates[idx[found]] == days[found]
+        result[found] = known_values[idx[found]]
+        return result
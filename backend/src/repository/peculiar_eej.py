@@ -1,34 +1,198 @@
 import csv
 import os
+import shutil
+import threading
+from dataclasses import dataclass
 from datetime import date, datetime
-from typing import List
+from typing import Dict, List
 
+import numpy as np
+import pandas as pd
 from src.domain.region import Region
 from src.model.peculiar_eej import PeculiarEejModel
+from src.repository.csv_snapshot import load_csv_columns
+from src.repository.sqlite_storage import SqliteStorage, get_sqlite_storage
+
+FIELDNAMES = ["Date", "Region", "Type"]
+
+
+def read_peculiar_eej_csv(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    df["Date"] = pd.to_datetime(df["Date"], format="%Y-%m-%d")
+    return df
+
+
+def _stat_source(path: str) -> tuple[int, int]:
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+@dataclass(frozen=True)
+class PeculiarEejTable:
+    """日付順に並べた特異型EEJの列と、地域・タイプごとの行番号のインデックス
+
+    Attributes:
+      dates: (件数,) datetime64[D] の日付(昇順)
+      region_rows: 地域コード -> その地域の行番号(日付順)
+      type_rows: タイプ -> そのタイプの行番号(日付順)
+      types_by_key: (日付, 地域) -> タイプ
+      source: 読み込んだCSVの (更新時刻(ns), サイズ)。CSVが無い場合はNone
+    """
+
+    dates: np.ndarray
+    regions: np.ndarray
+    types: np.ndarray
+    region_rows: Dict[str, np.ndarray]
+    type_rows: Dict[str, np.ndarray]
+    types_by_key: Dict[tuple[date, Region], str]
+    source: tuple[int, int] | None
+
+    @classmethod
+    def from_columns(
+        cls, columns: Dict[str, np.ndarray], source: tuple[int, int] | None
+    ) -> "PeculiarEejTable":
+        dates = np.asarray(columns["Date"]).astype("datetime64[D]")
+        order = np.argsort(dates, kind="stable")
+        dates = dates[order]
+        regions = np.asarray(columns["Region"], dtype=str)[order]
+        types = np.asarray(columns["Type"], dtype=str)[order]
+        for array in (dates, regions, types):
+            array.flags.writeable = False
+        return cls(
+            dates=dates,
+            regions=regions,
+            types=types,
+            region_rows={
+                code: np.flatnonzero(regions == code) for code in np.unique(regions)
+            },
+            type_rows={
+                type_: np.flatnonzero(types == type_) for type_ in np.unique(types)
+            },
+            types_by_key={
+                (row_date, Region.from_code(code)): type_
+                for row_date, code, type_ in zip(
+                    dates.tolist(), regions.tolist(), types.tolist()
+                )
+            },
+            source=source,
+        )
+
+    @classmethod
+    def empty(cls) -> "PeculiarEejTable":
+        return cls.from_columns(
+            {name: np.array([], dtype=str) for name in FIELDNAMES}, None
+        )
+
+    def with_rows(
+        self, rows: List[PeculiarEejModel], source: tuple[int, int]
+    ) -> "PeculiarEejTable":
+        """rowsを追加した新しいテーブル。自身は変更しない"""
+        return PeculiarEejTable.from_columns(
+            {
+                "Date": np.concatenate(
+                    [
+                        self.dates,
+                        np.array([row.date for row in rows], dtype="datetime64[D]"),
+                    ]
+                ),
+                "Region": np.concatenate(
+                    [
+                        self.regions,
+                        np.array([row.region.code for row in rows], dtype=str),
+                    ]
+                ),
+                "Type": np.concatenate(
+                    [self.types, np.array([row.type for row in rows], dtype=str)]
+                ),
+            },
+            source,
+        )
+
+    def rows(
+        self,
+        region: Region | None,
+        type_: str | None,
+        start: date | None,
+        end: date | None,
+    ) -> np.ndarray:
+        """条件に合う行番号(日付順)。Noneは条件なし、期間は両端を含む"""
+        dates = self.dates
+        lo = 0 if start is None else np.searchsorted(dates, np.datetime64(start, "D"))
+        hi = (
+            len(dates)
+            if end is None
+            else np.searchsorted(dates, np.datetime64(end, "D"), side="right")
+        )
+        rows = np.arange(lo, hi)
+        empty = np.array([], dtype=np.intp)
+        # 行番号は日付順のため、絞り込み後も日付順が保たれる
+        if region is not None:
+            rows = np.intersect1d(
+                rows, self.region_rows.get(region.code, empty), assume_unique=True
+            )
+        if type_ is not None:
+            rows = np.intersect1d(
+                rows, self.type_rows.get(type_, empty), assume_unique=True
+            )
+        return rows
+
+    def to_models(self, rows: np.ndarray) -> List[PeculiarEejModel]:
+        return [
+            PeculiarEejModel(date=row_date, region=Region.from_code(code), type=type_)
+            for row_date, code, type_ in zip(
+                self.dates[rows].tolist(),
+                self.regions[rows].tolist(),
+                self.types[rows].tolist(),
+            )
+        ]
+
+
+# CSVのパス -> 読み込み済みのテーブル。リクエスト間で共有する
+_tables: Dict[str, PeculiarEejTable] = {}
+# テーブルの読み込みとCSVへの書き込みを直列化する
+_tables_lock = threading.RLock()
 
 
 # 特異型EEJを保存・取得するリポジトリ層
 class PeculiarEejRepository:
-    def __init__(self):
-        self.csv_path = "Storage/peculiar_eej_classification.csv"
+    """特異型EEJ(peculiar_eej_classification.csv)を保存・取得するリポジトリ
 
-    def _fetch_all_from_storage(self) -> List[PeculiarEejModel]:
-        data: List[PeculiarEejModel] = []
-        try:
-            with open(self.csv_path, mode="r", newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    region_enum = Region.from_code(row["Region"])
-                    date = datetime.strptime(row["Date"], "%Y-%m-%d").date()
-                    data.append(
-                        PeculiarEejModel(
-                            date=date, region=region_enum, type=row["Type"]
-                        )
-                    )
+    Note:
+      CSVは1回だけ読み込み、日付順の列と地域・タイプごとのインデックスを保持して共有する。
+      CSVの更新時刻・サイズが変わった場合は読み込み直す。
+      MAGDAS_STORAGE_BACKENDがsqliteの場合はSQLiteのpeculiar_eejテーブルに保存・取得する。
+    """
+
+    def __init__(
+        self,
+        csv_path: str = "Storage/peculiar_eej_classification.csv",
+        storage: SqliteStorage | None = None,
+    ):
+        self.csv_path = csv_path
+        self.storage = storage or get_sqlite_storage()
 
+    def _load_table(self, source: tuple[int, int]) -> PeculiarEejTable:
+        columns = load_csv_columns(self.csv_path, read_peculiar_eej_csv)
+        return PeculiarEejTable.from_columns(columns, source)
+
+    def _table(self) -> PeculiarEejTable:
+        key = os.path.abspath(self.csv_path)
+        try:
+            source = _stat_source(self.csv_path)
         except FileNotFoundError:
             raise FileNotFoundError(f"{self.csv_path} not found.")
-        return data
+        table = _tables.get(key)
+        if table is not None and table.source == source:
+            return table
+        with _tables_lock:
+            table = _tables.get(key)
+            if table is None or table.source != source:
+                table = self._load_table(source)
+                _tables[key] = table
+        return table
+
+    def _fetch_all_from_storage(self) -> List[PeculiarEejModel]:
+        return self.select()
 
     def select(
         self,
@@ -37,70 +201,129 @@ class PeculiarEejRepository:
         start_date: datetime | None = None,
         end_date: datetime | None = None,
     ) -> list[PeculiarEejModel]:
-        """条件に応じて絞り込み"""
-        data = self._fetch_all_from_storage()  # ← CSV/DB/Firestore など、取得元は自由
-        result = []
-
-        for row in data:
-            if region is not None and row.region != region:
-                continue
-            if type_ is not None and row.type != type_:
-                continue
-            if start_date is not None and row.date < start_date.date():
-                continue
-            if end_date is not None and row.date > end_date.date():
-                continue
-            result.append(row)
-        return result
+        """条件に応じて絞り込み (日付順、期間は日付の両端を含む)"""
+        start = start_date.date() if start_date is not None else None
+        end = end_date.date() if end_date is not None else None
+        if self.storage is not None:
+            return [
+                PeculiarEejModel(
+                    date=row_date, region=Region.from_code(code), type=row_type
+                )
+                for row_date, code, row_type in self.storage.select_peculiar_eej(
+                    region.code if region is not None else None, type_, start, end
+                )
+            ]
+        table = self._table()
+        return table.to_models(table.rows(region, type_, start, end))
+
+    def select_dates(self, region: Region | None = None) -> List[date]:
+        """地域の特異型EEJの日付(日付順)。モデルを作成しない"""
+        if self.storage is not None:
+            return [
+                date.fromisoformat(row[0])
+                for row in self.storage.select_peculiar_eej(
+                    region.code if region is not None else None, None, None, None
+                )
+            ]
+        table = self._table()
+        return table.dates[table.rows(region, None, None, None)].tolist()
 
     def insert(self, rows: List[PeculiarEejModel]) -> None:
-        # 既存データの取得
-        try:
-            existing_data = self._fetch_all_from_storage()
-        except FileNotFoundError:
-            existing_data = []
-
-        existing_map: dict[tuple[date, Region], str] = {
-            (row.date, row.region): row.type for row in existing_data
-        }
-        new_data: List[PeculiarEejModel] = []
-
-        for row in rows:
-            key = (row.date, row.region)
-
-            if key in existing_map:
-                # 既存データとタイプが異なる場合はエラー
-                if existing_map[key] != row.type:
-                    raise ValueError(
-                        f"Conflicting data found: "
-                        f"Date={row.date}, Region={row.region.code}, "
-                        f"Existing Type={existing_map[key]}, New Type={row.type}"
+        """rowsをまとめて追加する
+
+        既存データと同じ(日付, 地域)でタイプが異なる場合はValueErrorで、何も書き込まない。
+        既存のCSVに新しい行を加えた一時ファイルを作成し、置き換えることで書き込む。
+        SQLiteの場合は既存データの確認と追加を1つのトランザクションで行う。
+        """
+        if self.storage is not None:
+            with self.storage.transaction():
+                existing_map = {
+                    (date.fromisoformat(row_date), Region.from_code(code)): row_type
+                    for row_date, code, row_type in self.storage.select_peculiar_eej(
+                        None, None, None, None
                     )
-                # 既存のデータと同じ
-                print("[Info] Duplicate skipping:", row.date, row.region.code, row.type)
-                continue
+                }
+                new_data = _select_new_rows(existing_map, rows)
+                self.storage.insert_peculiar_eej(
+                    [
+                        (row.date.isoformat(), row.region.code, row.type)
+                        for row in new_data
+                    ]
+                )
+            return
 
-            # 新しいデータ
-            new_data.append(row)
+        with _tables_lock:
+            try:
+                table = self._table()
+            except FileNotFoundError:
+                table = PeculiarEejTable.empty()
+            new_data = _select_new_rows(dict(table.types_by_key), rows)
 
-        # 追加なしなら終了
-        if not new_data:
-            return
+            # 追加なしなら終了
+            if not new_data:
+                return
 
-        file_exists = os.path.exists(self.csv_path)
+            self._write_with_rows(table.source is not None, new_data)
+            _tables[os.path.abspath(self.csv_path)] = table.with_rows(
+                new_data, _stat_source(self.csv_path)
+            )
 
-        with open(
-            self.csv_path,
-            mode="a" if file_exists else "w",
-            newline="",
-            encoding="utf-8",
-        ) as f:
-            writer = csv.DictWriter(f, fieldnames=["Date", "Region", "Type"])
+    def _write_with_rows(self, file_exists: bool, rows: List[PeculiarEejModel]) -> None:
+        """既存のCSVの内容にrowsを加えた一時ファイルを作成し、CSVと置き換える"""
+        tmp_path = f"{self.csv_path}.tmp"
+        try:
+            needs_newline = False
+            if file_exists:
+                shutil.copyfile(self.csv_path, tmp_path)
+                # 末尾が改行で終わっていない場合に行が連結されないようにする
+                with open(tmp_path, "rb") as f:
+                    if f.seek(0, os.SEEK_END) > 0:
+                        f.seek(-1, os.SEEK_END)
+                        needs_newline = f.read(1) not in (b"\n", b"\r")
+            with open(tmp_path, mode="a", newline="", encoding="utf-8") as f:
+                if needs_newline:
+                    f.write("\n")
+                writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+
+                if not file_exists:
+                    writer.writeheader()
 
-            if not file_exists:
-                writer.writeheader()
+                for row in rows:
+                    writer.writerow(
+                        {"Date": row.date, "Region": row.region.code, "Type": row.type}
+                    )
+            os.replace(tmp_path, self.csv_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
-            for row in new_data:
-                writer.writerow(
-                    {"Date": row.date, "Region": row.region.code, "Type": row.type}
+
+def _select_new_rows(
+    existing_map: Dict[tuple[date, Region], str], rows: List[PeculiarEejModel]
+) -> List[PeculiarEejModel]:
+    """rowsのうち既存データに無い行。existing_mapには新しい行を追加する
+
+    Raises:
+      ValueError: 既存データ(同じ追加内の行を含む)と同じ(日付, 地域)でタイプが異なる場合
+    """
+    new_data: List[PeculiarEejModel] = []
+
+    for row in rows:
+        key = (row.date, row.region)
+
+        if key in existing_map:
+            # 既存データとタイプが異なる場合はエラー
+            if existing_map[key] != row.type:
+                raise ValueError(
+                    f"Conflicting data found: "
+                    f"Date={row.date}, Region={row.region.code}, "
+                    f"Existing Type={existing_map[key]}, New Type={row.type}"
                 )
+            # 既存のデータと同じ
+            print("[Info] Duplicate skipping:", row.date, row.region.code, row.type)
+            continue
+
+        # 新しいデータ (同じ追加内での重複も検出する)
+        existing_map[key] = row.type
+        new_data.append(row)
+    return new_data
@@ -1,7 +1,103 @@
+import os
+from dataclasses import dataclass, field
+from typing import BinaryIO
+
 import numpy as np
 from src.constants.raw_data import EIGHT_COMPONENTS, FOUR_COMPONENTS, SEVEN_COMPONENTS
 from src.constants.time_relation import TimeUnit
 
+# headerはデリミタ(^Z\00)まで。この範囲内にデリミタが無い場合は不正なファイルとみなす
+HEADER_DELIMITER = b"\x1a"
+MAX_HEADER_BYTES = 8192
+
+# (観測点コード, "MIN" | "SEC") ごとのheader長(デリミタを含む)
+_header_length_cache: dict[tuple[str, str], int] = {}
+
+
+@dataclass(frozen=True)
+class MgdHeader:
+    """.mgd形式のheader情報
+
+    Attributes:
+      data_offset: 生データの開始位置(byte)
+      text: header部分の文字列
+      fields: headerのうち"key: value"形式の行
+    """
+
+    data_offset: int
+    text: str
+    fields: dict[str, str] = field(default_factory=dict)
+
+
+def _cache_key(path: str) -> tuple[str, str] | None:
+    """ファイル名(例: ANC_MIN_201404010000.mgd)から(観測点コード, 形式)を取得"""
+    parts = os.path.basename(path).split("_")
+    if len(parts) < 3:
+        return None
+    return parts[0], parts[1].upper()
+
+
+def _find_data_offset(path: str, block: bytes) -> int:
+    key = _cache_key(path)
+    cached_offset = _header_length_cache.get(key) if key else None
+    # 同じ観測点・形式のheader長は基本的に同じため、前回の位置までの範囲だけを探し、
+    # 最初のデリミタが前回と同じ位置にあることを確認する。
+    # 前回の位置の2byteだけの確認では、header長が短いファイルのデータ部分の ^Z\00 を
+    # デリミタと誤認するため、その手前にデリミタが無いことも確認する
+    if (
+        cached_offset is not None
+        and block.find(HEADER_DELIMITER, 0, cached_offset - 1) == cached_offset - 2
+    ):
+        return cached_offset
+
+    delimiter_idx = block.find(HEADER_DELIMITER, 0, MAX_HEADER_BYTES)
+    if delimiter_idx < 0:
+        raise ValueError(f"Header delimiter is not found in {path}.")
+    # デリミタの次の1byte(\00)までがheader
+    data_offset = delimiter_idx + 2
+    if key:
+        _header_length_cache[key] = data_offset
+    return data_offset
+
+
+def _parse_header(block: bytes, data_offset: int) -> MgdHeader:
+    text = block[: data_offset - 2].decode("latin-1")
+    fields: dict[str, str] = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition(":")
+        if sep and key.strip():
+            fields[key.strip()] = value.strip()
+    return MgdHeader(data_offset=data_offset, text=text, fields=fields)
+
+
+def _read_header(file: BinaryIO, path: str) -> MgdHeader:
+    block = file.read(MAX_HEADER_BYTES)
+    return _parse_header(block, _find_data_offset(path, block))
+
+
+def read_mgd_header(path) -> MgdHeader:
+    """
+    .mgd形式のheaderの読み込み
+
+    Arg:
+      path (str): .mgd形式の絶対パス
+    Return:
+      MgdHeader: header情報
+    Raises:
+      ValueError: headerのデリミタが見つからない場合
+    """
+    with open(path, "rb") as file:
+        return _read_header(file, path)
+
+
+def _read_data(path) -> np.ndarray:
+    """headerとデータを1回のreadで読み込み、データ部分をコピーせずに返す(読み取り専用)"""
+    with open(path, "rb") as file:
+        raw = file.read()
+    data_offset = _find_data_offset(path, raw[:MAX_HEADER_BYTES])
+    count = (len(raw) - data_offset) // np.dtype(np.float32).itemsize
+    return np.frombuffer(raw, np.float32, count=count, offset=data_offset)
+
 
 def read_raw_min_data(path):
     """
@@ -10,52 +106,43 @@ def read_raw_min_data(path):
     Arg:
       path (str): .mgd形式の絶対パス
     Return:
-      data (np.array): 1440分のデータ
+      data (np.array): 1440分のデータ(読み取り専用)
     Raises:
       ValueError: データに欠損がある場合
     """
-    with open(path, "rb") as file:
-        # header情報の除去
-        # デリミタ(^Z\00)までがheader
-        while True:
-            buf = file.read(1)
-            if buf == bytes(b"\x1a"):
-                buf = file.read(1)
-                break
-        # 生データの取得
-        data = np.fromfile(file, np.float32)
-        if len(data) == TimeUnit.ONE_DAY.min * SEVEN_COMPONENTS:
-            array = data.reshape((TimeUnit.ONE_DAY.min, SEVEN_COMPONENTS))
-        elif len(data) == TimeUnit.ONE_DAY.min * EIGHT_COMPONENTS:
-            array = data.reshape((TimeUnit.ONE_DAY.min, EIGHT_COMPONENTS))
-        else:
-            raise ValueError(f"There are missing data! Elements is {len(data)}.")
+    data = _read_data(path)
+    if len(data) == TimeUnit.ONE_DAY.min * SEVEN_COMPONENTS:
+        array = data.reshape((TimeUnit.ONE_DAY.min, SEVEN_COMPONENTS))
+    elif len(data) == TimeUnit.ONE_DAY.min * EIGHT_COMPONENTS:
+        array = data.reshape((TimeUnit.ONE_DAY.min, EIGHT_COMPONENTS))
+    else:
+        raise ValueError(f"There are missing data! Elements is {len(data)}.")
     return array
 
 
-def read_raw_sec_data(path):
+def read_raw_sec_data(path) -> np.memmap:
     """
     .mgdファイルの読み込み
 
     Arg:
       path (str): .mgdファイルの絶対パス
     Return:
-      array (np.array): [[h,d,z,f],[h,d,z,f],...]] (86400, 4) 1 day data per second
+      array (np.memmap): [[h,d,z,f],[h,d,z,f],...]] (86400, 4) 1 day data per second
+
+    Note:
+      データはメモリに読み込まず、データ開始位置からの読み取り専用のmemmapを返す。
+      必要な範囲のみがページ単位で読み込まれるため、長期間の処理でもメモリ使用量が増えない。
     Raises:
       ValueError: データに欠損がある場合
     """
-    with open(path, "rb") as file:
-        # header情報の除去
-        # デリミタ(^Z\00)までがheader
-        while True:
-            buf = file.read(1)
-            if buf == bytes(b"\x1a"):
-                buf = file.read(1)
-                break
-        # 生データの取得
-        data = np.fromfile(file, np.float32)
-        if len(data) == TimeUnit.ONE_DAY.sec * FOUR_COMPONENTS:
-            array = data.reshape((TimeUnit.ONE_DAY.sec, FOUR_COMPONENTS))
-            return array
-        else:
-            raise ValueError(f"There are missing data! Elements is {len(data)}.")
+    header = read_mgd_header(path)
+    data_bytes = os.path.getsize(path) - header.data_offset
+    shape = (TimeUnit.ONE_DAY.sec, FOUR_COMPONENTS)
+    itemsize = np.dtype(np.float32).itemsize
+    if data_bytes != shape[0] * shape[1] * itemsize:
+        raise ValueError(
+            f"There are missing data! Elements is {data_bytes // itemsize}."
+        )
+    return np.memmap(
+        path, dtype=np.float32, mode="r", offset=header.data_offset, shape=shape
+    )
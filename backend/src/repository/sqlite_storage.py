@@ -0,0 +1,273 @@
+import math
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+from src.constants.storage import SQLITE_PATH, STORAGE_BACKEND
+from src.utils.path import generate_parent_abs_path
+
+# 日付は"YYYY-MM-DD"、時刻は"YYYY-MM-DDTHH:MM:SS"の文字列で保存し、文字列の大小で範囲を絞り込む
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS eej_category (
+    date TEXT PRIMARY KEY,
+    min_edst REAL,
+    max_kp REAL,
+    category TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS eej_category_category_date
+    ON eej_category (category, date);
+
+CREATE TABLE IF NOT EXISTS peculiar_eej (
+    date TEXT NOT NULL,
+    region TEXT NOT NULL,
+    type TEXT NOT NULL,
+    PRIMARY KEY (region, date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS peculiar_eej_date ON peculiar_eej (date);
+CREATE INDEX IF NOT EXISTS peculiar_eej_type_date ON peculiar_eej (type, date);
+
+CREATE TABLE IF NOT EXISTS kp (
+    datetime_ut TEXT PRIMARY KEY,
+    kp REAL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS peak_euel (
+    date TEXT NOT NULL,
+    station_code TEXT NOT NULL,
+    peak_euel REAL,
+    PRIMARY KEY (station_code, date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS peak_euel_date ON peak_euel (date);
+"""
+
+# テーブル名 -> 列名 (インポート時の列の順)
+TABLE_COLUMNS: Dict[str, tuple[str, ...]] = {
+    "eej_category": ("date", "min_edst", "max_kp", "category"),
+    "peculiar_eej": ("date", "region", "type"),
+    "kp": ("datetime_ut", "kp"),
+    "peak_euel": ("date", "station_code", "peak_euel"),
+}
+
+
+def _where(conditions: Sequence[tuple[str, object]]) -> tuple[str, list]:
+    """値がNoneでない条件だけをANDで繋いだWHERE句とパラメータ
+
+    条件の組み合わせごとにSQLの文字列が決まるため、sqlite3の文のキャッシュで再利用される
+    """
+    clauses = [clause for clause, value in conditions if value is not None]
+    params = [value for _, value in conditions if value is not None]
+    if not clauses:
+        return "", params
+    return " WHERE " + " AND ".join(clauses), params
+
+
+def _date_text(value: date | None) -> str | None:
+    return None if value is None else value.isoformat()
+
+
+def to_real(value: float | None) -> float | None:
+    """NaNはNULLとして保存する"""
+    if value is None or math.isnan(value):
+        return None
+    return float(value)
+
+
+def from_real(value: float | None) -> float:
+    """NULLはNaNとして返す"""
+    return math.nan if value is None else value
+
+
+class SqliteStorage:
+    """分類・指数のテーブルをSQLiteに保存・取得するクラス
+
+    Note:
+      接続はスレッドごとに作成して使い回す。各テーブルの日付・地域・観測点には
+      インデックスがあり、期間の絞り込みはインデックスの範囲検索になる。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def connection(self, create: bool = False) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        if not create and not os.path.exists(self.path):
+            raise FileNotFoundError(
+                f"{self.path} not found. Run `inv import-sqlite` to create it."
+            )
+        # トランザクションはtransactionで明示的に開始する
+        conn = sqlite3.connect(self.path, isolation_level=None)
+        self._local.conn = conn
+        return conn
+
+    def create_schema(self) -> None:
+        """データベースとテーブル・インデックスを作成する (作成済みの場合は何もしない)"""
+        conn = self.connection(create=True)
+        # インポート中も読み込みができるようにする
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """書き込み用のトランザクション。例外が発生した場合はロールバックする"""
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def replace_rows(self, table: str, rows: Iterable[Sequence]) -> int:
+        """テーブルの内容をrowsに置き換える。読み込み中の接続には完了後に反映される
+
+        Return:
+          保存した行数
+        """
+        columns = TABLE_COLUMNS[table]
+        sql = (
+            f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+        self.create_schema()
+        with self.transaction() as conn:
+            conn.execute(f"DELETE FROM {table}")
+            count = conn.executemany(sql, rows).rowcount
+        self.connection().execute(f"ANALYZE {table}")
+        return count
+
+    # --- EEJの分類 ---
+
+    def select_eej_categories(
+        self, start: date | None, end: date | None, category: str | None
+    ) -> List[tuple[str, float, float, str]]:
+        """(日付, 最小のEDst, 最大のKP指数, 分類) の日付順のリスト。期間は両端を含む"""
+        where, params = _where(
+            [
+                ("category = ?", category),
+                ("date >= ?", _date_text(start)),
+                ("date <= ?", _date_text(end)),
+            ]
+        )
+        rows = self.connection().execute(
+            "SELECT date, min_edst, max_kp, category FROM eej_category"
+            f"{where} ORDER BY date",
+            params,
+        )
+        return [
+            (row_date, from_real(min_edst), from_real(max_kp), category)
+            for row_date, min_edst, max_kp, category in rows
+        ]
+
+    def count_eej_categories(
+        self, start: date | None, end: date | None
+    ) -> Dict[str, int]:
+        """分類 -> 期間(両端を含む)の日数"""
+        where, params = _where(
+            [("date >= ?", _date_text(start)), ("date <= ?", _date_text(end))]
+        )
+        rows = self.connection().execute(
+            f"SELECT category, COUNT(*) FROM eej_category{where} GROUP BY category",
+            params,
+        )
+        return dict(rows.fetchall())
+
+    # --- 特異型EEJ ---
+
+    def select_peculiar_eej(
+        self,
+        region: str | None,
+        type_: str | None,
+        start: date | None,
+        end: date | None,
+    ) -> List[tuple[str, str, str]]:
+        """(日付, 地域コード, タイプ) の日付順のリスト。期間は両端を含む"""
+        where, params = _where(
+            [
+                ("region = ?", region),
+                ("type = ?", type_),
+                ("date >= ?", _date_text(start)),
+                ("date <= ?", _date_text(end)),
+            ]
+        )
+        rows = self.connection().execute(
+            f"SELECT date, region, type FROM peculiar_eej{where} ORDER BY date, region",
+            params,
+        )
+        return rows.fetchall()
+
+    def insert_peculiar_eej(self, rows: Iterable[tuple[str, str, str]]) -> None:
+        """(日付, 地域コード, タイプ) を追加する。transactionの中で呼び出す"""
+        self.connection().executemany(
+            "INSERT INTO peculiar_eej (date, region, type) VALUES (?, ?, ?)", rows
+        )
+
+    # --- KP指数 ---
+
+    def select_kp(self) -> tuple[List[str], List[float | None]]:
+        """(時刻の文字列のリスト, KP指数のリスト) 時刻順"""
+        rows = self.connection().execute(
+            "SELECT datetime_ut, kp FROM kp ORDER BY datetime_ut"
+        )
+        times, values = [], []
+        for datetime_ut, kp in rows:
+            times.append(datetime_ut)
+            values.append(kp)
+        return times, values
+
+    # --- 昼間の最大のEUEL ---
+
+    def select_peak_euel(
+        self, station_code: str | None, start: date | None, end: date | None
+    ) -> List[tuple[str, str, float]]:
+        """(日付, 観測点コード, 最大のEUEL) の観測点・日付順のリスト。期間は両端を含む"""
+        where, params = _where(
+            [
+                ("station_code = ?", station_code),
+                ("date >= ?", _date_text(start)),
+                ("date <= ?", _date_text(end)),
+            ]
+        )
+        rows = self.connection().execute(
+            "SELECT date, station_code, peak_euel FROM peak_euel"
+            f"{where} ORDER BY station_code, date",
+            params,
+        )
+        return [
+            (row_date, code, from_real(peak_euel)) for row_date, code, peak_euel in rows
+        ]
+
+
+_sqlite_storage: SqliteStorage | None = None
+_sqlite_storage_lock = threading.Lock()
+
+
+def get_sqlite_storage() -> SqliteStorage | None:
+    """設定(MAGDAS_STORAGE_BACKEND)がsqliteの場合に共有するSqliteStorage。csvの場合はNone"""
+    global _sqlite_storage
+    if STORAGE_BACKEND == "csv":
+        return None
+    if STORAGE_BACKEND != "sqlite":
+        raise ValueError(
+            f"Invalid MAGDAS_STORAGE_BACKEND: {STORAGE_BACKEND} (csv or sqlite)"
+        )
+    if _sqlite_storage is None:
+        with _sqlite_storage_lock:
+            if _sqlite_storage is None:
+                path = SQLITE_PATH or generate_parent_abs_path(
+                    "/Storage/magdas.sqlite3"
+                )
+                _sqlite_storage = SqliteStorage(path)
+    return _sqlite_storage
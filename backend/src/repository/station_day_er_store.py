@@ -0,0 +1,121 @@
+import json
+import os
+import threading
+from datetime import date
+from itertools import groupby
+from typing import Iterable
+
+import numpy as np
+from src.constants.time_relation import TimeUnit
+from src.repository.gm_cache import days_in_year
+from src.repository.gm_data import find_min_files
+from src.utils.path import generate_parent_abs_path
+
+# 同じプロセス内での書き込みの競合を防ぐ
+_write_lock = threading.Lock()
+
+
+class StationDayErRepository:
+    """観測点・UT日ごとに、その日のH成分の中央値をベースラインとしたERを保存するリポジトリ
+
+    Storage/ee_daily/{CODE}/ に年ごとに以下を保存する。
+      {YYYY}_er.npy: (年の日数, 1440) のER (float32)。未計算の日はNaN
+      {YYYY}_baseline.npy: (年の日数,) のベースライン (float32)
+      {YYYY}_fingerprint.json: 日ごとの計算に使用した.mgdファイル名と更新時刻。未計算の日はnull
+
+    .mgdファイルが追加・更新された日はfingerprintが一致しなくなり、その日だけが再計算の対象になる。
+    """
+
+    def __init__(self, root: str | None = None):
+        self.root = root or generate_parent_abs_path("/Storage/ee_daily")
+
+    def _path(self, station_code: str, year: int, name: str) -> str:
+        return os.path.join(self.root, station_code, f"{year}_{name}")
+
+    def fingerprint(self, station_code: str, ut_date: date) -> str:
+        """その日の.mgdファイル名と更新時刻(ns)。ファイルが無い日は空文字"""
+        entries = sorted(
+            f"{os.path.basename(filename)}:{os.stat(filename).st_mtime_ns}"
+            for filename in find_min_files(station_code, ut_date)
+        )
+        return ";".join(entries)
+
+    def _load_fingerprints(self, station_code: str, year: int) -> list[str | None]:
+        path = self._path(station_code, year, "fingerprint.json")
+        if not os.path.exists(path):
+            return [None] * days_in_year(year)
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def get(
+        self, station_code: str, ut_dates: list[date]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return:
+          er: (日数, 1440) のER。保存されていない・古い日はNaN
+          fresh: (日数,) 保存済みかつ元データが更新されていない日はTrue
+        """
+        er = np.full((len(ut_dates), TimeUnit.ONE_DAY.min), np.nan, dtype=np.float32)
+        fresh = np.zeros(len(ut_dates), dtype=bool)
+        indexed = sorted(enumerate(ut_dates), key=lambda x: x[1])
+        for year, items in groupby(indexed, key=lambda x: x[1].year):
+            items = list(items)
+            fingerprints = self._load_fingerprints(station_code, year)
+            er_path = self._path(station_code, year, "er.npy")
+            if not os.path.exists(er_path):
+                continue
+            year_er = np.load(er_path, mmap_mode="r")
+            for i, ut_date in items:
+                doy = ut_date.timetuple().tm_yday - 1
+                saved = fingerprints[doy]
+                if saved is not None and saved == self.fingerprint(
+                    station_code, ut_date
+                ):
+                    er[i] = year_er[doy]
+                    fresh[i] = True
+        return er, fresh
+
+    def put(
+        self,
+        station_code: str,
+        entries: Iterable[tuple[date, np.ndarray, float, str]],
+    ) -> None:
+        """
+        Args:
+          entries: (UT日付, 1440分のER, ベースライン, 計算前に取得したfingerprint)
+        """
+        entries = sorted(entries, key=lambda x: x[0])
+        with _write_lock:
+            for year, year_entries in groupby(entries, key=lambda x: x[0].year):
+                self._put_year(station_code, year, list(year_entries))
+
+    def _put_year(self, station_code: str, year: int, entries: list) -> None:
+        os.makedirs(os.path.join(self.root, station_code), exist_ok=True)
+        n_days = days_in_year(year)
+        er_path = self._path(station_code, year, "er.npy")
+        baseline_path = self._path(station_code, year, "baseline.npy")
+        if not os.path.exists(er_path):
+            shape = (n_days, TimeUnit.ONE_DAY.min)
+            np.save(er_path, np.full(shape, np.nan, dtype=np.float32))
+            np.save(baseline_path, np.full(n_days, np.nan, dtype=np.float32))
+
+        fingerprints = self._load_fingerprints(station_code, year)
+        year_er = np.load(er_path, mmap_mode="r+")
+        year_baseline = np.load(baseline_path, mmap_mode="r+")
+        for ut_date, er, baseline, fingerprint in entries:
+            if len(er) != TimeUnit.ONE_DAY.min:
+                raise ValueError("er must have 1440 elements.")
+            doy = ut_date.timetuple().tm_yday - 1
+            year_er[doy] = er
+            year_baseline[doy] = baseline
+            fingerprints[doy] = fingerprint
+        year_er.flush()
+        year_baseline.flush()
+        del year_er, year_baseline
+
+        # ERを書き込んだ後にfingerprintを更新する
+        path = self._path(station_code, year, "fingerprint.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(fingerprints, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+from src.repository.csv_snapshot import (
+    load_csv_columns,
+    load_csv_columns_mmap,
+    mmap_snapshot_dir,
+    snapshot_path,
+)
+
+
+class TestCsvSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "sample.csv")
+        self.write_csv("2000-01-01,1.5,peculiar\n2000-01-02,,normal\n")
+        self.parse_count = 0
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_csv(self, rows: str):
+        with open(self.csv_path, "w", encoding="utf-8") as f:
+            f.write("Date,U_60N_m/s,category\n" + rows)
+
+    def parse(self, path: str) -> pd.DataFrame:
+        self.parse_count += 1
+        return pd.read_csv(path, parse_dates=["Date"])
+
+    def test_load_from_snapshot(self):
+        columns = load_csv_columns(self.csv_path, self.parse)
+        self.assertTrue(os.path.exists(snapshot_path(self.csv_path)))
+
+        loaded = load_csv_columns(self.csv_path, self.parse)
+        self.assertEqual(self.parse_count, 1)
+        self.assertEqual(list(loaded), ["Date", "U_60N_m/s", "category"])
+        for name in columns:
+            np.testing.assert_array_equal(loaded[name], columns[name])
+        self.assertEqual(loaded["Date"].dtype, np.dtype("datetime64[ns]"))
+        self.assertEqual(loaded["category"].tolist(), ["peculiar", "normal"])
+        self.assertTrue(np.isnan(loaded["U_60N_m/s"][1]))
+
+    def test_rebuild_when_csv_is_updated(self):
+        load_csv_columns(self.csv_path, self.parse)
+        self.write_csv("2000-01-03,2.0,missing\n")
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        loaded = load_csv_columns(self.csv_path, self.parse)
+        self.assertEqual(self.parse_count, 2)
+        self.assertEqual(loaded["category"].tolist(), ["missing"])
+
+    def test_csv_not_found(self):
+        with self.assertRaises(FileNotFoundError):
+            load_csv_columns(os.path.join(self.tmp.name, "none.csv"), self.parse)
+        with self.assertRaises(FileNotFoundError):
+            load_csv_columns_mmap(os.path.join(self.tmp.name, "none.csv"), self.parse)
+
+    def test_load_mmap_snapshot(self):
+        columns = load_csv_columns(self.csv_path, self.parse)
+        for _ in range(2):
+            loaded = load_csv_columns_mmap(self.csv_path, self.parse)
+            self.assertEqual(list(loaded), ["Date", "U_60N_m/s", "category"])
+            for name in columns:
+                self.assertIsInstance(loaded[name], np.memmap)
+                self.assertFalse(loaded[name].flags.writeable)
+                np.testing.assert_array_equal(loaded[name], columns[name])
+        # npzのスナップショットの作成と、memmap用のスナップショットの作成の2回
+        self.assertEqual(self.parse_count, 2)
+        self.assertTrue(os.path.isdir(mmap_snapshot_dir(self.csv_path)))
+
+    def test_rebuild_mmap_snapshot_when_csv_is_updated(self):
+        load_csv_columns_mmap(self.csv_path, self.parse)
+        self.write_csv("2000-01-03,2.0,missing\n")
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        loaded = load_csv_columns_mmap(self.csv_path, self.parse)
+        self.assertEqual(self.parse_count, 2)
+        self.assertEqual(loaded["category"].tolist(), ["missing"])
+
+
+if __name__ == "__main__":
+    unittest.main()
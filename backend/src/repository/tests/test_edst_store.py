@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+from unittest import mock
+
+import numpy as np
+from src.domain.station_params import Period
+from src.repository.edst_store import DailyEdst, EdstStoreRepository
+from src.service.ee_index.calc_edst import Edst
+
+UT_DATE = date(2014, 4, 1)
+
+
+class TestEdstStoreRepository(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.mgd_path = os.path.join(self.tmp.name, "ANC_MIN_201404010000.mgd")
+        with open(self.mgd_path, "wb") as f:
+            f.write(b"dummy")
+        # 全観測点の.mgdファイルの代わりに一時ディレクトリのファイルを参照する
+        patcher = mock.patch(
+            "src.repository.edst_store.find_min_files",
+            side_effect=lambda code, ut_date: [self.mgd_path] if code == "ANC" else [],
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.store = EdstStoreRepository(root=os.path.join(self.tmp.name, "edst"))
+
+    def put(self, edst: np.ndarray) -> None:
+        self.store.put(UT_DATE, edst, self.store.fingerprint(UT_DATE))
+
+    def test_put_and_get(self):
+        edst = np.linspace(-50.0, 10.0, 1440)
+        edst[0] = np.nan
+        self.put(edst)
+        daily_edst = self.store.get(UT_DATE)
+        # 計算したEDst(float64)と同じ値を返す
+        self.assertEqual(daily_edst.edst.dtype, np.float64)
+        np.testing.assert_array_equal(daily_edst.edst, edst)
+        self.assertFalse(daily_edst.edst.flags.writeable)
+        self.assertEqual(daily_edst.min_edst, np.nanmin(edst))
+        self.assertFalse(daily_edst.complete)
+        self.assertTrue(np.isnan(daily_edst.get_min_edst(ignore_nan=False)))
+
+    def test_invalidated_when_mgd_file_updated(self):
+        self.put(np.zeros(1440))
+        self.assertIsNotNone(self.store.get(UT_DATE))
+        stat = os.stat(self.mgd_path)
+        os.utime(self.mgd_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertIsNone(self.store.get(UT_DATE))
+
+    def test_float32_file_is_recalculated(self):
+        """float32で保存した古い形式のファイルは使用しない"""
+        self.put(np.zeros(1440))
+        path = self.store._path(UT_DATE)
+        with np.load(path) as npz:
+            saved = dict(npz)
+        np.savez(path, **{**saved, "edst": saved["edst"].astype(np.float32)})
+        self.assertIsNone(self.store.get(UT_DATE))
+
+    def test_rejects_partial_day(self):
+        with self.assertRaises(ValueError):
+            self.put(np.zeros(1439))
+
+
+class TestEdstUsesStore(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("src.service.ee_index.calc_edst.EdstStoreRepository")
+        self.store_class = patcher.start()
+        self.addCleanup(patcher.stop)
+        edst = np.full(1440, -20.0)
+        edst[10] = -35.0
+        self.store_class.return_value.get.return_value = DailyEdst(
+            ut_date=UT_DATE, edst=edst, min_edst=-35.0, complete=True
+        )
+
+    def test_min_edst_of_stored_day_is_not_recalculated(self):
+        period = Period(datetime(2014, 4, 1, 0, 0), datetime(2014, 4, 1, 23, 59))
+        edst = Edst(period)
+        with mock.patch.object(Edst, "_calc_edst", side_effect=AssertionError):
+            self.assertEqual(edst.get_min_edst(), -35.0)
+            self.assertEqual(edst.get_min_edst(ignore_nan=False), -35.0)
+            self.assertEqual(edst.calc_edst()[10], -35.0)
+        self.store_class.return_value.get.assert_called_once_with(UT_DATE)
+
+    def test_partial_day_bypasses_store(self):
+        calculated = np.full(720, -5.0)
+        period = Period(datetime(2014, 4, 1, 0, 0), datetime(2014, 4, 1, 11, 59))
+        edst = Edst(period)
+        with mock.patch.object(Edst, "_calc_edst", return_value=calculated):
+            self.assertEqual(edst.get_min_edst(), -5.0)
+            np.testing.assert_array_equal(edst.calc_edst(), calculated)
+        self.store_class.return_value.get.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+import numpy as np
+from src.domain.station_params import Period
+from src.repository.ee_from_kato import KatoEeRepository
+
+
+class TestKatoEeRepository(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        csv_path = os.path.join(self.tmp.name, "TTB_EUEL.csv")
+        # 日時順でない行と、使用しない列・空白の欠損値を含む
+        with open(csv_path, "w", encoding="utf-8") as f:
+            f.write(
+                "DATETIME,ER1m,EUEL1m,EDst1m\n"
+                "2016-01-01 00:02,0,3.0,-3.0\n"
+                "2016-01-01 00:00,0,1.0,-1.0\n"
+                "2016-01-01 00:01,0, ,-2.0\n"
+                "2016-01-01 00:03,0,4.0,-4.0\n"
+            )
+        self.repository = KatoEeRepository("TTB")
+        self.repository.csv_path = csv_path
+
+    def select(self, start: datetime, end: datetime):
+        return [
+            (row.dt, row.euel_data, row.edst_data)
+            for row in self.repository.select_by_range(Period(start, end))
+        ]
+
+    def test_select_by_range(self):
+        rows = self.select(datetime(2016, 1, 1, 0, 1), datetime(2016, 1, 1, 0, 2))
+        self.assertEqual(
+            [row[0] for row in rows],
+            [datetime(2016, 1, 1, 0, 1), datetime(2016, 1, 1, 0, 2)],
+        )
+        self.assertTrue(np.isnan(rows[0][1]))
+        self.assertEqual(rows[1][1:], (3.0, -3.0))
+        # 2回目以降はmemmapのスナップショットから読み込む
+        self.assertEqual(
+            self.select(datetime(2016, 1, 1, 0, 1), datetime(2016, 1, 1, 0, 2))[1],
+            rows[1],
+        )
+
+    def test_select_outside_data(self):
+        self.assertEqual(
+            self.select(datetime(2015, 1, 1), datetime(2015, 12, 31, 23, 59)), []
+        )
+        rows = self.select(datetime(2015, 12, 31), datetime(2017, 1, 1))
+        self.assertEqual(len(rows), 4)
+
+    def test_unsupported_station(self):
+        with self.assertRaises(ValueError):
+            KatoEeRepository("ANC")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+
+from src.domain.station_params import Period
+from src.model.eej_category import EejEventCategory
+from src.repository.eej_event_category import EejCategoryRepository
+
+CSV_HEADER = "date,min_edst,max_kp,category\n"
+CSV_ROWS = [
+    "2000-01-01,nan,5.33,missing\n",
+    "2000-01-02,-12.5,2.0,quiet\n",
+    "2000-01-03,-40.25,4.67,disturbance\n",
+    "2000-01-04,-3.0,1.33,quiet\n",
+    "2000-01-05,-8.0,2.33,quiet\n",
+]
+
+
+class TestEejCategoryRepository(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "eej_category.csv")
+        self.write_csv(CSV_ROWS)
+        self.repository = EejCategoryRepository(self.csv_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_csv(self, rows):
+        with open(self.csv_path, "w", encoding="utf-8") as f:
+            f.write(CSV_HEADER + "".join(rows))
+
+    def test_select(self):
+        period = Period(datetime(2000, 1, 2), datetime(2000, 1, 4, 23, 59))
+        quiet = self.repository.select(period, "quiet")
+        self.assertEqual(
+            [row.date for row in quiet], [date(2000, 1, 2), date(2000, 1, 4)]
+        )
+        self.assertEqual(quiet[0].min_edst, -12.5)
+        self.assertEqual(quiet[0].category, EejEventCategory.QUIET)
+        self.assertEqual(len(self.repository.select(period, None)), 3)
+        self.assertEqual(self.repository.select(period, "unknown"), [])
+
+    def test_count(self):
+        period = Period(datetime(2000, 1, 1), datetime(2000, 1, 5))
+        self.assertEqual(self.repository.count(period, "quiet"), 3)
+        self.assertEqual(self.repository.count(period), 5)
+        self.assertEqual(
+            self.repository.count_by_category(period),
+            {
+                EejEventCategory.QUIET: 3,
+                EejEventCategory.DISTURBANCE: 1,
+                EejEventCategory.MISSING: 1,
+            },
+        )
+
+    def test_reload_when_file_changes(self):
+        period = Period(datetime(2000, 1, 1), datetime(2000, 1, 31))
+        self.assertEqual(self.repository.count(period, "quiet"), 3)
+        self.write_csv(CSV_ROWS + ["2000-01-06,-1.0,1.0,quiet\n"])
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(self.repository.count(period, "quiet"), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import date, datetime
+from unittest.mock import patch
+
+import numpy as np
+from src.domain.magdas_station import EeIndexStation
+from src.domain.station_params import Period, StationParam
+from src.repository.gm_cache import GMYearCacheRepository
+from src.repository.gm_data import (
+    GMDataLoader,
+    GMPeriodRepository,
+    build_gm_year_cache,
+)
+
+STATION = EeIndexStation.ANC
+
+
+class TestGMYearCacheRepository(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.raw_root = os.path.join(self.tmp.name, "magdas")
+        self.cache = GMYearCacheRepository(
+            root=os.path.join(self.tmp.name, "gm_cache"), raw_root=self.raw_root
+        )
+
+    def write_mgd(self, ut_date: date) -> str:
+        """日付ごとに異なる値の.mgdファイル(1440分 × 7成分)を作成する"""
+        year_dir = os.path.join(self.raw_root, STATION.code, "Min", str(ut_date.year))
+        os.makedirs(year_dir, exist_ok=True)
+        path = os.path.join(
+            year_dir, f"{STATION.code}_MIN_{ut_date.strftime('%Y%m%d')}0000.mgd"
+        )
+        data = (
+            np.arange(1440 * 7, dtype=np.float32).reshape(1440, 7)
+            + ut_date.toordinal() % 1000
+        )
+        # 範囲外の値はサニタイズでNaNになる
+        data[5, 0] = -1
+        with open(path, "wb") as f:
+            f.write(b"Station: ANC\r\n\x1a\x00" + data.tobytes())
+        return path
+
+    def test_cache_matches_file_values(self):
+        # 2014-01-02はファイルが無い
+        for ut_date in (date(2013, 12, 31), date(2014, 1, 1), date(2014, 1, 3)):
+            self.write_mgd(ut_date)
+        build_gm_year_cache(STATION.code, 2013, self.cache)
+        build_gm_year_cache(STATION.code, 2014, self.cache)
+        self.assertTrue(self.cache.is_fresh(STATION.code, 2013))
+        self.assertTrue(self.cache.is_fresh(STATION.code, 2014))
+
+        params = StationParam(
+            STATION, Period(datetime(2013, 12, 31, 12, 0), datetime(2014, 1, 3, 6, 30))
+        )
+        empty_cache = GMYearCacheRepository(
+            root=os.path.join(self.tmp.name, "empty"), raw_root=self.raw_root
+        )
+        from_files = GMPeriodRepository(params, empty_cache).get_many()
+
+        load_count = sum(GMDataLoader.load_counter.values())
+        from_cache = GMPeriodRepository(params, self.cache).get_many()
+        # キャッシュから取得した場合は.mgdファイルを読まない
+        self.assertEqual(sum(GMDataLoader.load_counter.values()), load_count)
+
+        for component in ("h", "d", "z", "f"):
+            self.assertEqual(from_cache[component].dtype, np.float32)
+            np.testing.assert_array_equal(from_cache[component], from_files[component])
+        h = from_cache["h"]
+        # 2014-01-02(ファイル無し)は全てNaN、2014-01-01 00:05はサニタイズでNaN
+        self.assertTrue(np.isnan(h[720 + 1440 : 720 + 2 * 1440]).all())
+        self.assertTrue(np.isnan(h[720 + 5]))
+        self.assertFalse(np.isnan(h[720 + 6]))
+
+    def test_is_fresh_after_source_changes(self):
+        # 毎回全ての.mgdファイルの更新時刻を確認する
+        self.cache.recheck_sec = 0
+        path = self.write_mgd(date(2014, 1, 1))
+        build_gm_year_cache(STATION.code, 2014, self.cache)
+        self.assertTrue(self.cache.is_fresh(STATION.code, 2014))
+
+        # 更新時刻の変更
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertFalse(self.cache.is_fresh(STATION.code, 2014))
+
+        # ファイルの追加
+        build_gm_year_cache(STATION.code, 2014, self.cache)
+        self.assertTrue(self.cache.is_fresh(STATION.code, 2014))
+        added = self.write_mgd(date(2014, 2, 1))
+        self.assertFalse(self.cache.is_fresh(STATION.code, 2014))
+
+        # ファイルの削除
+        build_gm_year_cache(STATION.code, 2014, self.cache)
+        os.remove(added)
+        self.assertFalse(self.cache.is_fresh(STATION.code, 2014))
+        # 他の年のキャッシュは作成されていない
+        self.assertFalse(self.cache.is_fresh(STATION.code, 2013))
+
+    def test_is_fresh_rechecks_files_after_interval(self):
+        path = self.write_mgd(date(2014, 1, 1))
+        build_gm_year_cache(STATION.code, 2014, self.cache)
+        with patch.object(
+            self.cache, "fingerprint", wraps=self.cache.fingerprint
+        ) as fingerprint:
+            for _ in range(3):
+                self.assertTrue(self.cache.is_fresh(STATION.code, 2014))
+            # 間隔内はファイルごとの更新時刻を確認しない
+            self.assertEqual(fingerprint.call_count, 1)
+
+            # ファイルの追加はディレクトリの更新時刻からすぐに反映される
+            added = self.write_mgd(date(2014, 2, 1))
+            self.assertFalse(self.cache.is_fresh(STATION.code, 2014))
+            os.remove(added)
+            self.assertTrue(self.cache.is_fresh(STATION.code, 2014))
+
+            # 同じファイルの更新時刻の変更は間隔が過ぎた後に反映される
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            self.assertTrue(self.cache.is_fresh(STATION.code, 2014))
+            recheck_at = time.monotonic() + self.cache.recheck_sec
+            with patch(
+                "src.repository.gm_cache.time.monotonic", return_value=recheck_at
+            ):
+                self.assertFalse(self.cache.is_fresh(STATION.code, 2014))
+
+            # キャッシュを作成し直した場合はfingerprintファイルからすぐに反映される
+            build_gm_year_cache(STATION.code, 2014, self.cache)
+            self.assertTrue(self.cache.is_fresh(STATION.code, 2014))
+
+
+if __name__ == "__main__":
+    unittest.main()
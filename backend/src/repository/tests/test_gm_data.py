@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+
+import numpy as np
+from src.domain.magdas_station import EeIndexStation
+from src.domain.station_params import Period, StationParam
+from src.repository.gm_cache import GM_DTYPE, GMYearCacheRepository
+from src.repository.gm_data import GMDataLoader, GMPeriodRepository
+
+STATION = EeIndexStation.ANC
+
+
+class TestGMPeriodRepository(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.raw_root = os.path.join(self.tmp.name, "magdas")
+        # キャッシュの無いディレクトリを指定し、.mgdファイルから読み込む
+        self.cache = GMYearCacheRepository(
+            root=os.path.join(self.tmp.name, "gm_cache"), raw_root=self.raw_root
+        )
+        # 2014-04-02はファイルが無い
+        for ut_date in (date(2014, 4, 1), date(2014, 4, 3)):
+            self.write_mgd(ut_date)
+
+    def write_mgd(self, ut_date: date) -> None:
+        year_dir = os.path.join(self.raw_root, STATION.code, "Min", str(ut_date.year))
+        os.makedirs(year_dir, exist_ok=True)
+        path = os.path.join(
+            year_dir, f"{STATION.code}_MIN_{ut_date.strftime('%Y%m%d')}0000.mgd"
+        )
+        data = np.arange(1440 * 7, dtype=np.float32).reshape(1440, 7) + ut_date.day
+        with open(path, "wb") as f:
+            f.write(b"Station: ANC\r\n\x1a\x00" + data.tobytes())
+
+    def repository(self, start: datetime, end: datetime) -> GMPeriodRepository:
+        return GMPeriodRepository(StationParam(STATION, Period(start, end)), self.cache)
+
+    def test_get_many_equals_separate_get(self):
+        start, end = datetime(2014, 4, 1, 22, 30), datetime(2014, 4, 3, 1, 15)
+        total_minutes = int((end - start).total_seconds()) // 60
+        values = self.repository(start, end).get_many(("h", "d", "z", "f"))
+
+        for component in ("h", "d", "z", "f"):
+            single = self.repository(start, end).get(component)
+            self.assertEqual(len(values[component]), total_minutes + 1)
+            self.assertEqual(values[component].dtype, GM_DTYPE)
+            self.assertEqual(single.dtype, GM_DTYPE)
+            np.testing.assert_array_equal(values[component], single)
+
+        h = values["h"]
+        # 2014-04-01 22:30 から
+        self.assertEqual(h[0], 1 + (22 * 60 + 30) * 7)
+        # ファイルの無い2014-04-02はNaNで埋まる
+        self.assertTrue(np.isnan(h[90 : 90 + 1440]).all())
+        # 2014-04-03 00:00 ~ 01:15
+        np.testing.assert_array_equal(
+            h[90 + 1440 :], 3 + np.arange(76, dtype=np.float32) * 7
+        )
+
+    def test_loader_dtype(self):
+        for ut_date in (date(2014, 4, 1), date(2014, 4, 2)):
+            loader = GMDataLoader(STATION.code, ut_date, self.raw_root)
+            for component in ("h", "d", "z", "f"):
+                self.assertEqual(getattr(loader, component).dtype, GM_DTYPE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import date, datetime
+
+import numpy as np
+from src.domain.station_params import Period
+from src.repository.peak_euel import PeakEuelRepository, PeakEuelTable
+
+
+class TestPeakEuelRepository(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        # 列名の前に空白を含むヘッダー、観測点・日付の順でないファイルを含む
+        self.write_csv(
+            "dip.csv",
+            "date,station_code,peak_euel\n"
+            "2000-01-02,ANC,12.5\n"
+            "2000-01-01,ANC,nan\n"
+            "2000-01-01,HUA,30.25\n",
+        )
+        self.write_csv(
+            "offdip.csv",
+            "date, station_code, peak_euel\n"
+            "2000-01-01,EUS,-4.0\n"
+            "2000-01-03,EUS,8.0\n",
+        )
+        self.repository = PeakEuelRepository(self.tmp.name)
+
+    def write_csv(self, name: str, text: str) -> None:
+        with open(os.path.join(self.tmp.name, name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_table_is_sorted_by_station_and_date(self):
+        table = self.repository._table()
+        self.assertIsInstance(table, PeakEuelTable)
+        self.assertEqual(
+            table.station_codes.tolist(), ["ANC", "ANC", "EUS", "EUS", "HUA"]
+        )
+        self.assertEqual(
+            table.dates.tolist(),
+            [
+                date(2000, 1, 1),
+                date(2000, 1, 2),
+                date(2000, 1, 1),
+                date(2000, 1, 3),
+                date(2000, 1, 1),
+            ],
+        )
+        np.testing.assert_array_equal(table.values, [np.nan, 12.5, -4.0, 8.0, 30.25])
+        self.assertEqual(table.station_slices["EUS"], slice(2, 4))
+        self.assertFalse(table.values.flags.writeable)
+
+    def test_select(self):
+        period = Period(datetime(2000, 1, 2), datetime(2000, 1, 3, 23, 59))
+        rows = self.repository.select(period)
+        self.assertEqual(
+            [(row.station_code, row.date, row.peak_euel) for row in rows],
+            [("ANC", date(2000, 1, 2), 12.5), ("EUS", date(2000, 1, 3), 8.0)],
+        )
+        rows = self.repository.select(station_code="EUS")
+        self.assertEqual([row.peak_euel for row in rows], [-4.0, 8.0])
+        self.assertEqual(self.repository.select(station_code="XXX"), [])
+
+    def test_peak_euel_of_days(self):
+        days = [date(2000, 1, 3), date(2000, 1, 1), date(1999, 12, 31)]
+        np.testing.assert_array_equal(
+            self.repository.peak_euel_of_days("EUS", days), [8.0, -4.0, np.nan]
+        )
+        np.testing.assert_array_equal(
+            self.repository.peak_euel_of_days("XXX", days), [np.nan] * 3
+        )
+
+    def test_reload_after_csv_added(self):
+        table = self.repository._table()
+        self.assertIs(self.repository._table(), table)
+        # 更新時刻の分解能が粗い環境でも別のファイルとして検出される
+        time.sleep(0.01)
+        self.write_csv("extra.csv", "date,station_code,peak_euel\n2000-01-05,BCL,1.5\n")
+        rows = self.repository.select(station_code="BCL")
+        self.assertEqual(
+            [(row.date, row.peak_euel) for row in rows], [(date(2000, 1, 5), 1.5)]
+        )
+
+    def test_no_csv(self):
+        with self.assertRaises(FileNotFoundError):
+            PeakEuelRepository(os.path.join(self.tmp.name, "missing")).select()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+
+from src.domain.region import Region
+from src.model.peculiar_eej import PeculiarEejModel
+from src.repository.peculiar_eej import PeculiarEejRepository
+
+SA = Region.SOUTH_AMERICA
+SEA = Region.SOUTHEAST_ASIA
+
+
+class TestPeculiarEejRepository(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "peculiar_eej.csv")
+        self.repository = PeculiarEejRepository(self.csv_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def insert_initial_rows(self):
+        self.repository.insert(
+            [
+                PeculiarEejModel(date=date(2010, 4, 10), region=SA, type="突発型"),
+                PeculiarEejModel(date=date(2009, 1, 20), region=SA, type="未発達型"),
+                PeculiarEejModel(date=date(2009, 1, 20), region=SEA, type="突発型"),
+            ]
+        )
+
+    def test_insert_and_select(self):
+        self.insert_initial_rows()
+        self.assertEqual(
+            self.repository.select_dates(SA), [date(2009, 1, 20), date(2010, 4, 10)]
+        )
+        sudden = self.repository.select(type_="突発型")
+        self.assertEqual(
+            [(row.date, row.region) for row in sudden],
+            [(date(2009, 1, 20), SEA), (date(2010, 4, 10), SA)],
+        )
+        in_period = self.repository.select(
+            region=SA, start_date=datetime(2009, 1, 20), end_date=datetime(2009, 12, 31)
+        )
+        self.assertEqual([row.type for row in in_period], ["未発達型"])
+
+    def test_insert_skips_duplicates_and_rejects_conflicts(self):
+        self.insert_initial_rows()
+        self.repository.insert(
+            [PeculiarEejModel(date=date(2010, 4, 10), region=SA, type="突発型")]
+        )
+        self.assertEqual(len(self.repository.select()), 3)
+
+        conflicting = [
+            PeculiarEejModel(date=date(2011, 1, 1), region=SA, type="突発型"),
+            PeculiarEejModel(date=date(2009, 1, 20), region=SA, type="突発型"),
+        ]
+        with self.assertRaises(ValueError):
+            self.repository.insert(conflicting)
+        # 競合があった場合は何も書き込まない
+        self.assertEqual(len(self.repository.select()), 3)
+
+    def test_insert_keeps_file_consistent_with_cache(self):
+        self.insert_initial_rows()
+        self.repository.insert(
+            [PeculiarEejModel(date=date(2012, 5, 5), region=SEA, type="未発達型")]
+        )
+        with open(self.csv_path, encoding="utf-8") as f:
+            self.assertEqual(len(f.read().splitlines()), 5)
+        self.assertFalse(os.path.exists(f"{self.csv_path}.tmp"))
+        # 別のインスタンスからも同じ内容を取得できる
+        self.assertEqual(
+            PeculiarEejRepository(self.csv_path).select_dates(SEA),
+            [date(2009, 1, 20), date(2012, 5, 5)],
+        )
+
+    def test_reload_when_file_changes(self):
+        self.insert_initial_rows()
+        with open(self.csv_path, "a", encoding="utf-8") as f:
+            f.write("2013-03-03,southeast_asia,突発型\n")
+        self.assertEqual(len(self.repository.select(region=SEA)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
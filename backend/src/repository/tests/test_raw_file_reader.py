@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from src.repository import raw_file_reader
+from src.repository.raw_file_reader import read_mgd_header, read_raw_min_data
+
+
+class TestRawFileReader(unittest.TestCase):
+    def write_mgd(self, filename: str, header: bytes, data: np.ndarray) -> str:
+        path = os.path.join(self.tmp_dir.name, filename)
+        with open(path, "wb") as f:
+            f.write(header + b"\x1a\x00" + data.astype(np.float32).tobytes())
+        return path
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def test_read_min_data(self):
+        data = np.arange(1440 * 7, dtype=np.float32).reshape(1440, 7)
+        path = self.write_mgd("TST_MIN_201404010000.mgd", b"Station: TST\r\n", data)
+        np.testing.assert_array_equal(read_raw_min_data(path), data)
+
+    def test_header_length_changes_for_same_station(self):
+        """header長がキャッシュと異なるファイルも正しく読み込めること"""
+        data = np.ones((1440, 8), dtype=np.float32)
+        short = self.write_mgd("TST_MIN_201404010000.mgd", b"A: 1", data)
+        long = self.write_mgd("TST_MIN_201404020000.mgd", b"A: 1\r\nB: 2" * 10, data)
+        np.testing.assert_array_equal(read_raw_min_data(short), data)
+        np.testing.assert_array_equal(read_raw_min_data(long), data)
+        np.testing.assert_array_equal(read_raw_min_data(short), data)
+
+    def test_stale_cached_header_length(self):
+        """キャッシュしたheader長が古い場合は先頭から探し直すこと"""
+        data = np.arange(1440 * 7, dtype=np.float32).reshape(1440, 7)
+        header = b"Station: TST\r\n"
+        path = self.write_mgd("TST_MIN_201404030000.mgd", header, data)
+        for stale_offset in (len(header) - 4, len(header) + 30):
+            raw_file_reader._header_length_cache[("TST", "MIN")] = stale_offset
+            np.testing.assert_array_equal(read_raw_min_data(path), data)
+            self.assertEqual(
+                raw_file_reader._header_length_cache[("TST", "MIN")], len(header) + 2
+            )
+
+    def test_shorter_header_with_delimiter_bytes_in_data(self):
+        """header長が短いファイルのデータの、前回のheader長の位置に ^Z\00 がある場合"""
+        long_header = b"Station: TST\r\nDate: 2014-04-01\r\n"
+        data = np.arange(1440 * 7, dtype=np.float32).reshape(1440, 7)
+        path = self.write_mgd("TST_MIN_201404010000.mgd", long_header, data)
+        np.testing.assert_array_equal(read_raw_min_data(path), data)
+        cached_offset = len(long_header) + 2
+
+        short_header = b"Station: TST\r\n"
+        short_offset = len(short_header) + 2
+        # 前回のheader長の位置(cached_offset - 2)のデータのbyteを ^Z\00 にする
+        pos = cached_offset - 2 - short_offset
+        self.assertEqual(pos % 4, 0)
+        short_data = data.copy()
+        short_data.reshape(-1)[pos // 4] = np.frombuffer(
+            b"\x1a\x00\x00\x00", np.float32
+        )[0]
+        path = self.write_mgd("TST_MIN_201404020000.mgd", short_header, short_data)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read()[cached_offset - 2 : cached_offset], b"\x1a\x00")
+        np.testing.assert_array_equal(read_raw_min_data(path), short_data)
+        self.assertEqual(
+            raw_file_reader._header_length_cache[("TST", "MIN")], short_offset
+        )
+
+    def test_read_header(self):
+        data = np.zeros((1440, 7), dtype=np.float32)
+        header = b"MAGDAS\r\nStation: TST\r\nDate: 2014-04-01\r\n"
+        path = self.write_mgd("TST_MIN_201404010000.mgd", header, data)
+        mgd_header = read_mgd_header(path)
+        self.assertEqual(mgd_header.data_offset, len(header) + 2)
+        self.assertEqual(mgd_header.fields["Station"], "TST")
+        self.assertEqual(mgd_header.fields["Date"], "2014-04-01")
+
+    def test_missing_delimiter(self):
+        path = os.path.join(self.tmp_dir.name, "TST_MIN_201404010000.mgd")
+        with open(path, "wb") as f:
+            f.write(b"no delimiter")
+        with self.assertRaises(ValueError):
+            read_raw_min_data(path)
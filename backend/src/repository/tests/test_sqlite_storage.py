@@ -0,0 +1,108 @@
+import math
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+
+from src.domain.region import Region
+from src.domain.station_params import Period
+from src.model.eej_category import EejEventCategory
+from src.model.peculiar_eej import PeculiarEejModel
+from src.repository.eej_event_category import EejCategoryRepository
+from src.repository.peak_euel import PeakEuelRepository
+from src.repository.peculiar_eej import PeculiarEejRepository
+from src.repository.sqlite_storage import SqliteStorage
+
+SA = Region.SOUTH_AMERICA
+
+
+class TestSqliteStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.storage = SqliteStorage(os.path.join(self.tmp.name, "magdas.sqlite3"))
+        self.storage.replace_rows(
+            "eej_category",
+            [
+                ("2000-01-01", None, 5.33, "missing"),
+                ("2000-01-02", -12.5, 2.0, "quiet"),
+                ("2000-01-03", -40.25, 4.67, "disturbance"),
+                ("2000-01-04", -3.0, 1.33, "quiet"),
+            ],
+        )
+        self.storage.replace_rows(
+            "peculiar_eej",
+            [("2010-04-10", "south_america", "突発型")],
+        )
+        self.storage.replace_rows(
+            "peak_euel",
+            [
+                ("2000-01-02", "ANC", 30.5),
+                ("2000-01-01", "ANC", None),
+                ("2000-01-01", "EUS", 10.0),
+            ],
+        )
+
+    def tearDown(self):
+        self.storage.close()
+        self.tmp.cleanup()
+
+    def test_eej_category(self):
+        repository = EejCategoryRepository(storage=self.storage)
+        period = Period(datetime(2000, 1, 1), datetime(2000, 1, 3, 23, 59))
+        rows = repository.select(period, None)
+        self.assertEqual([row.date for row in rows][0], date(2000, 1, 1))
+        self.assertTrue(math.isnan(rows[0].min_edst))
+        self.assertEqual(repository.select_dates(period, "quiet"), [date(2000, 1, 2)])
+        self.assertEqual(repository.count(period), 3)
+        self.assertEqual(
+            repository.count_by_category(
+                Period(datetime(2000, 1, 1), datetime(2000, 1, 4))
+            ),
+            {
+                EejEventCategory.QUIET: 2,
+                EejEventCategory.DISTURBANCE: 1,
+                EejEventCategory.MISSING: 1,
+            },
+        )
+
+    def test_peculiar_eej_insert(self):
+        repository = PeculiarEejRepository(storage=self.storage)
+        repository.insert(
+            [
+                PeculiarEejModel(date=date(2010, 4, 10), region=SA, type="突発型"),
+                PeculiarEejModel(date=date(2009, 1, 20), region=SA, type="未発達型"),
+            ]
+        )
+        self.assertEqual(
+            repository.select_dates(SA), [date(2009, 1, 20), date(2010, 4, 10)]
+        )
+        with self.assertRaises(ValueError):
+            repository.insert(
+                [
+                    PeculiarEejModel(date=date(2011, 1, 1), region=SA, type="突発型"),
+                    PeculiarEejModel(date=date(2009, 1, 20), region=SA, type="突発型"),
+                ]
+            )
+        # 競合があった場合はロールバックされる
+        self.assertEqual(len(repository.select(region=SA)), 2)
+
+    def test_peak_euel(self):
+        repository = PeakEuelRepository(storage=self.storage)
+        rows = repository.select(station_code="ANC")
+        self.assertEqual(
+            [row.date for row in rows], [date(2000, 1, 1), date(2000, 1, 2)]
+        )
+        peaks = repository.peak_euel_of_days(
+            "ANC", [date(2000, 1, 2), date(2000, 1, 1), date(2000, 1, 5)]
+        )
+        self.assertEqual(peaks[0], 30.5)
+        self.assertTrue(math.isnan(peaks[1]) and math.isnan(peaks[2]))
+
+    def test_missing_database(self):
+        storage = SqliteStorage(os.path.join(self.tmp.name, "missing.sqlite3"))
+        with self.assertRaises(FileNotFoundError):
+            EejCategoryRepository(storage=storage).count(None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,28 @@
 from fastapi import APIRouter
-from src.handler.ee_handler import handle_get_ee_by_range
+from src.handler.ee_bulk_export_submit_handler import handle_post_ee_bulk_export
+from src.handler.ee_handler import EeIndexByRangeResp, handle_get_ee_by_range
 from src.handler.ee_zip_by_days_handler import handle_get_ee_zip_content_by_days
 from src.handler.ee_zip_by_range_handler import handle_get_ee_zip_content_by_range
+from src.handler.ee_zip_job_by_days_handler import handle_post_ee_zip_job_by_days
+from src.handler.ee_zip_job_by_range_handler import handle_post_ee_zip_job_by_range
+from src.handler.ee_zip_stream_by_days_handler import handle_get_ee_zip_stream_by_days
+from src.handler.ee_zip_stream_by_range_handler import (
+    handle_get_ee_zip_stream_by_range,
+)
 from src.handler.eej_handler import handle_get_eej_by_range
+from src.handler.job_result_handler import handle_get_job_result
+from src.handler.job_status_handler import handle_get_job_status
 
 r = APIRouter()
 
 
-r.add_api_route("/ee-index", handle_get_ee_by_range, methods=["GET"])
+r.add_api_route(
+    "/ee-index",
+    handle_get_ee_by_range,
+    methods=["GET"],
+    response_model=EeIndexByRangeResp,
+    response_model_exclude_none=True,
+)
 r.add_api_route("/eej", handle_get_eej_by_range, methods=["GET"])
 r.add_api_route(
     "/download/ee-index/by-days",
@@ -19,3 +34,30 @@ r.add_api_route(
     handle_get_ee_zip_content_by_range,
     methods=["GET"],
 )
+r.add_api_route(
+    "/download/ee-index/by-days/stream",
+    handle_get_ee_zip_stream_by_days,
+    methods=["GET"],
+)
+r.add_api_route(
+    "/download/ee-index/by-range/stream",
+    handle_get_ee_zip_stream_by_range,
+    methods=["GET"],
+)
+r.add_api_route(
+    "/jobs/ee-index/by-days",
+    handle_post_ee_zip_job_by_days,
+    methods=["POST"],
+)
+r.add_api_route(
+    "/jobs/ee-index/by-range",
+    handle_post_ee_zip_job_by_range,
+    methods=["POST"],
+)
+r.add_api_route(
+    "/jobs/ee-index/bulk",
+    handle_post_ee_bulk_export,
+    methods=["POST"],
+)
+r.add_api_route("/jobs/{job_id}", handle_get_job_status, methods=["GET"])
+r.add_api_route("/jobs/{job_id}/result", handle_get_job_result, methods=["GET"])
@@ -13,8 +13,8 @@ from src.constants.time_relation import (
 from src.domain.magdas_station import EeIndexStation
 from src.domain.region import Region
 from src.domain.station_params import Period, StationParam
-from src.service.calc_utils.linear_completion import interpolate_nan
 from src.service.calc_utils.moving_avg import calc_moving_avg
+from src.service.ee_index.calc_edst import Edst
 from src.service.ee_index.factory_ee import EeFactory
 from src.service.kp import Kp
 
@@ -72,8 +72,7 @@ class BestEuelSelectorForEej:
 
     def select_euel_data(self) -> EuelData:
         eej_euels: Dict[EeIndexStation, NanRatioData] = {}
-        for station in self.stations:
-            eej_euel = self._euel_for_eej_detection(station)
+        for station, eej_euel in self._euels_for_eej_detection().items():
             nan_ratio = np.sum(np.isnan(eej_euel)) / len(eej_euel)
             eej_euels[station] = NanRatioData(
                 eej_euel,
@@ -87,53 +86,107 @@ class BestEuelSelectorForEej:
             array=best_euel.array,
         )
 
-    def _euel_for_eej_detection(self, station: EeIndexStation):
+    def _euels_for_eej_detection(self) -> Dict[EeIndexStation, np.ndarray]:
+        """全ての観測点のLTの1日分のEUELを、ERはまとめて、EDstは同じ期間で共有して計算"""
         s_lt = datetime(
             self.local_date.year, self.local_date.month, self.local_date.day, 0, 0
         )
         e_lt = s_lt.replace(hour=23, minute=59)
-        lt_params = StationParam(station, Period(s_lt, e_lt))
-        ut_params = lt_params.to_ut_params()
+        ut_params_list = [
+            StationParam(station, Period(s_lt, e_lt)).to_ut_params()
+            for station in self.stations
+        ]
 
         factory = EeFactory()
-        euel = factory.create_euel(ut_params)
-        euel_values = euel.calc_euel()
-
-        if not self._has_night_data(euel_values):
-            return euel_values
-        return self._euel_for_eej(euel_values)
+        er_matrix = factory.create_er_batch(ut_params_list).calc_er()
+        eej_euels = {}
+        for i, ut_params in enumerate(ut_params_list):
+            edst = factory.create_edst(ut_params.period)
+            euel_values = er_matrix[i] - edst.calc_edst()
+            if self._has_night_data(euel_values):
+                euel_values = self._euel_for_eej(euel_values)
+            eej_euels[ut_params.station] = euel_values
+        return eej_euels
 
     def _has_night_data(self, daily_data: np.ndarray) -> bool:
-        """一日の夜間（19:00～05:00データが存在するかどうかを判定する"""
-        if len(daily_data) != TimeUnit.ONE_DAY.min:
-            raise ValueError("daily_data must have 1440 elements.")
-        dawn_e = daily_data[0 : TimeUnit.FIVE_HOURS.min]
-        dusk_e = daily_data[TimeUnit.NINETEEN_HOURS.min : TimeUnit.ONE_DAY.min]
-        return not (np.all(np.isnan(dawn_e)) and np.all(np.isnan(dusk_e)))
+        return has_night_data(daily_data)
 
     def _euel_for_eej(self, daily_euel_values: np.ndarray) -> np.ndarray:
-        """
-        夜間（19:00～05:00）をNaNで埋めて補間
-        EUELから補間したベースラインを引く
-        1時間の移動平均を計算
-        """
-        if len(daily_euel_values) != TimeUnit.ONE_DAY.min:
-            raise ValueError("daily_euel_values must have 1440 elements.")
-        euel_for_baseline = np.concatenate(
-            (
-                daily_euel_values[: TimeUnit.FIVE_HOURS.min],
-                np.nan * np.ones(TimeUnit.FOURTEEN_HOURS.min),
-                daily_euel_values[TimeUnit.NINETEEN_HOURS.min : TimeUnit.ONE_DAY.min],
-            )
+        return calc_euel_for_eej(daily_euel_values)
+
+
+def has_night_data(daily_data: np.ndarray) -> bool:
+    """一日の夜間（19:00～05:00データが存在するかどうかを判定する"""
+    if len(daily_data) != TimeUnit.ONE_DAY.min:
+        raise ValueError("daily_data must have 1440 elements.")
+    return bool(has_night_data_days(daily_data[np.newaxis])[0])
+
+
+def has_night_data_days(euel_days: np.ndarray) -> np.ndarray:
+    """(日数, 1440) の各日の夜間（19:00～05:00）にデータが存在するかどうか (日数,)"""
+    night = np.ones(TimeUnit.ONE_DAY.min, dtype=bool)
+    night[TimeUnit.FIVE_HOURS.min : TimeUnit.NINETEEN_HOURS.min] = False
+    return np.any(~np.isnan(euel_days[:, night]), axis=1)
+
+
+def calc_euel_for_eej(daily_euel_values: np.ndarray) -> np.ndarray:
+    """1日分のEUELに対するcalc_euel_for_eej_days"""
+    if len(daily_euel_values) != TimeUnit.ONE_DAY.min:
+        raise ValueError("daily_euel_values must have 1440 elements.")
+    return calc_euel_for_eej_days(daily_euel_values[np.newaxis])[0]
+
+
+def calc_euel_for_eej_days(euel_days: np.ndarray) -> np.ndarray:
+    """(日数, 1440) のEUELから、日ごとにEEJ検知用のEUELを計算する
+
+    夜間（19:00～05:00）の値から昼間のベースラインを線形補間し、
+    EUELからベースラインを引いて1時間の移動平均を計算する。
+    夜間のデータが無い日は、元のEUELをそのまま返す。入力は変更しない
+
+    Note:
+      夜間の有効な値ではベースラインはEUELそのものなので、差は0になる。
+      昼間のベースラインは、夜明け前の最後の有効な値と日没後の最初の有効な値を結ぶ直線
+      (片方が無い場合はもう片方の値)で、1日ずつnp.interpで補間した値と同じになる
+    """
+    euel_days = np.asarray(euel_days, dtype=float)
+    if euel_days.ndim != 2 or euel_days.shape[1] != TimeUnit.ONE_DAY.min:
+        raise ValueError("euel_days must have shape (days, 1440).")
+    dawn_end, dusk_start = TimeUnit.FIVE_HOURS.min, TimeUnit.NINETEEN_HOURS.min
+    dawn_valid = ~np.isnan(euel_days[:, :dawn_end])
+    dusk_valid = ~np.isnan(euel_days[:, dusk_start:])
+    has_dawn = dawn_valid.any(axis=1)
+    has_dusk = dusk_valid.any(axis=1)
+
+    # 昼間を挟む夜間の有効な値の位置と値
+    rows = np.arange(len(euel_days))
+    dawn_last = dawn_end - 1 - np.argmax(dawn_valid[:, ::-1], axis=1)
+    dusk_first = dusk_start + np.argmax(dusk_valid, axis=1)
+    dawn_y = euel_days[rows, dawn_last]
+    dusk_y = euel_days[rows, dusk_first]
+    day_cols = np.arange(dawn_end, dusk_start)
+    with np.errstate(invalid="ignore"):
+        slope = (dusk_y - dawn_y) / (dusk_first - dawn_last)
+        day_baseline = (
+            slope[:, np.newaxis] * (day_cols - dawn_last[:, np.newaxis])
+            + dawn_y[:, np.newaxis]
         )
-        baseline = interpolate_nan(euel_for_baseline)
-        euel_for_eej_detection = daily_euel_values - baseline
+    day_baseline = np.where(
+        (has_dawn & has_dusk)[:, np.newaxis],
+        day_baseline,
+        np.where(has_dawn, dawn_y, dusk_y)[:, np.newaxis],
+    )
 
-        return calc_moving_avg(
-            euel_for_eej_detection,
-            window=TimeUnit.ONE_HOUR.min,
-            nan_threshold=TimeUnit.THIRTY_MINUTES.min,
-        )
+    euel_for_eej_detection = euel_days - euel_days
+    euel_for_eej_detection[:, dawn_end:dusk_start] = (
+        euel_days[:, dawn_end:dusk_start] - day_baseline
+    )
+    euel_for_eej_detection = calc_moving_avg(
+        euel_for_eej_detection,
+        window=TimeUnit.ONE_HOUR.min,
+        nan_threshold=TimeUnit.THIRTY_MINUTES.min,
+    )
+    has_night = has_dawn | has_dusk
+    return np.where(has_night[:, np.newaxis], euel_for_eej_detection, euel_days)
 
 
 class EejCategory(BaseModel):
@@ -207,9 +260,8 @@ class EejDetection:
         )
         e_dt = s_dt.replace(hour=23, minute=59)
         period = Period(s_dt, e_dt)
-        factory = EeFactory()
-        edst = factory.create_edst(period)
-        return np.min(edst.calc_edst())
+        # 保存済みの日はEDstを計算せず、保存された最小値を使用する
+        return Edst(period).get_min_edst(ignore_nan=False)
 
     def _get_daily_max_kp(self):
         ut_period = Period(
@@ -0,0 +1,357 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+from src.constants.ee_index import EDST_WORKERS
+from src.constants.time_relation import (
+    EEJ_DETECTION_END_TIME,
+    EEJ_DETECTION_START_TIME,
+    TimeUnit,
+)
+from src.domain.magdas_station import EeIndexStation
+from src.domain.region import Region
+from src.domain.station_params import Period, StationParam
+from src.service.calc_eej_detection import (
+    EejCategory,
+    EuelData,
+    calc_euel_for_eej_days,
+)
+from src.service.ee_index.calc_er import calc_nighttime_mask
+from src.service.ee_index.calc_er_batch import calc_er_matrix
+from src.service.ee_index.calc_h_component import HComponent
+from src.service.kp import Kp
+
+# 1回に読み込む日数。H成分は観測点ごとに (日数, 1440) の配列で保持される
+DEFAULT_CHUNK_DAYS = 366
+
+_ORIGIN = datetime(2000, 1, 1)
+
+
+def lt_day_offset(station: EeIndexStation) -> int:
+    """観測点のLTの1日(00:00~23:59)が始まるUTの時刻 (UTの0時からの分数、負の場合は前日)
+
+    LTの1日をUTに変換した期間は、日付によらずUTの日の境界から同じ分だけずれる
+    """
+    lt_period = Period(_ORIGIN, _ORIGIN.replace(hour=23, minute=59))
+    ut_start = StationParam(station, lt_period).to_ut_params().period.start
+    return int((ut_start - _ORIGIN).total_seconds() // TimeUnit.ONE_MINUTE.sec)
+
+
+def noon_columns() -> slice:
+    """(日数, 1440) の配列で、EEJ検知に使用する昼間(09:00~14:59)の列"""
+    start = EEJ_DETECTION_START_TIME.hour * 60 + EEJ_DETECTION_START_TIME.minute
+    end = EEJ_DETECTION_END_TIME.hour * 60 + EEJ_DETECTION_END_TIME.minute
+    return slice(start, end + 1)
+
+
+@dataclass
+class SelectedEuelDays:
+    """日ごとに欠損の割合が最も小さい観測点を選んだEEJ検知用のEUEL
+
+    Attributes:
+      stations: 日ごとに選ばれた観測点
+      euel: (日数, 1440) のEEJ検知用のEUEL
+      nan_ratio: (日数,) 選ばれた観測点のNaNの割合
+    """
+
+    stations: List[EeIndexStation]
+    euel: np.ndarray
+    nan_ratio: np.ndarray
+
+    @classmethod
+    def select(
+        cls,
+        stations: List[EeIndexStation],
+        euel_by_station: Dict[EeIndexStation, np.ndarray],
+    ) -> "SelectedEuelDays":
+        # (観測点数, 日数, 1440)
+        euels = np.stack([euel_by_station[station] for station in stations])
+        nan_ratios = np.sum(np.isnan(euels), axis=2) / euels.shape[2]
+        # 同じ割合の場合は先に指定された観測点を選ぶ (BestEuelSelectorForEejと同じ)
+        best = np.argmin(nan_ratios, axis=0)
+        days = np.arange(euels.shape[1])
+        return cls(
+            stations=[stations[i] for i in best],
+            euel=euels[best, days],
+            nan_ratio=nan_ratios[best, days],
+        )
+
+    @classmethod
+    def concat(cls, parts: List["SelectedEuelDays"]) -> "SelectedEuelDays":
+        return cls(
+            stations=[station for part in parts for station in part.stations],
+            euel=np.concatenate([part.euel for part in parts]),
+            nan_ratio=np.concatenate([part.nan_ratio for part in parts]),
+        )
+
+    def euel_data(self, i: int, region: Region) -> EuelData:
+        return EuelData(region=region, station=self.stations[i], array=self.euel[i])
+
+
+@dataclass
+class EejDetectionDays:
+    """LT日ごとのEEJ検知の結果
+
+    Attributes:
+      peak_diff: (日数,) 昼間のdipとoff-dipのEUELの最大値の差
+      daily_max_kp: (日数,) その日付(UT)のKp指数の最大値
+      daily_min_edst: (日数,) その日付(UT)のEDstの最小値
+    """
+
+    region: Region
+    dates: List[date]
+    dip: SelectedEuelDays
+    offdip: SelectedEuelDays
+    peak_diff: np.ndarray
+    daily_max_kp: np.ndarray
+    daily_min_edst: np.ndarray
+
+    def categories(self) -> List[EejCategory]:
+        return [
+            EejCategory.from_conditions(
+                peak_diff=float(peak_diff),
+                daily_max_kp=float(max_kp),
+                daily_min_edst=float(min_edst),
+            )
+            for peak_diff, max_kp, min_edst in zip(
+                self.peak_diff, self.daily_max_kp, self.daily_min_edst
+            )
+        ]
+
+
+@dataclass
+class EuelChunk:
+    """
+    Attributes:
+      dates: このチャンクのLTの日付
+      euel_by_station: 観測点ごとの (日数, 1440) のEEJ検知用のEUEL
+      ut_edst: (日数, 1440) LTの日付をUTの1日とみなしたEDst (with_ut_edst=Falseの場合はNone)
+    """
+
+    dates: List[date]
+    euel_by_station: Dict[EeIndexStation, np.ndarray]
+    ut_edst: Optional[np.ndarray]
+
+
+class EuelForEejRange:
+    """LTの期間のEEJ検知用のEUELを、日ごとではなく期間でまとめて計算するクラス
+
+    日ごとにBestEuelSelectorForEejで計算した場合と同じ値を、以下の手順で求める。
+    - 観測点ごとに、H成分を期間(最大chunk_days日)で1回だけ読み込み、
+      LTの1日が始まるUTの時刻(lt_day_offset)ごとに切り出して (日数, 1440) に並べる
+    - 行ごとの中央値をベースラインとしてERを求める(日ごとのPeriodで計算したERと同じ)
+    - EDstはLTの1日が始まるUTの時刻(lt_day_offset)ごとに、全観測点の夜間のERを平均して求める
+    """
+
+    def __init__(
+        self,
+        stations: List[EeIndexStation],
+        lt_start: date,
+        lt_end: date,
+        chunk_days: int = DEFAULT_CHUNK_DAYS,
+        workers: int = EDST_WORKERS,
+    ):
+        if lt_end < lt_start:
+            raise ValueError("lt_end must be on or after lt_start.")
+        self.stations = stations
+        self.lt_start = lt_start
+        self.lt_end = lt_end
+        self.chunk_days = chunk_days
+        self.workers = workers
+
+    @property
+    def dates(self) -> List[date]:
+        days = (self.lt_end - self.lt_start).days + 1
+        return [self.lt_start + timedelta(days=i) for i in range(days)]
+
+    def iter_chunks(self, with_ut_edst: bool = True) -> Iterator[EuelChunk]:
+        dates = self.dates
+        for i in range(0, len(dates), self.chunk_days):
+            chunk_dates = dates[i : i + self.chunk_days]
+            yield self._calc_chunk(chunk_dates, with_ut_edst)
+
+    def calc_peak_euel(self) -> Dict[EeIndexStation, np.ndarray]:
+        """観測点ごとの (日数,) の昼間(09:00~14:59)のEEJ検知用のEUELの最大値"""
+        noon = noon_columns()
+        peaks: Dict[EeIndexStation, List[np.ndarray]] = {s: [] for s in self.stations}
+        for chunk in self.iter_chunks(with_ut_edst=False):
+            for station in self.stations:
+                peaks[station].append(
+                    np.max(chunk.euel_by_station[station][:, noon], axis=1)
+                )
+        return {station: np.concatenate(peaks[station]) for station in self.stations}
+
+    def _calc_chunk(self, dates: List[date], with_ut_edst: bool) -> EuelChunk:
+        chunk_start, n_days = dates[0], len(dates)
+        offsets: Dict[int, List[EeIndexStation]] = {}
+        for station in self.stations:
+            offsets.setdefault(lt_day_offset(station), []).append(station)
+
+        # H成分は全てのoffsetを含む期間で観測点ごとに1回だけ読み込み、offsetごとに切り出す
+        needed = set(offsets) | ({0} if with_ut_edst else set())
+        first_offset = min(needed)
+        h_by_station = self._load_h(
+            chunk_start, n_days, first_offset, max(needed) - first_offset
+        )
+
+        euel_by_station: Dict[EeIndexStation, np.ndarray] = {}
+        for offset, stations in offsets.items():
+            er_by_station, edst = self._calc_er_and_edst(
+                h_by_station, n_days, offset, offset - first_offset
+            )
+            for station in stations:
+                euel = er_by_station[station] - edst
+                euel_by_station[station] = calc_euel_for_eej_days(euel)
+
+        ut_edst = None
+        if with_ut_edst:
+            _, ut_edst = self._calc_er_and_edst(h_by_station, n_days, 0, -first_offset)
+        return EuelChunk(dates=dates, euel_by_station=euel_by_station, ut_edst=ut_edst)
+
+    def _map(self, func, items: list) -> list:
+        if self.workers > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                return list(executor.map(func, items))
+        return [func(item) for item in items]
+
+    def _load_h(
+        self, chunk_start: date, n_days: int, first_offset: int, extra_minutes: int
+    ) -> Dict[EeIndexStation, np.ndarray]:
+        """全観測点の赤道換算H成分
+
+        Args:
+          first_offset: 読み込みを開始する、UTの0時からの分数
+          extra_minutes: n_days日分に加えて読み込む分数(offsetの最大値と最小値の差)
+        Return:
+          観測点ごとの (n_days * 1440 + extra_minutes,) のH成分
+        """
+        start_ut = datetime.combine(chunk_start, datetime.min.time()) + timedelta(
+            minutes=first_offset
+        )
+        period = Period(
+            start_ut,
+            start_ut
+            + timedelta(minutes=n_days * TimeUnit.ONE_DAY.min + extra_minutes - 1),
+        )
+        stations = list(EeIndexStation)
+
+        def load(station: EeIndexStation) -> np.ndarray:
+            return HComponent(StationParam(station, period)).get_equatorial_h().h_values
+
+        return dict(zip(stations, self._map(load, stations)))
+
+    def _calc_er_and_edst(
+        self,
+        h_by_station: Dict[EeIndexStation, np.ndarray],
+        n_days: int,
+        offset: int,
+        h_start: int,
+    ) -> tuple[Dict[EeIndexStation, np.ndarray], np.ndarray]:
+        """各日のUTの0時からoffset分後に始まる1日ごとの、全観測点のERとEDst
+
+        Args:
+          h_by_station: _load_hで読み込んだH成分
+          h_start: offsetの1日目の開始時刻の、h_by_stationでの位置
+        Return:
+          er_by_station: 観測点ごとの (日数, 1440) のER
+          edst: (日数, 1440) のEDst
+        """
+        stations = list(EeIndexStation)
+        # 1日分の夜間のマスクは、日の開始時刻が同じであれば日付によらない
+        mask_start = _ORIGIN + timedelta(minutes=offset)
+        h_end = h_start + n_days * TimeUnit.ONE_DAY.min
+
+        def calc(station: EeIndexStation) -> np.ndarray:
+            h_values = h_by_station[station][h_start:h_end]
+            return calc_er_matrix(h_values.reshape(n_days, TimeUnit.ONE_DAY.min))
+
+        er_list = self._map(calc, stations)
+
+        # np.nanmeanで観測点の軸(axis=0)を平均した場合と同じく、観測点の順に加算する
+        night_sum = np.zeros((n_days, TimeUnit.ONE_DAY.min), dtype=float)
+        night_count = np.zeros((n_days, TimeUnit.ONE_DAY.min), dtype=np.int64)
+        for station, er in zip(stations, er_list):
+            mask = calc_nighttime_mask(
+                station.time_diff, mask_start, TimeUnit.ONE_DAY.min
+            )
+            night_er = np.where(mask, er, np.nan).astype(float)
+            is_valid = ~np.isnan(night_er)
+            night_sum += np.where(is_valid, night_er, 0.0)
+            night_count += is_valid
+        with np.errstate(invalid="ignore", divide="ignore"):
+            edst = night_sum / night_count
+        return dict(zip(stations, er_list)), edst
+
+
+class EejDetectionRange:
+    """LTの期間のEEJ検知を、日ごとではなく期間でまとめて行うクラス
+
+    日ごとにBestEuelSelectorForEej・EejDetectionを使う場合と同じ結果を、
+    EuelForEejRangeで計算したEUELから、NaNの割合・観測点の選択・昼間のピーク・
+    EDstの最小値を日をまとめた配列演算で求める。
+    """
+
+    def __init__(
+        self,
+        region: Region,
+        dip_stations: List[EeIndexStation],
+        offdip_stations: List[EeIndexStation],
+        lt_start: date,
+        lt_end: date,
+        chunk_days: int = DEFAULT_CHUNK_DAYS,
+        workers: int = EDST_WORKERS,
+    ):
+        for station in dip_stations:
+            if not station.is_dip():
+                raise ValueError(
+                    f"{station.code} is {station.gm_lat}. It is not in dip region"
+                )
+        for station in offdip_stations:
+            if not station.is_offdip():
+                raise ValueError(
+                    f"{station.code} is {station.gm_lat}. It is not in off-dip region"
+                )
+        self.region = region
+        self.dip_stations = dip_stations
+        self.offdip_stations = offdip_stations
+        self.euel_range = EuelForEejRange(
+            dip_stations + offdip_stations, lt_start, lt_end, chunk_days, workers
+        )
+
+    @property
+    def dates(self) -> List[date]:
+        return self.euel_range.dates
+
+    def detect(self) -> EejDetectionDays:
+        dip_parts, offdip_parts, min_edst_parts = [], [], []
+        for chunk in self.euel_range.iter_chunks():
+            dip_parts.append(
+                SelectedEuelDays.select(self.dip_stations, chunk.euel_by_station)
+            )
+            offdip_parts.append(
+                SelectedEuelDays.select(self.offdip_stations, chunk.euel_by_station)
+            )
+            # EejDetectionと同様に、LTの日付をUTの1日とみなしたEDstの最小値
+            min_edst_parts.append(np.min(chunk.ut_edst, axis=1))
+
+        dip = SelectedEuelDays.concat(dip_parts)
+        offdip = SelectedEuelDays.concat(offdip_parts)
+        noon = noon_columns()
+        peak_diff = np.max(dip.euel[:, noon], axis=1) - np.max(
+            offdip.euel[:, noon], axis=1
+        )
+        return EejDetectionDays(
+            region=self.region,
+            dates=self.dates,
+            dip=dip,
+            offdip=offdip,
+            peak_diff=peak_diff,
+            daily_max_kp=self._daily_max_kp(),
+            daily_min_edst=np.concatenate(min_edst_parts),
+        )
+
+    def _daily_max_kp(self) -> np.ndarray:
+        # EejDetectionと同様に、LTの日付をUTの1日とみなす
+        return Kp().max_of_days(self.dates)
@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterator
+
+import numpy as np
+from src.constants.ee_index import MAX_RAW_H, MIN_RAW_H
+from src.constants.raw_data import FOUR_COMPONENTS
+from src.constants.time_relation import TimeUnit
+from src.repository.gm_data import find_sec_files
+from src.repository.raw_file_reader import read_raw_sec_data
+
+
+@dataclass
+class MinuteAggregate:
+    """1日分の秒値から求めた分値
+
+    Attributes:
+      mean: (1440, 4) h, d, z, f の分平均。有効な秒値が無い分はNaN
+      valid_count: (1440, 4) 分ごとの有効な秒値の数(0~60)。品質フラグとして使用
+    """
+
+    ut_date: date
+    mean: np.ndarray
+    valid_count: np.ndarray
+
+
+def calc_minute_mean(
+    sec_data: np.ndarray, chunk_minutes: int = TimeUnit.ONE_HOUR.min
+) -> tuple[np.ndarray, np.ndarray]:
+    """(86400, 4)の秒値を(1440, 4)の分平均と有効な秒値の数に変換
+
+    Note:
+      memmapを渡した場合にメモリ上の一時配列が1日分にならないよう、chunk_minutes分ずつ処理する
+    """
+    n_minutes = TimeUnit.ONE_DAY.min
+    sec_per_min = TimeUnit.ONE_MINUTE.sec
+    mean = np.full((n_minutes, FOUR_COMPONENTS), np.nan, dtype=np.float32)
+    valid_count = np.zeros((n_minutes, FOUR_COMPONENTS), dtype=np.uint8)
+    for start in range(0, n_minutes, chunk_minutes):
+        end = min(start + chunk_minutes, n_minutes)
+        block = np.asarray(
+            sec_data[start * sec_per_min : end * sec_per_min], dtype=np.float32
+        ).reshape(end - start, sec_per_min, FOUR_COMPONENTS)
+        valid = (block > MIN_RAW_H) & (block < MAX_RAW_H)
+        count = valid.sum(axis=1)
+        total = np.where(valid, block, 0).sum(axis=1, dtype=np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean[start:end] = total / count
+        valid_count[start:end] = count
+    return mean, valid_count
+
+
+def iter_minute_aggregates(
+    station_code: str, start_date: date, end_date: date
+) -> Iterator[MinuteAggregate]:
+    """秒値ファイルを1日ずつ分値に変換して返す
+
+    1日分の処理が終わるごとにmemmapを解放するため、期間の長さに関わらずメモリ使用量は一定。
+    ファイルが無い日・欠損がある日は、平均がNaN、有効な秒値の数が0となる。
+    """
+    for i in range((end_date - start_date).days + 1):
+        ut_date = start_date + timedelta(days=i)
+        filenames = find_sec_files(station_code, ut_date)
+        mean = np.full((TimeUnit.ONE_DAY.min, FOUR_COMPONENTS), np.nan, np.float32)
+        valid_count = np.zeros((TimeUnit.ONE_DAY.min, FOUR_COMPONENTS), np.uint8)
+        if len(filenames) == 1:
+            try:
+                sec_data = read_raw_sec_data(filenames[0])
+                mean, valid_count = calc_minute_mean(sec_data)
+                del sec_data
+            except ValueError:  # Handle file format errors
+                pass
+        yield MinuteAggregate(ut_date=ut_date, mean=mean, valid_count=valid_count)
@@ -2,6 +2,8 @@ import numpy as np
 
 
 def interpolate_nan(arr: np.ndarray) -> np.ndarray:
+    """NaNを線形補間した新しい配列を返す。入力は変更しない"""
+    arr = np.array(arr, dtype=float)
     x = np.arange(len(arr))
     nan_indices = np.isnan(arr)
     x_valid = x[~nan_indices]
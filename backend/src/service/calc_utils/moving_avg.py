@@ -1,7 +1,80 @@
+from typing import List, Sequence, Tuple
+
 import numpy as np
-import pandas as pd
 
 
 def calc_moving_avg(data: np.ndarray, window: int, nan_threshold: int) -> np.ndarray:
-    s = pd.Series(data)
-    return s.rolling(window, min_periods=nan_threshold, center=True).mean().to_numpy()
+    """NaNを無視した中心移動平均
+
+    pandasの Series.rolling(window, min_periods=nan_threshold, center=True).mean() と同じ。
+    2次元の配列の場合は行ごとに計算する
+
+    Args:
+      data: (分数,) または (行数, 分数) の配列
+      window: 窓の大きさ
+      nan_threshold: 窓内のNaNでない値がこの個数未満の位置はNaN
+    """
+    return calc_moving_avgs(data, [(window, nan_threshold)])[0]
+
+
+def calc_moving_avgs(
+    data: np.ndarray, windows: Sequence[Tuple[int, int]]
+) -> List[np.ndarray]:
+    """複数の窓の大きさの中心移動平均をまとめて計算する
+
+    累積和とNaNでない値の累積個数を1回だけ求め、各窓の合計と個数をその差から求める。
+
+    Args:
+      data: (分数,) または (行数, 分数) の配列
+      windows: (窓の大きさ, nan_threshold) のリスト
+    Return:
+      windowsの順に、dataと同じ形のfloat64の配列
+    """
+    for window, nan_threshold in windows:
+        if window < 1:
+            raise ValueError("window must be 1 or more.")
+        if nan_threshold > window:
+            raise ValueError("nan_threshold must be window or less.")
+
+    values = np.asarray(data, dtype=float)
+    matrix = np.atleast_2d(values)
+    if matrix.ndim != 2:
+        raise ValueError("data must be 1-D or 2-D.")
+    n_cols = matrix.shape[1]
+    valid = ~np.isnan(matrix)
+    # 累積和の桁落ちを抑えるため、各行の有効な値の平均を引いてから足し合わせる
+    with np.errstate(invalid="ignore", divide="ignore"):
+        offset = np.where(valid, matrix, 0.0).sum(axis=1) / valid.sum(axis=1)
+    offset = np.nan_to_num(offset)[:, np.newaxis]
+
+    # pandasのcenter=Trueと同じく、位置iの窓は [i - window // 2, i + (window - 1) // 2]
+    max_before = max(window // 2 for window, _ in windows)
+    max_after = max((window - 1) // 2 for window, _ in windows)
+    total = _padded_cumsum(np.where(valid, matrix - offset, 0.0), max_before, max_after)
+    count = _padded_cumsum(valid.astype(np.int32), max_before, max_after)
+
+    results = []
+    for window, nan_threshold in windows:
+        before, after = window // 2, (window - 1) // 2
+        upper = slice(max_before + 1 + after, max_before + 1 + after + n_cols)
+        lower = slice(max_before - before, max_before - before + n_cols)
+        window_total = total[:, upper] - total[:, lower]
+        window_count = count[:, upper] - count[:, lower]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg = window_total / window_count + offset
+        avg[window_count < max(nan_threshold, 1)] = np.nan
+        results.append(avg.reshape(values.shape))
+    return results
+
+
+def _padded_cumsum(values: np.ndarray, before: int, after: int) -> np.ndarray:
+    """各行の累積和の先頭にbefore+1個の0、末尾にafter個の合計を並べた配列
+
+    位置iまでの合計が列 before + 1 + i にあり、端で窓が切れる場合も同じ式で差を取れる
+    """
+    n_rows, n_cols = values.shape
+    cumsum = np.empty((n_rows, before + 1 + n_cols + after), dtype=values.dtype)
+    cumsum[:, : before + 1] = 0
+    np.cumsum(values, axis=1, out=cumsum[:, before + 1 : before + 1 + n_cols])
+    cumsum[:, before + 1 + n_cols :] = cumsum[:, before + n_cols : before + 1 + n_cols]
+    return cumsum
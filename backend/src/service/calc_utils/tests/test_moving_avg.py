@@ -0,0 +1,68 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from src.service.calc_utils.moving_avg import calc_moving_avg, calc_moving_avgs
+
+
+def pandas_moving_avg(data: np.ndarray, window: int, nan_threshold: int) -> np.ndarray:
+    s = pd.Series(data)
+    return s.rolling(window, min_periods=nan_threshold, center=True).mean().to_numpy()
+
+
+class TestMovingAvg(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        # EDstのようにオフセットのある値と、NaNの連続・散在するパターン
+        self.data = rng.normal(-30, 20, (5, 3000))
+        self.data[1, rng.random(3000) < 0.3] = np.nan
+        self.data[2, 100:700] = np.nan
+        self.data[3, :] = np.nan
+        self.data[4, :50] = np.nan
+        self.data[4, -50:] = np.nan
+
+    def assert_same_as_pandas(self, result, data, window, nan_threshold):
+        expected = pandas_moving_avg(data, window, nan_threshold)
+        np.testing.assert_array_equal(np.isnan(result), np.isnan(expected))
+        np.testing.assert_allclose(result, expected, rtol=1e-9, atol=1e-9)
+
+    def test_same_as_pandas(self):
+        cases = [(60, 30), (61, 30), (360, 180), (180, 90), (1, 1), (5, 0), (4000, 10)]
+        for window, nan_threshold in cases:
+            for row in self.data:
+                with self.subTest(window=window, nan_threshold=nan_threshold):
+                    result = calc_moving_avg(row, window, nan_threshold)
+                    self.assert_same_as_pandas(result, row, window, nan_threshold)
+
+    def test_2d_input(self):
+        result = calc_moving_avg(self.data, 60, 30)
+        self.assertEqual(result.shape, self.data.shape)
+        for i, row in enumerate(self.data):
+            self.assert_same_as_pandas(result[i], row, 60, 30)
+
+    def test_multiple_windows(self):
+        windows = [(60, 30), (360, 180)]
+        results = calc_moving_avgs(self.data[1], windows)
+        for result, (window, nan_threshold) in zip(results, windows):
+            self.assert_same_as_pandas(result, self.data[1], window, nan_threshold)
+
+    def test_float32_input(self):
+        data = self.data[4].astype(np.float32)
+        result = calc_moving_avg(data, 60, 30)
+        self.assertEqual(result.dtype, np.float64)
+        self.assert_same_as_pandas(result, data, 60, 30)
+
+    def test_does_not_mutate_input(self):
+        before = self.data.copy()
+        calc_moving_avgs(self.data, [(60, 30), (360, 180)])
+        np.testing.assert_array_equal(self.data, before)
+
+    def test_invalid_window(self):
+        with self.assertRaises(ValueError):
+            calc_moving_avg(self.data[0], 0, 0)
+        with self.assertRaises(ValueError):
+            calc_moving_avg(self.data[0], 10, 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,26 +1,122 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from typing import Callable
+
 import numpy as np
+from src.constants.ee_index import EDST_WORKERS
+from src.constants.time_relation import TimeUnit
 from src.domain.magdas_station import EeIndexStation
 from src.domain.station_params import Period, StationParam
+from src.repository.edst_store import DailyEdst, EdstStoreRepository
 from src.service.calc_utils.nan_calculator import NanCalculator
-from src.service.ee_index.calc_er import Er
-from src.service.ee_index.calc_h_component import HComponent
+from src.service.ee_index.calc_er_batch import ErBatch
+from src.service.ee_index.calc_h_component import HComponent, HData
 
 
 class Edst:
-    def __init__(self, ut_period: Period):
+    def __init__(
+        self,
+        ut_period: Period,
+        create_h: Callable[[StationParam], HComponent] = HComponent,
+        use_store: bool = True,
+        workers: int = EDST_WORKERS,
+    ):
+        """
+        Args:
+          ut_period: EDstを計算する期間(UT)
+          create_h: 観測点ごとのH成分の生成関数。EeFactoryから渡されるとH成分が共有される
+          use_store: 期間がUTの1日(00:00~23:59)の場合、保存済みのEDstを使用する
+          workers: 観測点ごとのファイル読み込み・夜間ERの計算を並列に行うスレッド数。
+            1の場合は逐次実行する。いずれの場合も結果は同じ
+        """
         self.ut_period = ut_period
+        self.create_h = create_h
+        self.use_store = use_store
+        self.workers = workers
+        self._edst: np.ndarray | None = None
+        self._daily_edst: DailyEdst | None = None
+        self._store_checked = False
 
     def calc_edst(self) -> np.ndarray:
-        length = self.ut_period.total_minutes() + 1  # +1 for the start time
-        night_er_list = np.empty((0, length), dtype=float)
-        for station in EeIndexStation:
-            params = StationParam(station, self.ut_period)
-            h = HComponent(params)
-            er = Er(h.get_equatorial_h())
-            night_er_val = er.extract_night_er()
-            night_er_list = np.vstack((night_er_list, night_er_val))
-        edst = NanCalculator.nanmean(night_er_list)
+        """EDstを計算する。計算結果は保持され、2回目以降は再計算しない"""
+        if self._edst is None:
+            daily_edst = self._load_from_store()
+            if daily_edst is not None:
+                self._edst = daily_edst.edst
+        if self._edst is None:
+            self._edst = self._calc_edst()
+        return self._edst
+
+    def _is_one_ut_day(self) -> bool:
+        start = self.ut_period.start
+        return start.time() == time(0, 0) and self.ut_period.end == start + timedelta(
+            minutes=TimeUnit.ONE_DAY.min - 1
+        )
+
+    def _load_from_store(self) -> DailyEdst | None:
+        """保存済みのEDstは1日単位のベースラインで計算されているため、UTの1日分の期間のみ使用"""
+        if not self._store_checked:
+            self._store_checked = True
+            if self.use_store and self._is_one_ut_day():
+                store = EdstStoreRepository()
+                self._daily_edst = store.get(self.ut_period.start.date())
+        return self._daily_edst
+
+    def _calc_edst(self) -> np.ndarray:
+        stations = list(EeIndexStation)
+
+        def load_h(station: EeIndexStation) -> HData:
+            return self.create_h(
+                StationParam(station, self.ut_period)
+            ).get_equatorial_h()
+
+        # 観測点ごとのファイル読み込みは並列に行い、ERの計算は (観測点数, 分数) の行列でまとめて行う
+        if self.workers > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                h_data_list = list(executor.map(load_h, stations))
+        else:
+            h_data_list = [load_h(station) for station in stations]
+        night_er_matrix = ErBatch(h_data_list).extract_night_er().astype(float)
+        edst = NanCalculator.nanmean(night_er_matrix)
+        # 共有される計算結果のため、呼び出し側での書き換えを禁止
+        edst.flags.writeable = False
         return edst
 
-    def get_min_edst(self) -> float:
-        return np.nanmin(self.calc_edst())
+    def get_min_edst(self, ignore_nan: bool = True) -> float:
+        """期間のEDstの最小値。保存済みの日は保存された最小値を使用する
+
+        Args:
+          ignore_nan: Falseの場合、欠損が1分でもあればNaN (np.minと同じ)
+        """
+        if self._edst is None:
+            daily_edst = self._load_from_store()
+            if daily_edst is not None:
+                return daily_edst.get_min_edst(ignore_nan)
+        edst = self.calc_edst()
+        return np.nanmin(edst) if ignore_nan else np.min(edst)
+
+
+def backfill_edst_store(start_date: date, end_date: date, force: bool = False) -> int:
+    """UT日ごとのEDstを計算してStorage/edstに保存する
+
+    Args:
+      start_date, end_date: 保存するUT日付の範囲(両端を含む)
+      force: Trueの場合、保存済みで最新の日も再計算する
+    Return:
+      保存した日数
+    """
+    store = EdstStoreRepository()
+    written = 0
+    for i in range((end_date - start_date).days + 1):
+        ut_date = start_date + timedelta(days=i)
+        if not force and store.get(ut_date) is not None:
+            continue
+        fingerprint = store.fingerprint(ut_date)
+        start_ut = datetime.combine(ut_date, time(0, 0))
+        period = Period(
+            start_ut, start_ut + timedelta(minutes=TimeUnit.ONE_DAY.min - 1)
+        )
+        edst = Edst(period, use_store=False).calc_edst()
+        store.put(ut_date, edst, fingerprint)
+        written += 1
+    return written
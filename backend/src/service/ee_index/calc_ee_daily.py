@@ -0,0 +1,128 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from enum import Enum
+from typing import List
+
+import numpy as np
+from src.constants.ee_index import EDST_WORKERS
+from src.constants.time_relation import TimeUnit
+from src.domain.magdas_station import EeIndexStation
+from src.domain.station_params import Period, StationParam
+from src.repository.station_day_er_store import StationDayErRepository
+from src.service.calc_utils.nan_calculator import NanCalculator
+from src.service.ee_index.calc_er import calc_nighttime_mask
+from src.service.ee_index.calc_er_batch import calc_er_matrix, calc_row_nanmedian
+from src.service.ee_index.calc_h_component import HComponent
+
+
+class EeComputationMode(str, Enum):
+    """EE-indexの計算方法
+
+    WHOLE_PERIOD: 要求された期間全体のH成分の中央値をベースラインとする(従来の計算)
+    DAILY: UT日ごとのH成分の中央値をベースラインとし、観測点・日ごとの結果を保存して再利用する
+    """
+
+    WHOLE_PERIOD = "whole_period"
+    DAILY = "daily"
+
+
+@dataclass
+class EeValues:
+    er: np.ndarray
+    edst: np.ndarray
+    euel: np.ndarray
+
+
+def _ut_dates(period: Period) -> List[date]:
+    start, end = period.start.date(), period.end.date()
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+class DailyEe:
+    """UT日ごとのベースラインで計算するEE-index (EeComputationMode.DAILY)
+
+    観測点・UT日ごとのERをStationDayErRepositoryに保存し、複数日の期間は保存済みの日を
+    組み合わせて計算する。.mgdファイルが追加・更新された観測点・日だけが再計算される。
+    1日分(UTの00:00~23:59)のEDstは、WHOLE_PERIODで同じ1日を計算した値と一致する。
+    """
+
+    def __init__(
+        self, store: StationDayErRepository | None = None, workers: int = EDST_WORKERS
+    ):
+        self.store = store or StationDayErRepository()
+        self.workers = workers
+        self._edst_cache: dict[tuple[date, ...], np.ndarray] = {}
+
+    def calc_station_er(
+        self, station: EeIndexStation, ut_dates: List[date]
+    ) -> np.ndarray:
+        """(日数, 1440) のER。保存されていない日のみH成分を読み込んで計算し、保存する"""
+        er, fresh = self.store.get(station.code, ut_dates)
+        missing = [i for i, is_fresh in enumerate(fresh) if not is_fresh]
+        if not missing:
+            return er
+
+        missing_dates = [ut_dates[i] for i in missing]
+        fingerprints = [self.store.fingerprint(station.code, d) for d in missing_dates]
+        first, last = min(missing_dates), max(missing_dates)
+        period = Period(
+            datetime.combine(first, time(0, 0)), datetime.combine(last, time(23, 59))
+        )
+        h_values = HComponent(StationParam(station, period)).get_equatorial_h().h_values
+        h_days = h_values.reshape(-1, TimeUnit.ONE_DAY.min)
+        h_rows = h_days[[(d - first).days for d in missing_dates]]
+
+        base = calc_row_nanmedian(h_rows)
+        er_rows = calc_er_matrix(h_rows, base)
+        self.store.put(
+            station.code,
+            zip(missing_dates, er_rows, base.tolist(), fingerprints),
+        )
+        er[missing] = er_rows
+        return er
+
+    def calc_edst(self, ut_dates: List[date]) -> np.ndarray:
+        """(日数, 1440) のEDst。各観測点の夜間のERを日ごとに平均する"""
+        key = tuple(ut_dates)
+        if key in self._edst_cache:
+            return self._edst_cache[key]
+
+        stations = list(EeIndexStation)
+        night_er = np.empty(
+            (len(stations), len(ut_dates), TimeUnit.ONE_DAY.min), dtype=float
+        )
+
+        def fill(i: int) -> None:
+            station = stations[i]
+            # UTの0時から1日分の夜間のマスクは日付によらない
+            mask = calc_nighttime_mask(
+                station.time_diff, datetime(2000, 1, 1), TimeUnit.ONE_DAY.min
+            )
+            night_er[i] = np.where(
+                mask, self.calc_station_er(station, ut_dates), np.nan
+            )
+
+        if self.workers > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                list(executor.map(fill, range(len(stations))))
+        else:
+            for i in range(len(stations)):
+                fill(i)
+        edst = NanCalculator.nanmean(night_er, axis=0)
+        edst.flags.writeable = False
+        self._edst_cache[key] = edst
+        return edst
+
+    def calc(self, ut_params: StationParam) -> EeValues:
+        """期間(UT)のER, EDst, EUEL。期間は日の途中から始まり・終わってもよい"""
+        period = ut_params.period
+        ut_dates = _ut_dates(period)
+        offset = period.start.hour * TimeUnit.ONE_HOUR.min + period.start.minute
+        length = period.total_minutes() + 1
+
+        er = self.calc_station_er(ut_params.station, ut_dates).reshape(-1)
+        edst = self.calc_edst(ut_dates).reshape(-1)
+        er = er[offset : offset + length]
+        edst = edst[offset : offset + length]
+        return EeValues(er=er, edst=edst, euel=er - edst)
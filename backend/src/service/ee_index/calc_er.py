@@ -1,8 +1,9 @@
+from datetime import datetime
+from functools import lru_cache
+
 import numpy as np
-from numpy.typing import NDArray
-from src.constants.ee_index import MAX_ER, MIN_ER
 from src.constants.time_relation import DawnAndDusk, TimeUnit
-from src.service.calc_utils.nan_calculator import NanCalculator
+from src.service.ee_index.calc_er_batch import calc_er_matrix
 from src.service.ee_index.calc_h_component import HData
 
 
@@ -11,30 +12,35 @@ class Er:
         self.h_data = h_data
 
     def calc_er(self):
-        h_values = self.h_data.h_values
-        base = NanCalculator.nanmedian(h_values)
-        raw_er = h_values - base
-        return self._remove_outliers(raw_er)
-
-    def _remove_outliers(self, raw_er: np.ndarray) -> np.ndarray:
-        filtered_er = np.where((raw_er > MAX_ER) | (raw_er < MIN_ER), np.nan, raw_er)
-        return filtered_er
-
-    def _get_lt_timestamps(self) -> NDArray[np.datetime64]:
-        ut_timestamps = self.h_data.ut_params.period.get_minute_list()
-        time_diff_hour = self.h_data.ut_params.station.time_diff
-        time_diff_min = int(time_diff_hour * TimeUnit.ONE_HOUR.min)
-        lt_timestamps = ut_timestamps + np.timedelta64(time_diff_min, "m")
-        return np.array(lt_timestamps)
+        """期間の中央値をベースラインとしたER。計算はErBatchと共通"""
+        return calc_er_matrix(self.h_data.h_values[np.newaxis, :])[0]
 
     def nighttime_mask(self) -> np.ndarray:
-        lt_arr = self._get_lt_timestamps()
-        lt_times = np.array(
-            [lt.astype("datetime64[m]").astype("O").time() for lt in lt_arr]
+        ut_params = self.h_data.ut_params
+        return calc_nighttime_mask(
+            ut_params.station.time_diff,
+            ut_params.period.start,
+            ut_params.period.total_minutes() + 1,
         )
-        return np.array([DawnAndDusk.NIGHTSIDE.contains(lt) for lt in lt_times])
 
     def extract_night_er(self) -> np.ndarray:
         """Night definition 18:00 to 05:59"""
         night_er = np.where(self.nighttime_mask(), self.calc_er(), np.nan)
         return night_er
+
+
+@lru_cache(maxsize=256)
+def calc_nighttime_mask(
+    time_diff_hour: float, start_ut: datetime, length: int
+) -> np.ndarray:
+    """UTの期間に対する、観測点の地方時での夜間(18:00~05:59)のマスク
+
+    Note:
+      (時差, 期間)ごとにキャッシュされるため、戻り値は読み取り専用
+    """
+    time_diff_min = int(time_diff_hour * TimeUnit.ONE_HOUR.min)
+    start_lt_min = np.datetime64(start_ut, "m").astype(np.int64) + time_diff_min
+    minutes_of_day = (start_lt_min + np.arange(length)) % TimeUnit.ONE_DAY.min
+    mask = DawnAndDusk.NIGHTSIDE.contains_array(minutes_of_day)
+    mask.flags.writeable = False
+    return mask
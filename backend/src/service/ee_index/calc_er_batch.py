@@ -0,0 +1,103 @@
+from typing import List, Sequence
+
+import numpy as np
+from src.constants.ee_index import MAX_ER, MIN_ER
+from src.constants.time_relation import DawnAndDusk, TimeUnit
+from src.domain.station_params import StationParam
+from src.service.ee_index.calc_h_component import HData
+
+
+def calc_row_nanmedian(matrix: np.ndarray) -> np.ndarray:
+    """各行のNaNを除いた中央値 (行数,)
+
+    Note:
+      NaNを末尾に並べるソートと各行の有効な値の個数から中央の要素を取り出す。
+      偶数個の場合は中央の2つの平均を入力と同じ型で計算するため、
+      1行ずつnp.nanmedianを適用した結果と一致する。全てNaNの行はNaN
+    """
+    sorted_matrix = np.sort(matrix, axis=1)
+    valid_count = np.count_nonzero(~np.isnan(matrix), axis=1)
+    upper = valid_count // 2
+    lower = np.maximum((valid_count - 1) // 2, 0)
+    rows = np.arange(matrix.shape[0])
+    median = (
+        sorted_matrix[rows, lower] + sorted_matrix[rows, upper]
+    ) / matrix.dtype.type(2)
+    median[valid_count == 0] = np.nan
+    return median
+
+
+def calc_er_matrix(h_matrix: np.ndarray, base: np.ndarray | None = None) -> np.ndarray:
+    """(観測点数, 分数)の赤道換算H成分から、各観測点のERをまとめて計算
+
+    各行の中央値をベースラインとして差し引き、閾値(MIN_ER, MAX_ER)外の値をNaNにする
+
+    Args:
+      base: 計算済みの各行のベースライン(calc_row_nanmedian)。省略時は計算する
+    """
+    if base is None:
+        base = calc_row_nanmedian(h_matrix)
+    base = base.astype(np.float32)
+    raw_er = h_matrix - base[:, np.newaxis]
+    return np.where((raw_er > MAX_ER) | (raw_er < MIN_ER), np.nan, raw_er)
+
+
+def calc_nighttime_mask_matrix(ut_params_list: Sequence[StationParam]) -> np.ndarray:
+    """各観測点・期間(UT)に対する、観測点の地方時での夜間(18:00~05:59)のマスク
+
+    calc_nighttime_maskを観測点ごとに並べたものと同じ (観測点数, 分数) の配列
+    """
+    length = ut_params_list[0].period.total_minutes() + 1
+    start_lt_min = np.array(
+        [
+            np.datetime64(params.period.start, "m").astype(np.int64)
+            + int(params.station.time_diff * TimeUnit.ONE_HOUR.min)
+            for params in ut_params_list
+        ],
+        dtype=np.int64,
+    )
+    minutes_of_day = (
+        start_lt_min[:, np.newaxis] + np.arange(length, dtype=np.int64)
+    ) % TimeUnit.ONE_DAY.min
+    return DawnAndDusk.NIGHTSIDE.contains_array(minutes_of_day)
+
+
+class ErBatch:
+    """複数の観測点のERを (観測点数, 分数) の行列でまとめて計算するクラス
+
+    Erを観測点ごとに作成した場合と同じ値を、行ごとの中央値・外れ値の除去・
+    夜間のマスクをそれぞれ1回の配列演算で求める。各観測点の期間は異なってもよいが、
+    長さは同じである必要がある。
+    """
+
+    def __init__(self, h_data_list: List[HData]):
+        if not h_data_list:
+            raise ValueError("h_data_list must not be empty")
+        lengths = {len(h_data.h_values) for h_data in h_data_list}
+        if len(lengths) > 1:
+            raise ValueError("All h_values must have the same length.")
+        self.h_data_list = h_data_list
+        self._er: np.ndarray | None = None
+
+    @property
+    def stations(self):
+        return [h_data.ut_params.station for h_data in self.h_data_list]
+
+    def h_matrix(self) -> np.ndarray:
+        return np.vstack([h_data.h_values for h_data in self.h_data_list])
+
+    def calc_er(self) -> np.ndarray:
+        """(観測点数, 分数)のER。計算結果は保持され、2回目以降は再計算しない"""
+        if self._er is None:
+            self._er = calc_er_matrix(self.h_matrix())
+            self._er.flags.writeable = False
+        return self._er
+
+    def nighttime_mask(self) -> np.ndarray:
+        return calc_nighttime_mask_matrix(
+            [h_data.ut_params for h_data in self.h_data_list]
+        )
+
+    def extract_night_er(self) -> np.ndarray:
+        """Night definition 18:00 to 05:59"""
+        return np.where(self.nighttime_mask(), self.calc_er(), np.nan)
@@ -16,9 +16,19 @@ class HComponent:
     def __init__(self, ut_params: StationParam):
         self.gm_repo = GMPeriodRepository(ut_params)
         self.ut_params = ut_params
+        self._equatorial_h: HData | None = None
 
     def get_equatorial_h(self) -> HData:
-        """指定された観測点のh成分を、磁気赤道（gm_lat=0）の値に換算"""
+        """指定された観測点のh成分を、磁気赤道（gm_lat=0）の値に換算
+
+        Note:
+          計算結果は保持され、2回目以降はファイルを読み込まない
+        """
+        if self._equatorial_h is None:
+            self._equatorial_h = self._calc_equatorial_h()
+        return self._equatorial_h
+
+    def _calc_equatorial_h(self) -> HData:
         # TODO h componentはEE-indexだけで使用するわけではないので, stationの型はMagdasStation等にするのが適当。
         h_values = self.gm_repo.get("h")
         equatorial_h_component = h_values / np.cos(
@@ -2,7 +2,7 @@ import csv
 from datetime import datetime, timedelta
 
 import numpy as np
-from domain.station_params import Period
+from src.domain.station_params import Period
 from src.repository.ee_from_kato import KatoEeData, KatoEeRepository
 from src.service.calc_eej_detection import EejDetection
 
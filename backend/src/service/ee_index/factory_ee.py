@@ -1,20 +1,51 @@
+import threading
+from datetime import datetime
+from typing import List
+
+from src.domain.magdas_station import EeIndexStation
 from src.domain.station_params import Period, StationParam
 from src.service.ee_index.calc_edst import Edst
 from src.service.ee_index.calc_er import Er
+from src.service.ee_index.calc_er_batch import ErBatch
 from src.service.ee_index.calc_euel import Euel
 from src.service.ee_index.calc_h_component import HComponent
 
 
 class EeFactory:
+    """EE-indexの各種インスタンスを生成するクラス
+
+    Note:
+      H成分とEDstは(観測点, 期間)ごとにメモ化され、同じFactoryから生成された
+      ER/EDst/EUELの間で共有される。1リクエストにつき1つのFactoryを使うことで、
+      各観測点の日ごとのデータの読み込みは高々1回になる。
+    """
+
+    def __init__(self):
+        self._h_cache: dict[tuple[EeIndexStation, datetime, datetime], HComponent] = {}
+        self._edst_cache: dict[tuple[datetime, datetime], Edst] = {}
+        # EDstの計算では観測点ごとに別スレッドから呼ばれる
+        self._h_lock = threading.Lock()
+
     def create_h(self, ut_params: StationParam):
-        return HComponent(ut_params)
+        key = (ut_params.station, ut_params.period.start, ut_params.period.end)
+        with self._h_lock:
+            if key not in self._h_cache:
+                self._h_cache[key] = HComponent(ut_params)
+            return self._h_cache[key]
 
     def create_er(self, ut_params: StationParam):
         h = self.create_h(ut_params)
         return Er(h.get_equatorial_h())
 
+    def create_er_batch(self, ut_params_list: List[StationParam]) -> ErBatch:
+        """複数の観測点のERをまとめて計算する。各観測点の期間の長さは同じであること"""
+        return ErBatch([self.create_h(p).get_equatorial_h() for p in ut_params_list])
+
     def create_edst(self, ut_period: Period):
-        return Edst(ut_period)
+        key = (ut_period.start, ut_period.end)
+        if key not in self._edst_cache:
+            self._edst_cache[key] = Edst(ut_period, create_h=self.create_h)
+        return self._edst_cache[key]
 
     def create_euel(self, ut_params: StationParam):
         er = self.create_er(ut_params)
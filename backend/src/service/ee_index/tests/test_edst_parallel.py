@@ -0,0 +1,22 @@
+import unittest
+import warnings
+from datetime import datetime
+
+import numpy as np
+from src.domain.station_params import Period
+from src.service.ee_index.calc_edst import Edst
+
+
+class TestEdstParallel(unittest.TestCase):
+    def test_same_as_serial(self):
+        warnings.filterwarnings("ignore", category=RuntimeWarning)
+        period = Period(datetime(2014, 4, 1, 12, 0), datetime(2014, 4, 2, 11, 59))
+        serial = Edst(period, use_store=False, workers=1).calc_edst()
+        for workers in (2, 8):
+            parallel = Edst(period, use_store=False, workers=workers).calc_edst()
+            np.testing.assert_array_equal(parallel, serial)
+        self.assertEqual(serial.shape, (24 * 60,))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+from datetime import date, datetime
+from unittest.mock import patch
+
+import numpy as np
+from src.domain.magdas_station import EeIndexStation
+from src.domain.station_params import Period
+from src.repository.gm_data import find_min_files
+from src.repository.station_day_er_store import StationDayErRepository
+from src.service.ee_index.calc_edst import Edst
+from src.service.ee_index.calc_ee_daily import DailyEe
+
+
+class TestDailyEe(unittest.TestCase):
+    def setUp(self):
+        warnings.filterwarnings("ignore", category=RuntimeWarning)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = StationDayErRepository(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_one_day_edst_same_as_whole_period(self):
+        days = [date(2014, 4, 1), date(2014, 4, 2)]
+        edst = DailyEe(self.store, workers=1).calc_edst(days)
+        for i, day in enumerate(days):
+            period = Period(
+                datetime(day.year, day.month, day.day, 0, 0),
+                datetime(day.year, day.month, day.day, 23, 59),
+            )
+            expected = Edst(period, use_store=False, workers=1).calc_edst()
+            np.testing.assert_allclose(edst[i], expected, rtol=1e-6)
+
+    def copy_min_files(self, station_code: str, ut_date: date) -> list[str]:
+        """.mgdファイルを一時ディレクトリにコピーする。Storage/のファイルは変更しない"""
+        copy_dir = os.path.join(self.tmp.name, "magdas", station_code)
+        os.makedirs(copy_dir, exist_ok=True)
+        return [
+            shutil.copy2(filename, copy_dir)
+            for filename in find_min_files(station_code, ut_date)
+        ]
+
+    def test_recalculates_only_updated_days(self):
+        station = EeIndexStation.ANC
+        days = [date(2014, 4, 1), date(2014, 4, 2)]
+        copies = {day: self.copy_min_files(station.code, day) for day in days}
+        # fingerprintはコピーしたファイルの更新時刻から計算する
+        with patch(
+            "src.repository.station_day_er_store.find_min_files",
+            lambda station_code, ut_date: copies[ut_date],
+        ):
+            first = DailyEe(self.store, workers=1).calc_station_er(station, days)
+            _, fresh = self.store.get(station.code, days)
+            self.assertTrue(fresh.all())
+
+            filename = copies[days[1]][0]
+            stat = os.stat(filename)
+            os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+            _, fresh = self.store.get(station.code, days)
+            np.testing.assert_array_equal(fresh, [True, False])
+            second = DailyEe(self.store, workers=1).calc_station_er(station, days)
+            _, fresh = self.store.get(station.code, days)
+            self.assertTrue(fresh.all())
+        np.testing.assert_array_equal(second, first)
+
+
+if __name__ == "__main__":
+    unittest.main()
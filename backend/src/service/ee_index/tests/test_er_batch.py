@@ -0,0 +1,60 @@
+import unittest
+import warnings
+from datetime import datetime
+
+import numpy as np
+from src.domain.magdas_station import EeIndexStation
+from src.domain.station_params import Period, StationParam
+from src.service.calc_utils.nan_calculator import NanCalculator
+from src.service.ee_index.calc_er import Er
+from src.service.ee_index.calc_er_batch import ErBatch, calc_row_nanmedian
+from src.service.ee_index.calc_h_component import HData
+
+
+class TestErBatch(unittest.TestCase):
+    def setUp(self):
+        warnings.filterwarnings("ignore", category=RuntimeWarning)
+
+    def test_row_nanmedian_matches_nanmedian(self):
+        rng = np.random.default_rng(0)
+        for length in (1, 2, 5, 1440, 1441):
+            matrix = rng.normal(30000, 50, (6, length)).astype(np.float32)
+            matrix[rng.random(matrix.shape) < 0.3] = np.nan
+            matrix[0] = np.nan
+            expected = [NanCalculator.nanmedian(row) for row in matrix]
+            np.testing.assert_array_equal(calc_row_nanmedian(matrix), expected)
+
+    def test_same_as_er_per_station(self):
+        """期間(UT)の異なる観測点を含めて、観測点ごとのErと一致する"""
+        rng = np.random.default_rng(1)
+        stations = [EeIndexStation.ANC, EeIndexStation.EWA, EeIndexStation.DAV]
+        lt_period = Period(datetime(2014, 4, 1), datetime(2014, 4, 2, 23, 59))
+        h_data_list = []
+        for station in stations:
+            ut_params = StationParam(station, lt_period).to_ut_params()
+            h_values = rng.normal(30000, 100, 2 * 1440).astype(np.float32)
+            h_values[rng.random(len(h_values)) < 0.1] = np.nan
+            h_values[:5] += 1000  # 外れ値
+            h_data_list.append(HData(ut_params=ut_params, h_values=h_values))
+
+        batch = ErBatch(h_data_list)
+        for i, h_data in enumerate(h_data_list):
+            er = Er(h_data)
+            np.testing.assert_array_equal(batch.calc_er()[i], er.calc_er())
+            np.testing.assert_array_equal(
+                batch.nighttime_mask()[i], er.nighttime_mask()
+            )
+            np.testing.assert_array_equal(
+                batch.extract_night_er()[i], er.extract_night_er()
+            )
+
+    def test_different_lengths(self):
+        params = StationParam(
+            EeIndexStation.ANC, Period(datetime(2014, 4, 1), datetime(2014, 4, 1, 0, 1))
+        )
+        with self.assertRaises(ValueError):
+            ErBatch([HData(params, np.zeros(2)), HData(params, np.zeros(3))])
+
+
+if __name__ == "__main__":
+    unittest.main()
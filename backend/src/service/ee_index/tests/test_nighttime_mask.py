@@ -0,0 +1,38 @@
+import unittest
+from datetime import datetime, time, timedelta
+
+import numpy as np
+from src.constants.time_relation import DawnAndDusk, TimeRange
+from src.domain.magdas_station import EeIndexStation
+from src.service.ee_index.calc_er import calc_nighttime_mask
+
+
+class TestNighttimeMask(unittest.TestCase):
+    def test_contains_array_matches_contains(self):
+        minutes = np.arange(1440)
+        times = [time(m // 60, m % 60) for m in minutes]
+        ranges = [
+            DawnAndDusk.NIGHTSIDE,
+            DawnAndDusk.DAYSIDE,
+            TimeRange(time(9, 0), time(14, 59)),
+            TimeRange(time(23, 30, 30), time(0, 30)),
+        ]
+        for time_range in ranges:
+            expected = np.array([time_range.contains(t) for t in times])
+            np.testing.assert_array_equal(time_range.contains_array(minutes), expected)
+
+    def test_mask_matches_local_time(self):
+        start_ut = datetime(2014, 3, 31, 22, 13)
+        length = 3 * 1440 + 17
+        for station in [EeIndexStation.ANC, EeIndexStation.EWA, EeIndexStation.YAP]:
+            time_diff_min = int(station.time_diff * 60)
+            expected = np.array(
+                [
+                    DawnAndDusk.NIGHTSIDE.contains(
+                        (start_ut + timedelta(minutes=i + time_diff_min)).time()
+                    )
+                    for i in range(length)
+                ]
+            )
+            mask = calc_nighttime_mask(station.time_diff, start_ut, length)
+            np.testing.assert_array_equal(mask, expected)
@@ -1,7 +1,7 @@
-from typing import List
+from typing import Dict, List
 
 from src.domain.station_params import Period
-from src.model.eej_category import EejCategoryModel
+from src.model.eej_category import EejCategoryModel, EejEventCategory
 from src.repository.eej_event_category import EejCategoryRepository
 
 
@@ -18,3 +18,7 @@ class EejCategoryService:
                 f"No category found for type {eej_type} in period {period}."
             )
         return categories
+
+    def count_by_period(self, period: Period) -> Dict[EejEventCategory, int]:
+        """期間の各分類の日数"""
+        return self.repository.count_by_category(period)
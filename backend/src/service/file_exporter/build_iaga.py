@@ -1,29 +1,28 @@
 import io
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List
+from typing import Iterator, Sequence
 
+import numpy as np
 from src.constants.time_relation import TimeUnit
 from src.domain.magdas_station import EeIndexStation
 
-
-@dataclass
-class EeIndexIagaRecord:
-    date: str
-    time: str
-    doy: int
-    edst_1h: float
-    edst_6h: float
-    er: float
-    euel: float
+# 1日分(1440行)のデータ部分のテンプレート。YYYY-MM-DD と DOY を日ごとに置き換え、
+# 4つの値を % でまとめて埋め込む。各列は以前の f"{value:<10.2f}" と同じ幅
+_VALUE_FORMAT = "%-10.2f" * 4
+_DAY_TEMPLATE = "".join(
+    f"{'YYYY-MM-DD':<11}{f'{m // 60:02d}:{m % 60:02d}:00.000':<13}{'DOY':<7}"
+    f"{_VALUE_FORMAT}\n"
+    for m in range(TimeUnit.ONE_DAY.min)
+)
 
 
 @dataclass
 class IagaValues:
-    edst_1h: List[float]
-    edst_6h: List[float]
-    er: List[float]
-    euel: List[float]
+    edst_1h: Sequence[float]
+    edst_6h: Sequence[float]
+    er: Sequence[float]
+    euel: Sequence[float]
 
 
 class EeIndexIagaService:
@@ -35,9 +34,29 @@ class EeIndexIagaService:
         end_ut: datetime,
         iaga_values: IagaValues,
     ) -> bytes:
+        return b"".join(self.iter_iaga_file(station, start_ut, end_ut, iaga_values))
+
+    def iter_iaga_file(
+        self,
+        station: EeIndexStation,
+        start_ut: datetime,
+        end_ut: datetime,
+        iaga_values: IagaValues,
+    ) -> Iterator[bytes]:
+        """build_iaga_fileと同じ内容をheader、1日分のデータの順に少しずつ返す
+
+        連結するとbuild_iaga_fileの結果と一致する。全期間の文字列を保持しないため、
+        ストリーミングで書き出す場合のメモリ使用量は1日分で済む
+        """
         meta = self._build_iaga_meta_data(station, "EEI", 8888.88)
-        records = self._build_iaga_records(start_ut, end_ut, iaga_values)
-        return self._build_iaga_content(meta, records)
+        yield self._build_iaga_header(meta).encode("utf-8")
+        minutes = TimeUnit.ONE_DAY.min
+        days = (end_ut - start_ut).days + 1
+        values = self._stack_values(iaga_values, days * minutes)
+        for day in range(days):
+            base_date = start_ut + timedelta(days=day)
+            day_values = values[day * minutes : (day + 1) * minutes]
+            yield self._build_iaga_rows(base_date, day_values).encode("utf-8")
 
     def _build_iaga_meta_data(
         self, station: EeIndexStation, iaga_code, elevation
@@ -57,41 +76,7 @@ class EeIndexIagaService:
             "Data Type": "Provisional EE-index:230202",
         }
 
-    def _build_iaga_records(
-        self, start_ut: datetime, end_ut: datetime, iaga_values: IagaValues
-    ) -> List[EeIndexIagaRecord]:
-        minutes = TimeUnit.ONE_DAY.min
-        days = (end_ut - start_ut).days + 1
-
-        records: List[EeIndexIagaRecord] = []
-        idx = 0
-
-        for day in range(days):
-            base_date = start_ut + timedelta(days=day)
-            doy = base_date.timetuple().tm_yday
-
-            for m in range(minutes):
-                hour = m // 60
-                minute = m % 60
-
-                time_str = f"{hour:02d}:{minute:02d}:00.000"
-                date_str = base_date.strftime("%Y-%m-%d")
-
-                records.append(
-                    EeIndexIagaRecord(
-                        date=date_str,
-                        time=time_str,
-                        doy=doy,
-                        edst_1h=iaga_values.edst_1h[idx],
-                        edst_6h=iaga_values.edst_6h[idx],
-                        er=iaga_values.er[idx],
-                        euel=iaga_values.euel[idx],
-                    )
-                )
-                idx += 1
-        return records
-
-    def _build_iaga_content(self, meta, records: List[EeIndexIagaRecord]) -> bytes:
+    def _build_iaga_header(self, meta) -> str:
         buf = io.StringIO()
         for k, v in meta.items():
             buf.write(f"{k:<25} {v:<40}\n")
@@ -99,9 +84,29 @@ class EeIndexIagaService:
             f"{'DATE':<11}{'TIME':<13}{'DOY':<7}"
             f"{'EDst1h':<10}{'EDst6h':<10}{'ER':<10}{'EUEL':<10}\n"
         )
-        for r in records:
-            buf.write(
-                f"{r.date:<11}{r.time:<13}{str(r.doy).zfill(3):<7}"
-                f"{r.edst_1h:<10.2f}{r.edst_6h:<10.2f}{r.er:<10.2f}{r.euel:<10.2f}\n"
-            )
-        return buf.getvalue().encode("utf-8")
+        return buf.getvalue()
+
+    def _stack_values(self, iaga_values: IagaValues, length: int) -> np.ndarray:
+        """EDst1h, EDst6h, ER, EUELを列とする (length, 4) の配列"""
+        columns = (
+            iaga_values.edst_1h,
+            iaga_values.edst_6h,
+            iaga_values.er,
+            iaga_values.euel,
+        )
+        if any(len(column) < length for column in columns):
+            raise ValueError(f"iaga_values must have at least {length} elements.")
+        return np.column_stack(
+            [np.asarray(column[:length], dtype=np.float64) for column in columns]
+        )
+
+    def _build_iaga_rows(self, base_date: datetime, day_values: np.ndarray) -> str:
+        """1日分のデータ行
+
+        Args:
+          base_date: その日の日付
+          day_values: (1440, 4) の EDst1h, EDst6h, ER, EUEL
+        """
+        doy = str(base_date.timetuple().tm_yday).zfill(3)
+        template = _DAY_TEMPLATE.replace("YYYY-MM-DD", base_date.strftime("%Y-%m-%d"))
+        return template.replace("DOY", doy) % tuple(day_values.ravel().tolist())
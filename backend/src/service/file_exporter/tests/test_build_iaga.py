@@ -0,0 +1,71 @@
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+from src.domain.magdas_station import EeIndexStation
+from src.service.file_exporter.build_iaga import EeIndexIagaService, IagaValues
+
+
+def legacy_rows(start_ut: datetime, days: int, values: IagaValues) -> str:
+    """1行ずつf-stringで整形していた旧実装のデータ行"""
+    rows = []
+    idx = 0
+    for day in range(days):
+        base_date = start_ut + timedelta(days=day)
+        doy = base_date.timetuple().tm_yday
+        for m in range(1440):
+            rows.append(
+                f"{base_date.strftime('%Y-%m-%d'):<11}"
+                f"{f'{m // 60:02d}:{m % 60:02d}:00.000':<13}{str(doy).zfill(3):<7}"
+                f"{values.edst_1h[idx]:<10.2f}{values.edst_6h[idx]:<10.2f}"
+                f"{values.er[idx]:<10.2f}{values.euel[idx]:<10.2f}\n"
+            )
+            idx += 1
+    return "".join(rows)
+
+
+class TestEeIndexIagaService(unittest.TestCase):
+    def test_same_as_legacy_format(self):
+        start_ut = datetime(2015, 12, 30)
+        days = 3
+        rng = np.random.default_rng(0)
+        arrays = [rng.normal(0, 300, days * 1440) for _ in range(4)]
+        arrays[0][:100] = np.nan
+        arrays[1][5] = -0.001
+        arrays[2][6] = 12345.678
+        arrays[3][7] = np.inf
+        values = IagaValues(
+            edst_1h=arrays[0].tolist(),
+            edst_6h=arrays[1].astype(np.float32).tolist(),
+            er=arrays[2].tolist(),
+            euel=arrays[3].tolist(),
+        )
+        end_ut = start_ut + timedelta(days=days - 1, hours=23, minutes=59)
+
+        service = EeIndexIagaService()
+        content = service.build_iaga_file(
+            EeIndexStation.ANC, start_ut, end_ut, values
+        ).decode("utf-8")
+        header_end = content.index("\n", content.index("DATE")) + 1
+
+        self.assertEqual(content[header_end:], legacy_rows(start_ut, days, values))
+        self.assertEqual(
+            b"".join(
+                service.iter_iaga_file(EeIndexStation.ANC, start_ut, end_ut, values)
+            ).decode("utf-8"),
+            content,
+        )
+
+    def test_too_short_values(self):
+        values = IagaValues(edst_1h=[0.0], edst_6h=[0.0], er=[0.0], euel=[0.0])
+        with self.assertRaises(ValueError):
+            EeIndexIagaService().build_iaga_file(
+                EeIndexStation.ANC,
+                datetime(2015, 1, 1),
+                datetime(2015, 1, 1, 23, 59),
+                values,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
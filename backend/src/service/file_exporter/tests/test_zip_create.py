@@ -0,0 +1,29 @@
+import io
+import unittest
+from zipfile import ZipFile
+
+from src.model.file import FileModel
+from src.service.file_exporter.zip_create import ZipService
+
+
+class TestZipServiceStream(unittest.TestCase):
+    def test_stream_is_readable_zip(self):
+        chunks = [f"{i:04d}\n".encode("utf-8") * 1000 for i in range(10)]
+        streamed = list(ZipService().stream("a.iaga", iter(chunks)))
+
+        self.assertGreater(len(streamed), 1)
+        with ZipFile(io.BytesIO(b"".join(streamed))) as zipf:
+            self.assertIsNone(zipf.testzip())
+            self.assertEqual(zipf.namelist(), ["a.iaga"])
+            self.assertEqual(zipf.read("a.iaga"), b"".join(chunks))
+
+    def test_same_content_as_create(self):
+        content = b"DATE       TIME\n" * 100
+        created = ZipService().create([FileModel(filename="a.iaga", content=content)])
+        streamed = b"".join(ZipService().stream("a.iaga", [content]))
+        with ZipFile(created) as expected, ZipFile(io.BytesIO(streamed)) as actual:
+            self.assertEqual(actual.read("a.iaga"), expected.read("a.iaga"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,35 @@
 import base64
-from io import BytesIO
-from typing import List
-from zipfile import ZipFile
+import time
+from io import BytesIO, RawIOBase
+from typing import Iterable, Iterator, List
+from zipfile import ZipFile, ZipInfo
 
 from src.model.file import FileModel
 
 
+class _ZipStreamBuffer(RawIOBase):
+    """ZipFileの書き込み先。書き込まれたbyte列をpopで取り出すまで保持する
+
+    seekできないため、ZipFileは各ファイルのサイズ・CRCをデータの後ろ
+    (data descriptor)に書き込む
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def pop(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
 class ZipService:
     def create(self, files: List[FileModel]) -> BytesIO:
         zip_buffer = BytesIO()
@@ -18,3 +42,22 @@ class ZipService:
     def create_base64(self, files: List[FileModel]) -> str:
         zip_bytes = self.create(files).getvalue()
         return base64.b64encode(zip_bytes).decode("utf-8")
+
+    def stream(self, filename: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """1ファイルのzipを、内容のchunkを受け取るごとに少しずつ返す
+
+        Args:
+          filename: zip内のファイル名
+          chunks: ファイルの内容。先頭から順に渡す
+        """
+        buffer = _ZipStreamBuffer()
+        with ZipFile(buffer, "w") as zipf:
+            # writestrと同様に作成時刻を記録する
+            zinfo = ZipInfo(filename, date_time=time.localtime()[:6])
+            with zipf.open(zinfo, "w") as file:
+                for chunk in chunks:
+                    file.write(chunk)
+                    data = buffer.pop()
+                    if data:
+                        yield data
+        yield buffer.pop()
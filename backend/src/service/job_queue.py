@@ -0,0 +1,111 @@
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Callable
+
+from src.constants.job import JOB_TTL_SEC, JOB_WORKERS
+from src.repository.job_store import JobState, JobStatus, JobStoreRepository
+
+# (出力先ディレクトリ, 進捗の通知先, **params) -> 成果物のファイル名
+# プロセスプールで実行するため、モジュールのトップレベルに定義した関数である必要がある
+JobRunner = Callable[..., str]
+
+
+def _run_job(runner: JobRunner, root: str, job_id: str, params: dict[str, Any]) -> None:
+    """ワーカープロセスで実行される処理。状態はJobStoreRepositoryを介して共有する"""
+    job_store = JobStoreRepository(root)
+    status = job_store.get(job_id)
+    # 待機中に更新が無いまま失敗とされた・削除されたジョブは実行しない
+    if status is None or status.state != JobState.PENDING:
+        return
+    job_store.update(job_id, state=JobState.RUNNING)
+
+    def on_progress(done: int, total: int) -> None:
+        job_store.update(job_id, progress=done, total=total)
+
+    try:
+        artifact = runner(job_store.job_dir(job_id), on_progress, **params)
+    except Exception as e:
+        job_store.update(
+            job_id, state=JobState.FAILED, error=f"{type(e).__name__}: {e}"
+        )
+        return
+    job_store.update(job_id, state=JobState.DONE, artifact=artifact)
+
+
+class JobQueue:
+    """時間のかかる処理をプロセスプールで実行するジョブキュー
+
+    - 同時に実行するジョブの数はワーカー数(JOB_WORKERS)までで、残りは待機する
+    - 同じrunner・paramsのジョブが待機中・実行中の場合は新たに登録せず、そのジョブを返す。
+      ジョブはJobStoreRepositoryからkeyで探すため、別のプロセスが登録したジョブも対象になる。
+      ただし複数のプロセスで同時に登録された場合は重複することがある
+    - ジョブには登録したプロセスを記録し、そのプロセスが終了した待機中・実行中のジョブ
+      (再起動前・異常終了したワーカーのもの)は、起動時と登録・取得時に失敗とする
+    - 完了・失敗したジョブは登録のたびに確認し、JOB_TTL_SECを過ぎたものを削除する。
+      JOB_TTL_SEC以上更新の無い待機中・実行中のジョブも失敗とする
+    """
+
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        job_store: JobStoreRepository | None = None,
+        ttl_sec: float = JOB_TTL_SEC,
+    ):
+        self._executor = executor
+        self.job_store = job_store or JobStoreRepository()
+        self.ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=JOB_WORKERS)
+        return self._executor
+
+    @staticmethod
+    def job_key(runner: JobRunner, params: dict[str, Any]) -> str:
+        args = ",".join(f"{k}={params[k]!r}" for k in sorted(params))
+        return f"{runner.__module__}.{runner.__qualname__}({args})"
+
+    def submit(self, runner: JobRunner, **params) -> JobStatus:
+        self.job_store.purge_expired(self.ttl_sec)
+        key = self.job_key(runner, params)
+        with self._lock:
+            job = self.job_store.find_active(key)
+            if job is not None:
+                return job
+
+            job = self.job_store.create(key)
+            future = self._get_executor().submit(
+                _run_job, runner, self.job_store.root, job.job_id, params
+            )
+        future.add_done_callback(lambda f: self._on_done(job.job_id, f))
+        return job
+
+    def get(self, job_id: str) -> JobStatus | None:
+        status = self.job_store.get(job_id)
+        if status is not None and self.job_store.fail_orphaned(status):
+            status = self.job_store.get(job_id)
+        return status
+
+    def _on_done(self, job_id: str, future: Future) -> None:
+        # ワーカープロセスの異常終了など、_run_job内で記録できなかった失敗
+        error = future.exception()
+        if error is not None:
+            self.job_store.update(job_id, state=JobState.FAILED, error=repr(error))
+
+
+_job_queue: JobQueue | None = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """アプリケーション全体で共有するジョブキュー"""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue()
+            # 前回の起動時・終了したワーカーの待機中・実行中のジョブを失敗とし、
+            # 期限切れのジョブを削除する
+            _job_queue.job_store.fail_all_orphaned()
+            _job_queue.job_store.purge_expired(_job_queue.ttl_sec)
+        return _job_queue
@@ -1,19 +1,115 @@
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Iterable
+
+import numpy as np
 import pandas as pd
 from src.domain.station_params import Period
+from src.repository.csv_snapshot import load_csv_columns
+from src.repository.sqlite_storage import SqliteStorage, get_sqlite_storage
 from src.utils.path import generate_parent_abs_path
 
 
+def read_kp_csv(path: str) -> pd.DataFrame:
+    return pd.read_csv(path, parse_dates=["DATETIME_UT"], float_precision="round_trip")
+
+
+@dataclass(frozen=True)
+class KpIndex:
+    """時刻順に並べたKP指数と、UT日ごとの最大値
+
+    Attributes:
+      times: (件数,) datetime64[ns] の時刻(UT)
+      values: (件数,) KP指数
+      days: (日数,) datetime64[D] のデータのあるUT日付
+      day_max: (日数,) UT日ごとのKP指数の最大値
+    """
+
+    times: np.ndarray
+    values: np.ndarray
+    days: np.ndarray
+    day_max: np.ndarray
+
+    @classmethod
+    def from_arrays(cls, times: np.ndarray, values: np.ndarray) -> "KpIndex":
+        order = np.argsort(times, kind="stable")
+        times = np.asarray(times, dtype="datetime64[ns]")[order]
+        values = np.asarray(values, dtype=float)[order]
+        days, starts = np.unique(times.astype("datetime64[D]"), return_index=True)
+        # fmaxはNaNを無視する (pandasのmaxと同じ)
+        day_max = np.fmax.reduceat(values, starts) if len(values) else values
+        for array in (times, values, days, day_max):
+            array.flags.writeable = False
+        return cls(times=times, values=values, days=days, day_max=day_max)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "KpIndex":
+        columns = load_csv_columns(path, read_kp_csv)
+        return cls.from_arrays(columns["DATETIME_UT"], columns["kp"])
+
+    @classmethod
+    def from_sqlite(cls, storage: SqliteStorage) -> "KpIndex":
+        times, values = storage.select_kp()
+        return cls.from_arrays(
+            np.array(times, dtype="datetime64[ns]"), np.array(values, dtype=float)
+        )
+
+    def max_between(self, start: datetime, end: datetime) -> float:
+        """start以上end以下の時刻のKP指数の最大値。該当するデータが無い場合はNaN"""
+        lo = np.searchsorted(self.times, np.datetime64(start, "ns"), side="left")
+        hi = np.searchsorted(self.times, np.datetime64(end, "ns"), side="right")
+        values = self.values[lo:hi]
+        if not np.any(~np.isnan(values)):
+            return np.nan
+        return float(np.nanmax(values))
+
+    def max_of_days(self, dates: Iterable[date]) -> np.ndarray:
+        """UT日付ごとのKP指数の最大値。データの無い日はNaN"""
+        days = np.asarray(list(dates), dtype="datetime64[D]")
+        idx = np.searchsorted(self.days, days)
+        found = idx < len(self.days)
+        found[found] = self.days[idx[found]] == days[found]
+        result = np.full(len(days), np.nan)
+        result[found] = self.day_max[idx[found]]
+        return result
+
+
+_kp_index: KpIndex | None = None
+_kp_index_lock = threading.Lock()
+
+
+def get_kp_index() -> KpIndex:
+    """プロセス全体で共有するKP指数。初回の呼び出し時に1回だけ読み込む
+
+    MAGDAS_STORAGE_BACKENDがsqliteの場合はSQLiteのkpテーブルから読み込む
+    """
+    global _kp_index
+    if _kp_index is None:
+        with _kp_index_lock:
+            if _kp_index is None:
+                storage = get_sqlite_storage()
+                if storage is not None:
+                    _kp_index = KpIndex.from_sqlite(storage)
+                else:
+                    path = generate_parent_abs_path("/Storage/kpdata.csv")
+                    _kp_index = KpIndex.from_csv(path)
+    return _kp_index
+
+
 class Kp:
-    """2000~2022年のKP指数を取得するクラス"""
+    """2000~2022年のKP指数を取得するクラス
+
+    Note:
+      データはget_kp_indexで共有されるため、インスタンスの生成ではファイルを読み込まない
+    """
 
-    def __init__(self):
-        path = generate_parent_abs_path("/Storage/kpdata.csv")
-        self.df = pd.read_csv(path, parse_dates=["DATETIME_UT"])
+    def __init__(self, index: KpIndex | None = None):
+        self.index = index or get_kp_index()
 
     def get_max_of_day(self, ut_period: Period) -> float:
+        return self.index.max_between(ut_period.start, ut_period.end)
 
-        df_filterd = self.df[
-            (self.df["DATETIME_UT"] >= ut_period.start)
-            & (self.df["DATETIME_UT"] <= ut_period.end)
-        ]
-        return df_filterd["kp"].max()
+    def max_of_days(self, ut_dates: Iterable[date]) -> np.ndarray:
+        """(日付の数,) UT日付ごとのKP指数の最大値。データの無い日はNaN"""
+        return self.index.max_of_days(ut_dates)
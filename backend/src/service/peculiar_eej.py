@@ -1,3 +1,4 @@
+from datetime import date
 from typing import List
 
 from src.domain.region import Region
@@ -13,6 +14,9 @@ class PeculiarEejService:
     def get_by_region(self, region: Region):
         return self.repo.select(region=region)
 
+    def get_dates_by_region(self, region: Region) -> List[date]:
+        return self.repo.select_dates(region=region)
+
     def get_by_region_and_type(self, region: Region, peculiar_eej_type: str):
         return self.repo.select(region=region, type_=peculiar_eej_type)
 
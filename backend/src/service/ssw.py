@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import TypedDict
 
 import pandas as pd
+from src.repository.csv_snapshot import load_csv_frame
 from src.utils.path import generate_parent_abs_path
 
 
@@ -14,11 +15,16 @@ class SswRow(TypedDict):
     U_60N_m_s: float
 
 
+def read_ssw_csv(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path, parse_dates=["Date"], float_precision="round_trip")
+    df["Date"] = pd.to_datetime(df["Date"], format="mixed")
+    return df
+
+
 class Ssw:
     def __init__(self):
         path = generate_parent_abs_path("/Storage/ssw.csv")
-        self.df = pd.read_csv(path, parse_dates=["Date"])
-        self.df["Date"] = pd.to_datetime(self.df["Date"], format="mixed")
+        self.df = load_csv_frame(path, read_ssw_csv)
 
     def get_ssw_by_range(self, start_dt: datetime, end_dt: datetime) -> pd.DataFrame:
         if start_dt > end_dt:
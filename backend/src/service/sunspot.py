@@ -1,14 +1,20 @@
 from datetime import datetime
 
 import pandas as pd
+from src.repository.csv_snapshot import load_csv_frame
 from src.utils.path import generate_parent_abs_path
 
 
+def read_sunspot_csv(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path, parse_dates=["Date"], float_precision="round_trip")
+    df["Date"] = pd.to_datetime(df["Date"], format="mixed")
+    return df
+
+
 class Sunspot:
     def __init__(self):
         path = generate_parent_abs_path("/Storage/sunspot.csv")
-        self.df = pd.read_csv(path, parse_dates=["Date"])
-        self.df["Date"] = pd.to_datetime(self.df["Date"], format="mixed")
+        self.df = load_csv_frame(path, read_sunspot_csv)
 
     def get_sunspot_by_range(
         self, start_dt: datetime, end_dt: datetime
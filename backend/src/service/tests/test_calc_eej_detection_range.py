@@ -0,0 +1,104 @@
+import tempfile
+import unittest
+import warnings
+from collections import Counter
+from datetime import date
+from unittest.mock import patch
+
+import numpy as np
+from src.domain.magdas_station import EeIndexStation
+from src.domain.region import Region
+from src.repository.edst_store import EdstStoreRepository
+from src.service.calc_eej_detection import (
+    BestEuelSelectorForEej,
+    EejDetection,
+    calc_euel_peak_diff,
+)
+from src.service.calc_eej_detection_range import (
+    EejDetectionRange,
+    EuelForEejRange,
+    lt_day_offset,
+)
+from src.service.ee_index.calc_edst import Edst, backfill_edst_store
+from src.service.ee_index.calc_h_component import HComponent
+
+# EDstを保存済みの日
+STORED_DATE = date(2014, 4, 3)
+
+
+class TestEejDetectionRange(unittest.TestCase):
+    def setUp(self):
+        # 欠損値を含む計算のRuntimeWarningを、このテストの間だけ無視する
+        catcher = warnings.catch_warnings()
+        catcher.__enter__()
+        self.addCleanup(catcher.__exit__, None, None, None)
+        warnings.simplefilter("ignore", RuntimeWarning)
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        # Storage/edstの代わりに一時ディレクトリに保存する
+        patcher = patch(
+            "src.service.ee_index.calc_edst.EdstStoreRepository",
+            lambda: EdstStoreRepository(tmp.name),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_same_as_daily_detection(self):
+        region = Region.SOUTH_AMERICA
+        dip = [EeIndexStation.ANC, EeIndexStation.HUA]
+        offdip = [EeIndexStation.EUS]
+        # チャンクの境界をまたぐ期間
+        detection = EejDetectionRange(
+            region, dip, offdip, date(2014, 4, 1), date(2014, 4, 3), chunk_days=2
+        ).detect()
+        categories = detection.categories()
+        # 保存済みの日のEDstの最小値も、期間でまとめて計算した値と同じ
+        self.assertEqual(backfill_edst_store(STORED_DATE, STORED_DATE), 1)
+
+        for i, lt_date in enumerate(detection.dates):
+            dip_euel = BestEuelSelectorForEej(
+                region, dip, lt_date, True
+            ).select_euel_data()
+            offdip_euel = BestEuelSelectorForEej(
+                region, offdip, lt_date, False
+            ).select_euel_data()
+            self.assertEqual(detection.dip.stations[i], dip_euel.station)
+            self.assertEqual(detection.offdip.stations[i], offdip_euel.station)
+            np.testing.assert_array_equal(detection.dip.euel[i], dip_euel.array)
+            np.testing.assert_array_equal(detection.offdip.euel[i], offdip_euel.array)
+
+            peak_diff = calc_euel_peak_diff(dip_euel, offdip_euel, lt_date)
+            np.testing.assert_array_equal(detection.peak_diff[i], peak_diff)
+            eej_detection = EejDetection(peak_diff, lt_date)
+            if lt_date == STORED_DATE:
+                with patch.object(Edst, "_calc_edst", side_effect=AssertionError):
+                    daily_min_edst = eej_detection._calc_daily_min_edst()
+            else:
+                daily_min_edst = eej_detection._calc_daily_min_edst()
+            np.testing.assert_array_equal(detection.daily_min_edst[i], daily_min_edst)
+            self.assertEqual(categories[i], eej_detection.classify_eej_category())
+
+    def test_load_h_once_per_chunk(self):
+        """LTの1日の開始時刻が異なる観測点とUTのEDstがあっても、H成分は1チャンクで1回だけ読み込む"""
+        stations = [EeIndexStation.ANC, EeIndexStation.EUS]
+        self.assertNotEqual(*map(lt_day_offset, stations))
+        loaded = Counter()
+
+        def count_h(ut_params):
+            loaded[ut_params.station] += 1
+            return HComponent(ut_params)
+
+        with patch("src.service.calc_eej_detection_range.HComponent", count_h):
+            chunks = list(
+                EuelForEejRange(
+                    stations, date(2014, 4, 1), date(2014, 4, 3), chunk_days=2
+                ).iter_chunks()
+            )
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(set(loaded.values()), {len(chunks)})
+        self.assertEqual(len(loaded), len(EeIndexStation))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+from src.service.calc_eej_detection import calc_euel_for_eej_days
+from src.service.calc_utils.linear_completion import interpolate_nan
+from src.service.calc_utils.moving_avg import calc_moving_avg
+
+
+def euel_for_eej_by_day(daily_euel: np.ndarray) -> np.ndarray:
+    """1日ずつnp.interpとpandasのrollingで計算した場合"""
+    night = np.concatenate((daily_euel[:300], np.full(840, np.nan), daily_euel[1140:]))
+    if np.all(np.isnan(night)):
+        return daily_euel
+    baseline = interpolate_nan(night)
+    return calc_moving_avg(daily_euel - baseline, window=60, nan_threshold=30)
+
+
+class TestCalcEuelForEejDays(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.euel_days = rng.normal(0, 50, (6, 1440))
+        self.euel_days[1, rng.random(1440) < 0.3] = np.nan
+        self.euel_days[2, :300] = np.nan
+        self.euel_days[3, 1140:] = np.nan
+        self.euel_days[4, :] = np.nan
+        self.euel_days[5, :300] = np.nan
+        self.euel_days[5, 1140:] = np.nan  # 夜間のデータが無い日
+
+    def test_same_as_daily_calculation(self):
+        result = calc_euel_for_eej_days(self.euel_days)
+        for i, daily_euel in enumerate(self.euel_days):
+            np.testing.assert_allclose(
+                result[i], euel_for_eej_by_day(daily_euel.copy()), rtol=1e-9, atol=1e-9
+            )
+
+    def test_does_not_mutate_input(self):
+        before = self.euel_days.copy()
+        calc_euel_for_eej_days(self.euel_days)
+        np.testing.assert_array_equal(self.euel_days, before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,23 @@
+import unittest
+
+import numpy as np
+from src.service.calc_minute_from_sec import calc_minute_mean
+
+
+class TestCalcMinuteMean(unittest.TestCase):
+    def test_minute_mean_and_valid_count(self):
+        sec_data = np.full((86400, 4), 30000.0, dtype=np.float32)
+        sec_data[:60, 0] = np.arange(60) + 30000  # 1分目のhは30000~30059
+        sec_data[60:90, 1] = 99999.0  # 2分目のdは半分が範囲外
+        sec_data[120:180, 2] = 0.0  # 3分目のzは全て範囲外
+
+        mean, valid_count = calc_minute_mean(sec_data)
+
+        self.assertEqual(mean.shape, (1440, 4))
+        self.assertAlmostEqual(mean[0, 0], 30029.5, places=3)
+        self.assertEqual(valid_count[0, 0], 60)
+        self.assertEqual(mean[1, 1], 30000.0)
+        self.assertEqual(valid_count[1, 1], 30)
+        self.assertTrue(np.isnan(mean[2, 2]))
+        self.assertEqual(valid_count[2, 2], 0)
+        self.assertTrue(np.all(valid_count[3:] == 60))
@@ -0,0 +1,167 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.repository.job_store import JobState, JobStoreRepository, current_owner
+from src.service.job_queue import JobQueue
+
+release = threading.Event()
+
+
+def write_text(output_dir, on_progress, text):
+    release.wait(timeout=5)
+    on_progress(1, 1)
+    with open(os.path.join(output_dir, "out.txt"), "w") as f:
+        f.write(text)
+    return "out.txt"
+
+
+def fail(output_dir, on_progress):
+    raise ValueError("broken")
+
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        release.clear()
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.job_store = JobStoreRepository(tmp_dir.name)
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        self.queue = JobQueue(executor=executor, job_store=self.job_store)
+
+    def wait(self, job_id):
+        for _ in range(100):
+            job = self.queue.get(job_id)
+            if job.state in (JobState.DONE, JobState.FAILED):
+                return job
+            time.sleep(0.05)
+        self.fail("job did not finish")
+
+    def test_deduplicate_in_flight_jobs(self):
+        first = self.queue.submit(write_text, text="a")
+        second = self.queue.submit(write_text, text="a")
+        other = self.queue.submit(write_text, text="b")
+        self.assertEqual(first.job_id, second.job_id)
+        self.assertNotEqual(first.job_id, other.job_id)
+
+        release.set()
+        job = self.wait(first.job_id)
+        self.assertEqual(job.state, JobState.DONE)
+        self.assertEqual((job.progress, job.total), (1, 1))
+        with open(self.job_store.artifact_path(job.job_id, job.artifact)) as f:
+            self.assertEqual(f.read(), "a")
+        self.wait(other.job_id)
+        # 完了後は新しいジョブとして登録される
+        self.assertNotEqual(self.queue.submit(write_text, text="a").job_id, job.job_id)
+
+    def test_failed_job(self):
+        job = self.wait(self.queue.submit(fail).job_id)
+        self.assertEqual(job.state, JobState.FAILED)
+        self.assertEqual(job.error, "ValueError: broken")
+
+    def test_purge_expired(self):
+        release.set()
+        job = self.wait(self.queue.submit(write_text, text="a").job_id)
+        self.assertEqual(self.job_store.purge_expired(ttl_sec=60), [])
+
+        job.updated_at = time.time() - 120
+        self.job_store._write(job)
+        self.assertEqual(self.job_store.purge_expired(ttl_sec=60), [job.job_id])
+        self.assertIsNone(self.queue.get(job.job_id))
+
+    def test_stale_jobs_are_failed_then_purged(self):
+        """実行していたプロセスが終了し、更新されないまま残った待機中・実行中のジョブ"""
+        pending = self.job_store.create(key="dead-pending")
+        running = self.job_store.update(
+            self.job_store.create(key="dead-running").job_id, state=JobState.RUNNING
+        )
+        for job in (pending, running):
+            job.updated_at = time.time() - 120
+            self.job_store._write(job)
+
+        self.assertEqual(self.job_store.purge_expired(ttl_sec=60), [])
+        for job in (pending, running):
+            stale = self.queue.get(job.job_id)
+            self.assertEqual(stale.state, JobState.FAILED)
+            self.assertIn("No update", stale.error)
+            stale.updated_at = time.time() - 120
+            self.job_store._write(stale)
+        self.assertCountEqual(
+            self.job_store.purge_expired(ttl_sec=60), [pending.job_id, running.job_id]
+        )
+
+    def test_deduplicate_jobs_of_other_process(self):
+        """別のプロセスが登録した実行中のジョブも同じkeyであれば再利用する"""
+        params = {"text": "a"}
+        key = JobQueue.job_key(write_text, params)
+        running = self.job_store.update(
+            self.job_store.create(key=key).job_id, state=JobState.RUNNING
+        )
+        self.assertEqual(self.queue.submit(write_text, **params).job_id, running.job_id)
+
+        # 更新の無いまま期限を過ぎたジョブは再利用せず、新たに登録する
+        queue = JobQueue(
+            executor=self.queue._executor, job_store=self.job_store, ttl_sec=0
+        )
+        time.sleep(0.01)
+        release.set()
+        job = queue.submit(write_text, **params)
+        self.assertNotEqual(job.job_id, running.job_id)
+        self.assertEqual(self.wait(job.job_id).state, JobState.DONE)
+
+    def test_job_of_dead_process_is_not_reused(self):
+        """再起動前・異常終了したプロセスが実行中のまま残したジョブは失敗とし、新たに登録する"""
+        params = {"text": "a"}
+        key = JobQueue.job_key(write_text, params)
+        exited = subprocess.run(
+            [sys.executable, "-c", "import os; print(os.getpid())"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        dead_owners = [
+            # 終了したプロセス
+            f"{socket.gethostname()}:{int(exited.stdout)}:boot",
+            # 再起動後に同じpidが割り当てられたプロセス
+            current_owner().rsplit(":", 1)[0] + ":previous-boot",
+            # 所有者を記録する前の形式
+            "",
+        ]
+        for owner in dead_owners:
+            with self.subTest(owner=owner):
+                dead = self.job_store.update(
+                    self.job_store.create(key=key).job_id,
+                    state=JobState.RUNNING,
+                    owner=owner,
+                )
+                job = self.queue.submit(write_text, **params)
+                self.assertNotEqual(job.job_id, dead.job_id)
+                stopped = self.queue.get(dead.job_id)
+                self.assertEqual(stopped.state, JobState.FAILED)
+                self.assertIn("stopped", stopped.error)
+                # 同じkeyの新しいジョブは動作中のプロセスのもののため再利用する
+                self.assertEqual(
+                    self.queue.submit(write_text, **params).job_id, job.job_id
+                )
+                release.set()
+                self.assertEqual(self.wait(job.job_id).state, JobState.DONE)
+                release.clear()
+
+    def test_fail_all_orphaned_on_startup(self):
+        orphaned = self.job_store.update(
+            self.job_store.create(key="a").job_id, owner=""
+        )
+        alive = self.job_store.create(key="b")
+        self.assertEqual(self.job_store.fail_all_orphaned(), [orphaned.job_id])
+        self.assertEqual(self.job_store.get(alive.job_id).state, JobState.PENDING)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import numpy as np
+from src.domain.station_params import Period
+from src.service.kp import Kp, KpIndex, get_kp_index
+
+
+class TestKpIndex(unittest.TestCase):
+    def setUp(self):
+        times = np.array(
+            [
+                "2000-01-02T03:00",
+                "2000-01-01T00:00",
+                "2000-01-01T21:00",
+                "2000-01-02T00:00",
+                "2000-01-04T00:00",
+            ],
+            dtype="datetime64[ns]",
+        )
+        self.kp = Kp(
+            KpIndex.from_arrays(times, np.array([5.0, 2.0, 4.33, 1.0, np.nan]))
+        )
+
+    def test_get_max_of_day(self):
+        period = Period(datetime(2000, 1, 1, 0, 0), datetime(2000, 1, 1, 23, 59))
+        self.assertEqual(self.kp.get_max_of_day(period), 4.33)
+        # 両端の時刻を含む
+        period = Period(datetime(2000, 1, 1, 21, 0), datetime(2000, 1, 2, 0, 0))
+        self.assertEqual(self.kp.get_max_of_day(period), 4.33)
+        period = Period(datetime(2000, 1, 3, 0, 0), datetime(2000, 1, 3, 23, 59))
+        self.assertTrue(np.isnan(self.kp.get_max_of_day(period)))
+
+    def test_max_of_days(self):
+        days = [
+            date(1999, 12, 31),
+            date(2000, 1, 2),
+            date(2000, 1, 1),
+            date(2000, 1, 3),
+        ]
+        np.testing.assert_array_equal(
+            self.kp.max_of_days(days), [np.nan, 5.0, 4.33, np.nan]
+        )
+        # 値がNaNのみの日
+        self.assertTrue(np.isnan(self.kp.max_of_days([date(2000, 1, 4)])[0]))
+
+    def test_shared_index_is_loaded_once(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            indexes = list(executor.map(lambda _: get_kp_index(), range(8)))
+        self.assertTrue(all(index is indexes[0] for index in indexes))
+        self.assertIs(Kp().index, indexes[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Optional
+from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
+
+from src.constants.time_relation import TimeUnit
+from src.domain.magdas_station import EeIndexStation
+from src.domain.station_params import Period, StationParam
+from src.service.calc_utils.moving_avg import calc_moving_avgs
+from src.service.ee_index.factory_ee import EeFactory
+from src.service.file_exporter.build_iaga import EeIndexIagaService, IagaValues
+
+# (完了した観測点・月の数, 総数)
+ProgressCallback = Callable[[int, int], None]
+
+
+def parse_stations(station_codes: List[str]) -> List[EeIndexStation]:
+    """観測点コードのリスト、または["all"]を観測点のリストに変換"""
+    if [code.lower() for code in station_codes] == ["all"]:
+        return list(EeIndexStation)
+    return [EeIndexStation[code.upper()] for code in station_codes]
+
+
+def split_months(start_date: date, end_date: date) -> List[tuple[date, date]]:
+    """期間を月ごとに分割する。最初と最後の月は期間の範囲に切り詰める"""
+    months = []
+    month_start = start_date
+    while month_start <= end_date:
+        next_month = (month_start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        month_end = min(next_month - timedelta(days=1), end_date)
+        months.append((month_start, month_end))
+        month_start = next_month
+    return months
+
+
+@dataclass
+class BulkExportResult:
+    path: str
+    filenames: List[str]
+
+
+class EeBulkExportUsecase:
+    """複数の観測点のEE-indexを、観測点・月ごとのIAGA形式のファイルにまとめたzipを作成する
+
+    月ごとに1つのEeFactoryを使うため、EDstと各観測点のH成分の計算は月ごとに1回で、
+    全ての観測点のER・EUELの計算で共有される。
+    """
+
+    def __init__(
+        self, stations: List[EeIndexStation], start_date: date, end_date: date
+    ):
+        if not stations:
+            raise ValueError("stations must not be empty")
+        if start_date > end_date:
+            raise ValueError("start_date must be before end_date")
+        self.stations = stations
+        self.start_date = start_date
+        self.end_date = end_date
+
+    @property
+    def filename(self) -> str:
+        return f"ee_index_bulk_{self.start_date.strftime('%Y-%m-%d')}_to_{self.end_date.strftime('%Y-%m-%d')}.zip"
+
+    def total(self) -> int:
+        return len(split_months(self.start_date, self.end_date)) * len(self.stations)
+
+    def export(
+        self, output_path: str, on_progress: Optional[ProgressCallback] = None
+    ) -> BulkExportResult:
+        """zipをoutput_pathに書き出す。書き出し中のファイルは.tmpとし、完了後に置き換える"""
+        total = self.total()
+        done = 0
+        filenames = []
+        tmp_path = f"{output_path}.tmp"
+        with ZipFile(tmp_path, "w", compression=ZIP_DEFLATED) as zipf:
+            for month_start, month_end in split_months(self.start_date, self.end_date):
+                start_ut = datetime.combine(month_start, datetime.min.time())
+                end_ut = datetime.combine(month_end, datetime.min.time()) + timedelta(
+                    hours=23, minutes=59
+                )
+                factory = EeFactory()
+                period = Period(start_ut, end_ut)
+                edst_raw = factory.create_edst(period).calc_edst()
+                edst_1h, edst_6h = calc_moving_avgs(
+                    edst_raw,
+                    [
+                        (TimeUnit.ONE_HOUR.min, 30),
+                        (TimeUnit.SIX_HOURS.min, TimeUnit.THREE_HOURS.min),
+                    ],
+                )
+                for station in self.stations:
+                    er = factory.create_er(StationParam(station, period)).calc_er()
+                    values = IagaValues(
+                        edst_1h=edst_1h, edst_6h=edst_6h, er=er, euel=er - edst_raw
+                    )
+                    filenames.append(
+                        self._write_iaga(zipf, station, start_ut, end_ut, values)
+                    )
+                    done += 1
+                    if on_progress:
+                        on_progress(done, total)
+        os.replace(tmp_path, output_path)
+        return BulkExportResult(path=output_path, filenames=filenames)
+
+    def _write_iaga(
+        self,
+        zipf: ZipFile,
+        station: EeIndexStation,
+        start_ut: datetime,
+        end_ut: datetime,
+        values: IagaValues,
+    ) -> str:
+        filename = f"{station.code.lower()}{start_ut.strftime('%Y%m%d')}.iaga"
+        zinfo = ZipInfo(filename, date_time=time.localtime()[:6])
+        zinfo.compress_type = zipf.compression
+        with zipf.open(zinfo, "w") as file:
+            for chunk in EeIndexIagaService().iter_iaga_file(
+                station, start_ut, end_ut, values
+            ):
+                file.write(chunk)
+        return filename
+
+
+def run_bulk_export_job(
+    output_dir: str,
+    on_progress: ProgressCallback,
+    station_codes: tuple[str, ...],
+    start_date: date,
+    end_date: date,
+) -> str:
+    """JobQueueで実行する、複数の観測点のzipの作成"""
+    usecase = EeBulkExportUsecase(
+        parse_stations(list(station_codes)), start_date, end_date
+    )
+    usecase.export(os.path.join(output_dir, usecase.filename), on_progress)
+    return usecase.filename
@@ -1,12 +1,15 @@
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional
 
+import numpy as np
 from src.constants.time_relation import TimeUnit
 from src.domain.magdas_station import EeIndexStation
 from src.domain.station_params import Period, StationParam
 from src.service.calc_utils.sanitize_np import sanitize_np
+from src.service.ee_index.calc_ee_daily import DailyEe, EeComputationMode
 from src.service.ee_index.factory_ee import EeFactory
+from src.utils.date import MinuteLabelRange, minute_labels
 
 
 @dataclass
@@ -14,31 +17,67 @@ class EeData:
     er: List
     edst: List
     euel: List
-    minuteLabels: List[str]
+    minuteLabels: Optional[List[str]]
+    minuteLabelRange: Optional[MinuteLabelRange] = None
+
+
+@dataclass
+class EeArrays:
+    """NaNを含むNumPy配列のままのEE-index"""
+
+    er: np.ndarray
+    edst: np.ndarray
+    euel: np.ndarray
 
 
 class EeIndexByDaysUsecase:
-    def __init__(self, start_ut: datetime, days: int, station: EeIndexStation):
+    def __init__(
+        self,
+        start_ut: datetime,
+        days: int,
+        station: EeIndexStation,
+        mode: EeComputationMode = EeComputationMode.WHOLE_PERIOD,
+    ):
+        """
+        Args:
+          mode: WHOLE_PERIODは期間全体、DAILYはUT日ごとの中央値をベースラインとする
+        """
         self.start_ut = start_ut
         self.days = days
         self.station = station
+        self.mode = mode
 
-    def get_ee_data(self) -> EeData:
+    def get_ee_arrays(self) -> EeArrays:
         period = Period(self.start_ut, self.start_ut + timedelta(days=self.days))
         params = StationParam(station=self.station, period=period)
+        if self.mode == EeComputationMode.DAILY:
+            values = DailyEe().calc(params)
+            return EeArrays(er=values.er, edst=values.edst, euel=values.euel)
         factory = EeFactory()
         er = factory.create_er(params)
         edst = factory.create_edst(period)
         euel = factory.create_euel(params)
+        return EeArrays(er=er.calc_er(), edst=edst.calc_edst(), euel=euel.calc_euel())
+
+    def get_ee_data(self, compact_labels: bool = False) -> EeData:
+        """
+        Args:
+          compact_labels: Trueの場合、分ごとのラベルの代わりに開始時刻・間隔・個数を返す
+        """
+        arrays = self.get_ee_arrays()
         return EeData(
-            er=sanitize_np(er.calc_er()),
-            edst=sanitize_np(edst.calc_edst()),
-            euel=sanitize_np(euel.calc_euel()),
-            minuteLabels=self._minute_labels(),
+            er=sanitize_np(arrays.er),
+            edst=sanitize_np(arrays.edst),
+            euel=sanitize_np(arrays.euel),
+            minuteLabels=None if compact_labels else self._minute_labels(),
+            minuteLabelRange=(
+                self._minute_label_range(len(arrays.er)) if compact_labels else None
+            ),
         )
 
     def _minute_labels(self) -> List[str]:
-        return [
-            (self.start_ut + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M")
-            for i in range(self.days * TimeUnit.ONE_DAY.min)
-        ]
+        return minute_labels(self.start_ut, self.days * TimeUnit.ONE_DAY.min)
+
+    def _minute_label_range(self, count: int) -> MinuteLabelRange:
+        """値の配列と同じ個数の時刻。columnar形式のcountと同じ定義"""
+        return MinuteLabelRange.from_start(self.start_ut, count)
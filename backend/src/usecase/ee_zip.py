@@ -1,11 +1,13 @@
+import os
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterator, Optional
 
 from src.constants.time_relation import TimeUnit
 from src.domain.magdas_station import EeIndexStation
 from src.domain.station_params import Period, StationParam
 from src.model.file import FileModel
-from src.service.calc_utils.moving_avg import calc_moving_avg
+from src.service.calc_utils.moving_avg import calc_moving_avgs
 from src.service.ee_index.factory_ee import EeFactory
 from src.service.file_exporter.build_iaga import EeIndexIagaService, IagaValues
 from src.service.file_exporter.zip_create import ZipService
@@ -17,6 +19,12 @@ class ZipData:
     filename: str
 
 
+@dataclass
+class ZipStream:
+    chunks: Iterator[bytes]
+    filename: str
+
+
 class EeIndexZipUsecase:
     def __init__(self, station: EeIndexStation):
         self.station = station
@@ -33,26 +41,97 @@ class EeIndexZipUsecase:
 
         return self._build_zip(start_ut, end_ut)
 
+    def stream_ee_zip_by_range(self, ut_date: datetime, end_ut: datetime) -> ZipStream:
+        start_ut = ut_date.replace(hour=0, minute=0)
+        end_ut = end_ut.replace(hour=23, minute=59)
+
+        return self._stream_zip(start_ut, end_ut)
+
+    def stream_ee_zip_by_days(self, ut_date: datetime, days: int) -> ZipStream:
+        start_ut = ut_date.replace(hour=0, minute=0)
+        end_ut = start_ut + timedelta(days=days - 1, hours=23, minutes=59)
+
+        return self._stream_zip(start_ut, end_ut)
+
+    def save_ee_zip_by_range(
+        self,
+        output_dir: str,
+        ut_date: datetime,
+        end_ut: datetime,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> str:
+        """stream_ee_zip_by_rangeと同じzipをoutput_dirに保存する
+
+        Args:
+          on_progress: (書き出した日数, 総日数)を1日ごとに通知する
+        Return:
+          保存したファイル名
+        """
+        start_ut = ut_date.replace(hour=0, minute=0)
+        end_ut = end_ut.replace(hour=23, minute=59)
+        days = (end_ut - start_ut).days + 1
+        filename = self._zip_filename(start_ut, end_ut)
+
+        values = self._calc_iaga_values(self.station, start_ut, end_ut)
+        iaga_chunks = EeIndexIagaService().iter_iaga_file(
+            self.station, start_ut, end_ut, values
+        )
+
+        def report_progress(chunks: Iterator[bytes]) -> Iterator[bytes]:
+            # 最初のchunkはheader、以降は1日分ずつ
+            for i, chunk in enumerate(chunks):
+                yield chunk
+                if i > 0 and on_progress:
+                    on_progress(i, days)
+
+        path = os.path.join(output_dir, filename)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            for data in ZipService().stream(
+                self._iaga_filename(self.station, start_ut),
+                report_progress(iaga_chunks),
+            ):
+                f.write(data)
+        os.replace(tmp_path, path)
+        return filename
+
+    def _zip_filename(self, start_ut: datetime, end_ut: datetime) -> str:
+        return f"ee_index_{start_ut.strftime('%Y-%m-%d')}_to_{end_ut.strftime('%Y-%m-%d')}.zip"
+
+    def _iaga_filename(self, station: EeIndexStation, start_ut: datetime) -> str:
+        return f"{station.code.lower()}{start_ut.strftime('%Y%m%d')}.iaga"
+
     def _build_zip(self, start_ut: datetime, end_ut: datetime) -> ZipData:
         zip_data = self._export_ee_as_iaga_zip(self.station, start_ut, end_ut)
-        filename = f"ee_index_{start_ut.strftime('%Y-%m-%d')}_to_{end_ut.strftime('%Y-%m-%d')}.zip"
+        filename = self._zip_filename(start_ut, end_ut)
         return ZipData(zip_base64=zip_data, filename=filename)
 
-    def _export_ee_as_iaga_zip(
+    def _stream_zip(self, start_ut: datetime, end_ut: datetime) -> ZipStream:
+        return ZipStream(
+            chunks=self._iter_ee_as_iaga_zip(self.station, start_ut, end_ut),
+            filename=self._zip_filename(start_ut, end_ut),
+        )
+
+    def _iter_ee_as_iaga_zip(
         self, station: EeIndexStation, start_ut: datetime, end_ut: datetime
-    ) -> str:
+    ) -> Iterator[bytes]:
         """
-        Generate and download EE index data for a given station and time period.
-
-        Args:
-            station: The station to get data for
-            start_ut: Start datetime
-            end_ut: End datetime
+        _export_ee_as_iaga_zipと同じzipを少しずつ返す
 
-        Returns:
-            Base64 encoded zip file containing the data
+        EE-indexの計算は最初のchunkを要求された時点で行う。IAGA形式の文字列は
+        1日ずつ作成してzipに書き込むため、全期間の文字列・zipをメモリに保持しない
         """
+        values = self._calc_iaga_values(station, start_ut, end_ut)
+        iaga_chunks = EeIndexIagaService().iter_iaga_file(
+            station, start_ut, end_ut, values
+        )
+        yield from ZipService().stream(
+            self._iaga_filename(station, start_ut), iaga_chunks
+        )
 
+    def _calc_iaga_values(
+        self, station: EeIndexStation, start_ut: datetime, end_ut: datetime
+    ) -> IagaValues:
         period = Period(start_ut, end_ut)
         params = StationParam(station, period)
 
@@ -61,28 +140,60 @@ class EeIndexZipUsecase:
         edst = factory.create_edst(period)
         euel = factory.create_euel(params)
 
-        er_values = er.calc_er()
-        edst_raw = edst.calc_edst()
-        euel_values = euel.calc_euel()
-
-        edst_1h_values = calc_moving_avg(edst_raw, TimeUnit.ONE_HOUR.min, 30)
-        edst_6h_values = calc_moving_avg(
-            edst_raw, TimeUnit.SIX_HOURS.min, TimeUnit.THREE_HOURS.min
+        edst_1h, edst_6h = calc_moving_avgs(
+            edst.calc_edst(),
+            [
+                (TimeUnit.ONE_HOUR.min, 30),
+                (TimeUnit.SIX_HOURS.min, TimeUnit.THREE_HOURS.min),
+            ],
+        )
+        return IagaValues(
+            edst_1h=edst_1h,
+            edst_6h=edst_6h,
+            er=er.calc_er(),
+            euel=euel.calc_euel(),
         )
 
+    def _export_ee_as_iaga_zip(
+        self, station: EeIndexStation, start_ut: datetime, end_ut: datetime
+    ) -> str:
+        """
+        Generate and download EE index data for a given station and time period.
+
+        Args:
+            station: The station to get data for
+            start_ut: Start datetime
+            end_ut: End datetime
+
+        Returns:
+            Base64 encoded zip file containing the data
+        """
+
+        values = self._calc_iaga_values(station, start_ut, end_ut)
         ee_index_iaga_service = EeIndexIagaService()
-        values = IagaValues(
-            edst_1h=edst_1h_values.tolist(),
-            edst_6h=edst_6h_values.tolist(),
-            er=er_values.tolist(),
-            euel=euel_values.tolist(),
-        )
         iaga_byte_file = ee_index_iaga_service.build_iaga_file(
             station, start_ut, end_ut, values
         )
-        filename = f"{station.code.lower()}{start_ut.strftime('%Y%m%d')}.iaga"
+        filename = self._iaga_filename(station, start_ut)
         zip_service = ZipService()
         zip_base64 = zip_service.create_base64(
             [FileModel(filename=filename, content=iaga_byte_file)]
         )
         return zip_base64
+
+
+def run_ee_zip_job(
+    output_dir: str,
+    on_progress: Callable[[int, int], None],
+    station_code: str,
+    start_date: date,
+    end_date: date,
+) -> str:
+    """JobQueueで実行する、1観測点のIAGA形式のzipの作成"""
+    usecase = EeIndexZipUsecase(EeIndexStation[station_code])
+    return usecase.save_ee_zip_by_range(
+        output_dir,
+        datetime.combine(start_date, datetime.min.time()),
+        datetime.combine(end_date, datetime.min.time()),
+        on_progress,
+    )
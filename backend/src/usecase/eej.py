@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from datetime import date, timedelta
 from typing import List, Optional
 
@@ -12,6 +13,7 @@ from src.service.calc_utils.nan_calculator import NanCalculator
 from src.service.calc_utils.sanitize_np import sanitize_np
 from src.service.ee_index.factory_ee import EeFactory
 from src.service.peculiar_eej import PeculiarEejService
+from src.utils.date import minute_labels
 
 
 class EejRow(BaseModel):
@@ -25,6 +27,15 @@ class EejResult(BaseModel):
     peculiarEejDates: List[str]
 
 
+@dataclass
+class EejArrays:
+    """NaNを含むNumPy配列のままの地域ごとのEUEL(start_ltから1分ごと)"""
+
+    dip_euel: np.ndarray
+    offdip_euel: np.ndarray
+    peculiar_eej_dates: List[str]
+
+
 class EejUsecase:
     def __init__(self, start_lt, days, region: Region):
         self.start_lt = start_lt
@@ -52,33 +63,45 @@ class EejUsecase:
 
         return EejResult(data=eej_rows, peculiarEejDates=peculiar_eej_dates_str)
 
+    def execute_arrays(self) -> EejArrays:
+        """executeと同じ値を行オブジェクトにせず配列のまま返す"""
+        count = self.days * TimeUnit.ONE_DAY.min
+        dip_euel, offdip_euel = self._calc_local_euel()
+        return EejArrays(
+            dip_euel=dip_euel[:count],
+            offdip_euel=offdip_euel[:count],
+            peculiar_eej_dates=[
+                date.strftime("%Y-%m-%d") for date in self._get_peculiar_eej_dates()
+            ],
+        )
+
     def _get_peculiar_eej_dates(self) -> List[date]:
-        service = PeculiarEejService()
-        peculiar_eej_data = service.get_by_region(self.region)
-        return [data.date for data in peculiar_eej_data]
+        return PeculiarEejService().get_dates_by_region(self.region)
 
     def _calc_avg_euel(self, stations: List[EeIndexStation]) -> np.ndarray:
+        if not stations:
+            return np.array([])
         f = EeFactory()
         lt_period = Period(self.start_lt, self.start_lt + timedelta(days=self.days))
-
-        euel_values = []
-        for station in stations:
-            params = StationParam(station=station, period=lt_period).to_ut_params()
-            euel = f.create_euel(params)
-            euel_values.append(euel.calc_euel())
-
-        if euel_values:
-            return NanCalculator.nanmean(np.array(euel_values), axis=0)
-        else:
-            return np.array([])
+        ut_params_list = [
+            StationParam(station=station, period=lt_period).to_ut_params()
+            for station in stations
+        ]
+        er_matrix = f.create_er_batch(ut_params_list).calc_er()
+        euel_values = [
+            er_matrix[i] - f.create_edst(params.period).calc_edst()
+            for i, params in enumerate(ut_params_list)
+        ]
+        return NanCalculator.nanmean(np.array(euel_values), axis=0)
 
     def _minute_labels(self) -> List[str]:
-        return [
-            (self.start_lt + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M")
-            for i in range(self.days * TimeUnit.ONE_DAY.min)
-        ]
+        return minute_labels(self.start_lt, self.days * TimeUnit.ONE_DAY.min)
 
     def _get_local_euel(self) -> tuple[List[float | None], List[float | None]]:
+        dip_euel, offdip_euel = self._calc_local_euel()
+        return sanitize_np(dip_euel), sanitize_np(offdip_euel)
+
+    def _calc_local_euel(self) -> tuple[np.ndarray, np.ndarray]:
         if self.region != Region.SOUTH_AMERICA:
             raise ValueError(
                 "Only SOUTH_AMERICA region is supported for local euel calculation"
@@ -91,6 +114,8 @@ class EejUsecase:
 
         dip_euel = self._calc_avg_euel(dip_stations)
         offdip_euel = self._calc_avg_euel(offdip_stations)
-        dip_euel = calc_moving_avg(dip_euel, 180, 90)
-        offdip_euel = calc_moving_avg(offdip_euel, 180, 90)
-        return sanitize_np(dip_euel), sanitize_np(offdip_euel)
+        # dipとoff-dipは同じ長さのため、2行の配列としてまとめて計算
+        dip_euel, offdip_euel = calc_moving_avg(
+            np.vstack((dip_euel, offdip_euel)), 180, 90
+        )
+        return dip_euel, offdip_euel
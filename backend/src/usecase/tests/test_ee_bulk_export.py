@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+import warnings
+from datetime import date
+from unittest import mock
+from zipfile import ZipFile
+
+from src.domain.magdas_station import EeIndexStation
+from src.repository.gm_data import GMDataLoader, GMPeriodRepository
+from src.usecase.ee_bulk_export import EeBulkExportUsecase, split_months
+
+
+class TestSplitMonths(unittest.TestCase):
+    def test_split_months(self):
+        self.assertEqual(
+            split_months(date(2014, 1, 15), date(2014, 3, 2)),
+            [
+                (date(2014, 1, 15), date(2014, 1, 31)),
+                (date(2014, 2, 1), date(2014, 2, 28)),
+                (date(2014, 3, 1), date(2014, 3, 2)),
+            ],
+        )
+        self.assertEqual(
+            split_months(date(2014, 12, 31), date(2015, 1, 1)),
+            [
+                (date(2014, 12, 31), date(2014, 12, 31)),
+                (date(2015, 1, 1), date(2015, 1, 1)),
+            ],
+        )
+
+
+class TestEeBulkExport(unittest.TestCase):
+    def setUp(self):
+        warnings.filterwarnings("ignore", category=RuntimeWarning)
+        GMDataLoader.load_counter.clear()
+        patcher = mock.patch.object(
+            GMPeriodRepository, "_get_many_from_cache", return_value=None
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_one_file_per_station_month_and_load_once(self):
+        stations = [EeIndexStation.ANC, EeIndexStation.HUA]
+        usecase = EeBulkExportUsecase(stations, date(2014, 3, 31), date(2014, 4, 1))
+        progress = []
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, usecase.filename)
+            usecase.export(path, on_progress=lambda done, total: progress.append(done))
+            with ZipFile(path) as zipf:
+                names = zipf.namelist()
+
+        self.assertEqual(
+            names,
+            [
+                "anc20140331.iaga",
+                "hua20140331.iaga",
+                "anc20140401.iaga",
+                "hua20140401.iaga",
+            ],
+        )
+        self.assertEqual(progress, [1, 2, 3, 4])
+        # EDstの計算に全観測点を読み込むが、各観測点・日の読み込みは1回
+        counter = GMDataLoader.load_counter
+        self.assertEqual({n for n in counter.values()}, {1})
+        self.assertEqual(
+            {code for code, _ in counter}, {s.code for s in EeIndexStation}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import warnings
+from datetime import datetime
+from unittest import mock
+
+from src.domain.magdas_station import EeIndexStation
+from src.repository.gm_data import GMDataLoader, GMPeriodRepository
+from src.usecase.ee_by_days import EeIndexByDaysUsecase
+from src.usecase.ee_zip import EeIndexZipUsecase
+
+
+class TestEeLoadOnce(unittest.TestCase):
+    """1リクエスト内で各観測点の日ごとのデータが高々1回しか読み込まれないことを確認する"""
+
+    station = EeIndexStation.ANC
+    start_ut = datetime(2014, 4, 1, 0, 0)
+
+    def setUp(self):
+        warnings.filterwarnings("ignore", category=RuntimeWarning)
+        GMDataLoader.load_counter.clear()
+        # 年ごとのキャッシュは.mgdを読み込まないため、テストでは使用しない
+        patcher = mock.patch.object(
+            GMPeriodRepository, "_get_many_from_cache", return_value=None
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assert_loaded_at_most_once(self):
+        counter = GMDataLoader.load_counter
+        self.assertTrue(counter)
+        duplicated = {key: n for key, n in counter.items() if n > 1}
+        self.assertEqual(duplicated, {})
+        loaded_stations = {code for code, _ in counter}
+        self.assertEqual(loaded_stations, {s.code for s in EeIndexStation})
+
+    def test_ee_by_days(self):
+        EeIndexByDaysUsecase(self.start_ut, 2, self.station).get_ee_data()
+        self.assert_loaded_at_most_once()
+
+    def test_ee_zip_by_days(self):
+        EeIndexZipUsecase(self.station).get_ee_zip_by_days(self.start_ut, 2)
+        self.assert_loaded_at_most_once()
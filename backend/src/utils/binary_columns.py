@@ -0,0 +1,64 @@
+import json
+from datetime import datetime
+from typing import Any, Iterator
+
+import numpy as np
+
+# 列ごとのリトルエンディアンの生データ。Acceptヘッダーまたは format=binary で指定する
+BINARY_MEDIA_TYPE = "application/vnd.magdas.columns"
+BINARY_MAGIC = b"MAGCOL1\x00"
+TIME_COLUMN = "time"
+_ALIGNMENT = 8
+
+
+def minute_timestamps(start: datetime, count: int) -> np.ndarray:
+    """startから1分ごとのcount個の時刻(1970-01-01 00:00からのミリ秒, float64)
+
+    タイムゾーンは付与しない。EE-indexはUT、EEJはLTの時刻をそのまま表す
+    """
+    minutes = np.datetime64(start, "m") + np.arange(count, dtype=np.int64)
+    return minutes.astype("datetime64[ms]").astype(np.int64).astype("<f8")
+
+
+def encode_columns(
+    start: datetime, columns: dict[str, np.ndarray], meta: dict[str, Any] | None = None
+) -> Iterator[bytes]:
+    """1分値の列をバイナリ形式で順にエンコードする(StreamingResponse向け)
+
+    形式:
+      magic(8byte) | header長(uint32 LE) | header(JSON, 8byte境界まで空白で埋める)
+      | time(float64 LE) | 各列(float32 LE) ...
+    headerは {"rows": 行数, "columns": [{"name", "dtype"}, ...], "meta": {...}}。
+    欠損値はNaNのまま格納する。
+
+    Args:
+      start: 最初の行の時刻
+      columns: {列名: 値}。全ての列は同じ長さ
+      meta: headerに含める追加情報
+    """
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("All columns must have the same length.")
+    rows = lengths.pop() if lengths else 0
+
+    data = {TIME_COLUMN: minute_timestamps(start, rows)}
+    for name, values in columns.items():
+        data[name] = np.ascontiguousarray(values, dtype="<f4")
+
+    header = json.dumps(
+        {
+            "rows": rows,
+            "columns": [
+                {"name": name, "dtype": "float64" if name == TIME_COLUMN else "float32"}
+                for name in data
+            ],
+            "meta": meta or {},
+        }
+    ).encode("utf-8")
+    prefix_length = len(BINARY_MAGIC) + 4
+    padding = -(prefix_length + len(header)) % _ALIGNMENT
+    header += b" " * padding
+
+    yield BINARY_MAGIC + np.uint32(len(header)).astype("<u4").tobytes() + header
+    for values in data.values():
+        yield values.tobytes()
@@ -1,13 +1,49 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from typing import List
 
+import numpy as np
+from numpy.typing import NDArray
 from src.domain.magdas_station import EeIndexStation
 
+MINUTE_LABEL_FORMAT = "%Y-%m-%d %H:%M"
+
 
 def str_to_datetime(str_date: str) -> datetime:
     """Converts a string to a date object"""
     return datetime.strptime(str_date, "%Y-%m-%d")
 
 
+def format_minute_labels(minutes: NDArray[np.datetime64]) -> List[str]:
+    """datetime64の配列を"%Y-%m-%d %H:%M"形式の文字列に一括変換"""
+    labels = np.datetime_as_string(minutes.astype("datetime64[m]"), unit="m")
+    return np.char.replace(labels, "T", " ").tolist()
+
+
+def minute_labels(start: datetime, count: int) -> List[str]:
+    """startから1分ごとのcount個のラベル"""
+    minutes = np.datetime64(start, "m") + np.arange(count, dtype=np.int64)
+    return format_minute_labels(minutes)
+
+
+@dataclass
+class MinuteLabelRange:
+    """1分ごとのラベルを開始時刻・間隔・個数で表したもの
+
+    minute_labelsの代わりにAPIで返すことで、ラベルの文字列をデータ数だけ送らずに済む
+    """
+
+    start: str
+    stepMinutes: int
+    count: int
+
+    @classmethod
+    def from_start(cls, start: datetime, count: int) -> "MinuteLabelRange":
+        return cls(
+            start=start.strftime(MINUTE_LABEL_FORMAT), stepMinutes=1, count=count
+        )
+
+
 class DateUtils:
 
     @staticmethod
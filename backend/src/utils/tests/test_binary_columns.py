@@ -0,0 +1,52 @@
+import json
+import unittest
+from datetime import datetime
+
+import numpy as np
+from src.utils.binary_columns import BINARY_MAGIC, encode_columns
+
+
+class TestEncodeColumns(unittest.TestCase):
+    def _decode(self, body: bytes):
+        self.assertEqual(body[: len(BINARY_MAGIC)], BINARY_MAGIC)
+        offset = len(BINARY_MAGIC)
+        header_length = int(np.frombuffer(body, "<u4", 1, offset)[0])
+        offset += 4
+        header = json.loads(body[offset : offset + header_length])
+        offset += header_length
+        self.assertEqual(offset % 8, 0)
+        columns = {}
+        for column in header["columns"]:
+            dtype = np.dtype("<f8" if column["dtype"] == "float64" else "<f4")
+            columns[column["name"]] = np.frombuffer(body, dtype, header["rows"], offset)
+            offset += dtype.itemsize * header["rows"]
+        self.assertEqual(offset, len(body))
+        return header, columns
+
+    def test_round_trip(self):
+        er = np.array([1.5, np.nan, -2.25], dtype=np.float64)
+        euel = np.array([0.0, 3.0, np.nan], dtype=np.float32)
+        body = b"".join(
+            encode_columns(datetime(2014, 4, 1, 23, 59), {"er": er, "euel": euel})
+        )
+        header, columns = self._decode(body)
+
+        self.assertEqual(header["rows"], 3)
+        self.assertEqual([c["name"] for c in header["columns"]], ["time", "er", "euel"])
+        np.testing.assert_array_equal(columns["er"], er.astype(np.float32))
+        np.testing.assert_array_equal(columns["euel"], euel)
+        times = columns["time"].astype("datetime64[ms]")
+        self.assertEqual(str(times[0]), "2014-04-01T23:59:00.000")
+        self.assertEqual(str(times[2]), "2014-04-02T00:01:00.000")
+
+    def test_different_lengths(self):
+        with self.assertRaises(ValueError):
+            list(
+                encode_columns(
+                    datetime(2014, 4, 1), {"a": np.zeros(2), "b": np.zeros(3)}
+                )
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -58,3 +58,94 @@ def test_all(c):
         c.run(f'set "pythonpath=%PATH%;{path}" && python -m unittest')
     else:
         c.run(f'export PYTHONPATH="$PYTHONPATH:{path}" && python -m unittest')
+
+
+@task
+def backfill_edst(c, start, end, force=False):
+    """UT日ごとのEDstを計算してStorage/edstに保存
+    Example:
+        inv backfill-edst --start 2014-01-01 --end 2014-12-31
+    """
+    args = f"--start {start} --end {end}" + (" --force" if force else "")
+    path = os.path.abspath(os.path.dirname(__file__))
+    if os.name == "nt":
+        c.run(
+            f'set "pythonpath=%PATH%;{path}" && python src/cli/backfill_edst.py {args}'
+        )
+    else:
+        c.run(
+            f'export PYTHONPATH="$PYTHONPATH:{path}" && python src/cli/backfill_edst.py {args}'
+        )
+
+
+@task
+def build_gm_cache(c, start_year, end_year, stations="all", force=False):
+    """観測点・年ごとのh/d/z/fのキャッシュをStorage/gm_cacheに作成
+    Example:
+        inv build-gm-cache --start-year 2014 --end-year 2015 --stations ANC,HUA
+    """
+    args = f"--start-year {start_year} --end-year {end_year} --stations {stations}"
+    args += " --force" if force else ""
+    path = os.path.abspath(os.path.dirname(__file__))
+    if os.name == "nt":
+        c.run(
+            f'set "pythonpath=%PATH%;{path}" && python src/cli/build_gm_cache.py {args}'
+        )
+    else:
+        c.run(
+            f'export PYTHONPATH="$PYTHONPATH:{path}" && python src/cli/build_gm_cache.py {args}'
+        )
+
+
+@task
+def export_ee_bulk(c, start, end, output, stations="all"):
+    """観測点・月ごとのIAGA形式のファイルをまとめたzipを作成
+    Example:
+        inv export-ee-bulk --start 2014-01-01 --end 2014-12-31 --output ee_index_2014.zip
+    """
+    args = f"--start {start} --end {end} --stations {stations} --output {output}"
+    path = os.path.abspath(os.path.dirname(__file__))
+    if os.name == "nt":
+        c.run(
+            f'set "pythonpath=%PATH%;{path}" && python src/cli/export_ee_bulk.py {args}'
+        )
+    else:
+        c.run(
+            f'export PYTHONPATH="$PYTHONPATH:{path}" && python src/cli/export_ee_bulk.py {args}'
+        )
+
+
+@task
+def build_csv_snapshots(c, force=False):
+    """Storage内のCSVから読み込み用のスナップショット(xxx.snapshot.npz)を作成
+    Example:
+        inv build-csv-snapshots
+    """
+    args = "--force" if force else ""
+    path = os.path.abspath(os.path.dirname(__file__))
+    if os.name == "nt":
+        c.run(
+            f'set "pythonpath=%PATH%;{path}" && python src/cli/build_csv_snapshots.py {args}'
+        )
+    else:
+        c.run(
+            f'export PYTHONPATH="$PYTHONPATH:{path}" && python src/cli/build_csv_snapshots.py {args}'
+        )
+
+
+@task
+def import_sqlite(c, tables="all"):
+    """Storage内のCSVをSQLiteのデータベース(Storage/magdas.sqlite3)にインポート
+    Example:
+        inv import-sqlite --tables kp,peak_euel
+    """
+    args = f"--tables {tables}"
+    path = os.path.abspath(os.path.dirname(__file__))
+    if os.name == "nt":
+        c.run(
+            f'set "pythonpath=%PATH%;{path}" && python src/cli/import_sqlite.py {args}'
+        )
+    else:
+        c.run(
+            f'export PYTHONPATH="$PYTHONPATH:{path}" && python src/cli/import_sqlite.py {args}'
+        )
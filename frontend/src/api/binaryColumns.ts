@@ -0,0 +1,61 @@
+export const BINARY_MEDIA_TYPE = "application/vnd.magdas.columns";
+
+const MAGIC = "MAGCOL1\0";
+
+type ColumnDtype = "float64" | "float32";
+
+type BinaryColumnsHeader = {
+  rows: number;
+  columns: { name: string; dtype: ColumnDtype }[];
+  meta: Record<string, unknown>;
+};
+
+export type BinaryColumns = {
+  // 1970-01-01 00:00 からのミリ秒 (タイムゾーンなしの時刻)
+  time: Float64Array;
+  columns: Record<string, Float32Array>;
+  meta: Record<string, unknown>;
+};
+
+// magic(8byte) | header長(uint32 LE) | header(JSON) | time(float64 LE) | 各列(float32 LE)
+export const decodeBinaryColumns = (buffer: ArrayBuffer): BinaryColumns => {
+  const magic = new TextDecoder().decode(
+    new Uint8Array(buffer, 0, MAGIC.length)
+  );
+  if (magic !== MAGIC) {
+    throw new Error("Invalid binary columns format");
+  }
+  const headerLength = new DataView(buffer).getUint32(MAGIC.length, true);
+  const headerOffset = MAGIC.length + 4;
+  const header: BinaryColumnsHeader = JSON.parse(
+    new TextDecoder().decode(
+      new Uint8Array(buffer, headerOffset, headerLength)
+    )
+  );
+
+  let offset = headerOffset + headerLength;
+  let time = new Float64Array(0);
+  const columns: Record<string, Float32Array> = {};
+  for (const { name, dtype } of header.columns) {
+    if (dtype === "float64") {
+      // headerは8byte境界まで埋められているため、コピーせずに参照できる
+      const values = new Float64Array(buffer, offset, header.rows);
+      offset += values.byteLength;
+      if (name === "time") time = values;
+    } else {
+      // float32の列の後ろは4byte境界のみ保証される
+      const values = new Float32Array(buffer, offset, header.rows);
+      offset += values.byteLength;
+      columns[name] = values;
+    }
+  }
+  return { time, columns, meta: header.meta };
+};
+
+// NaN を null に置き換えた配列 (JSON のレスポンスと同じ形)
+export const toNullableArray = (values: Float32Array): (number | null)[] =>
+  Array.from(values, (v) => (Number.isNaN(v) ? null : v));
+
+// タイムゾーンなしの時刻を "YYYY-MM-DD HH:mm" に変換
+export const formatMinuteLabel = (time: number): string =>
+  new Date(time).toISOString().slice(0, 16).replace("T", " ");
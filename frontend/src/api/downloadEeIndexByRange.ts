@@ -1,4 +1,4 @@
-import { apiClient } from "./config";
+import { apiClient, apiURL } from "./config";
 
 export type DownloadEeIndexByRangeReq = {
   startDate: string;
@@ -20,3 +20,12 @@ export const fetchCustomDateFile = async (
   });
   return resp.data;
 };
+
+// application/zip をストリーミングで返すエンドポイントの URL
+// ブラウザが直接ファイルとして保存するため、zip 全体をメモリに保持しない
+export const buildCustomDateFileStreamUrl = (
+  req: DownloadEeIndexByRangeReq
+): string => {
+  const params = new URLSearchParams(req);
+  return `${apiURL}/download/ee-index/by-range/stream?${params.toString()}`;
+};
@@ -1,3 +1,4 @@
+import { BINARY_MEDIA_TYPE, decodeBinaryColumns } from "./binaryColumns";
 import { apiClient } from "./config";
 
 export type EeIndexReq = {
@@ -23,3 +24,27 @@ export const fetchEeIndexData = async (
   });
   return resp.data;
 };
+
+export type EeIndexColumns = {
+  time: Float64Array;
+  er: Float32Array;
+  edst: Float32Array;
+  euel: Float32Array;
+};
+
+export const decodeEeIndexBinary = (buffer: ArrayBuffer): EeIndexColumns => {
+  const { time, columns } = decodeBinaryColumns(buffer);
+  return { time, er: columns.er, edst: columns.edst, euel: columns.euel };
+};
+
+// 欠損値は NaN のまま返す
+export const fetchEeIndexBinary = async (
+  req: EeIndexReq
+): Promise<EeIndexColumns> => {
+  const resp = await apiClient.get("/ee-index", {
+    params: req,
+    headers: { Accept: BINARY_MEDIA_TYPE },
+    responseType: "arraybuffer",
+  });
+  return decodeEeIndexBinary(resp.data);
+};
@@ -1,3 +1,9 @@
+import {
+  BINARY_MEDIA_TYPE,
+  decodeBinaryColumns,
+  formatMinuteLabel,
+  toNullableArray,
+} from "./binaryColumns";
 import { apiClient } from "./config";
 
 export type EeJReq = {
@@ -23,3 +29,25 @@ export const fetchEejData = async (req: EeJReq): Promise<EeJResp> => {
   });
   return resp.data;
 };
+
+// binary 形式のレスポンスを JSON と同じ EeJResp に変換する
+export const decodeEejBinary = (buffer: ArrayBuffer): EeJResp => {
+  const { time, columns, meta } = decodeBinaryColumns(buffer);
+  const dipEuel = toNullableArray(columns.dipEuel);
+  const offdipEuel = toNullableArray(columns.offdipEuel);
+  const data = Array.from(time, (t, i) => ({
+    time: formatMinuteLabel(t),
+    dipEuel: dipEuel[i],
+    offdipEuel: offdipEuel[i],
+  }));
+  return { data, peculiarEejDates: meta.peculiarEejDates as string[] };
+};
+
+export const fetchEejBinary = async (req: EeJReq): Promise<EeJResp> => {
+  const resp = await apiClient.get("/eej", {
+    params: req,
+    headers: { Accept: BINARY_MEDIA_TYPE },
+    responseType: "arraybuffer",
+  });
+  return decodeEejBinary(resp.data);
+};
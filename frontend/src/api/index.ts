@@ -1,7 +1,15 @@
-export { fetchEeIndexData, type EeIndexResp, type EeIndexReq } from "./eeIndex";
+export {
+  fetchEeIndexData,
+  fetchEeIndexBinary,
+  decodeEeIndexBinary,
+  type EeIndexResp,
+  type EeIndexReq,
+  type EeIndexColumns,
+} from "./eeIndex";
 
 export {
   fetchCustomDateFile,
+  buildCustomDateFileStreamUrl,
   type DownloadEeIndexByRangeReq as DownloadCustomDateEeIndexReq,
   type DownloadEeIndexByRangeResp as DownloadCustomDateEeIndexResp,
 } from "./downloadEeIndexByRange";
@@ -12,4 +20,19 @@ export {
   type EeIndexDownloadByDateRangeResp,
 } from "./downloadEeIndexByDays";
 
-export { fetchEejData, type EeJResp, type EeJReq } from "./eej";
+export {
+  fetchEejData,
+  fetchEejBinary,
+  decodeEejBinary,
+  type EeJResp,
+  type EeJReq,
+} from "./eej";
+
+export {
+  submitEeIndexJobByRange,
+  fetchJobStatus,
+  buildJobResultUrl,
+  waitForJob,
+  type JobStatus,
+  type JobState,
+} from "./jobs";
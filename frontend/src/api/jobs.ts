@@ -0,0 +1,48 @@
+import { apiClient, apiURL } from "./config";
+import { type DownloadEeIndexByRangeReq } from "./downloadEeIndexByRange";
+
+export type JobState = "pending" | "running" | "done" | "failed";
+
+export type JobStatus = {
+  jobId: string;
+  state: JobState;
+  progress: number;
+  total: number;
+  fileName: string | null;
+  error: string | null;
+};
+
+// 同じ観測点・期間のジョブが実行中の場合は、そのジョブが返される
+export const submitEeIndexJobByRange = async (
+  req: DownloadEeIndexByRangeReq
+): Promise<JobStatus> => {
+  const resp = await apiClient.post("/jobs/ee-index/by-range", null, {
+    params: req,
+  });
+  return resp.data;
+};
+
+export const fetchJobStatus = async (jobId: string): Promise<JobStatus> => {
+  const resp = await apiClient.get(`/jobs/${jobId}`);
+  return resp.data;
+};
+
+export const buildJobResultUrl = (jobId: string): string =>
+  `${apiURL}/jobs/${jobId}/result`;
+
+// ジョブが完了するまで intervalMs ごとに状態を取得する
+export const waitForJob = async (
+  jobId: string,
+  onProgress?: (status: JobStatus) => void,
+  intervalMs = 1000
+): Promise<JobStatus> => {
+  for (;;) {
+    const status = await fetchJobStatus(jobId);
+    onProgress?.(status);
+    if (status.state === "done") return status;
+    if (status.state === "failed") {
+      throw new Error(status.error ?? "Job failed");
+    }
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+};
@@ -1,8 +1,9 @@
-import React, { useEffect } from "react";
+import React, { useEffect, useState } from "react";
 import { useForm } from "react-hook-form";
 import { downloadFile } from "../helper/fileDownload";
 import { STATIONS } from "@/utils/constant";
 import { DateSelection, type DateValue } from "@/components";
+import { type JobStatus } from "@/api";
 
 interface FormData {
   stationCode: string;
@@ -57,6 +58,11 @@ const PeriodSelectionForm: React.FC = () => {
     },
   });
 
+  const [jobStatus, setJobStatus] = useState<JobStatus | null>(null);
+  const [errorMessage, setErrorMessage] = useState<string | null>(null);
+  const isRunning =
+    jobStatus?.state === "pending" || jobStatus?.state === "running";
+
   const startDate = watch("startDate");
   const endDate = watch("endDate");
 
@@ -82,7 +88,14 @@ const PeriodSelectionForm: React.FC = () => {
       startDate: `${data.startDate.year}-${data.startDate.month}-${data.startDate.day}`,
       endDate: `${data.endDate.year}-${data.endDate.month}-${data.endDate.day}`,
     };
-    await downloadFile(props);
+    setErrorMessage(null);
+    try {
+      await downloadFile(props, setJobStatus);
+    } catch (e) {
+      setErrorMessage(e instanceof Error ? e.message : String(e));
+    } finally {
+      setJobStatus(null);
+    }
   };
 
   // データ取得可能な期間を定義
@@ -140,10 +153,21 @@ const PeriodSelectionForm: React.FC = () => {
         />
         <button
           type="submit"
-          className="w-full py-4 bg-indigo-600 text-white font-semibold rounded-md hover:bg-indigo-700 items-center"
+          disabled={isRunning}
+          className="w-full py-4 bg-indigo-600 text-white font-semibold rounded-md hover:bg-indigo-700 items-center disabled:bg-gray-400"
         >
-          確認
+          {isRunning ? "作成中..." : "確認"}
         </button>
+        {isRunning && (
+          <p className="text-gray-600 text-center">
+            {jobStatus?.total
+              ? `ファイルを作成しています (${jobStatus.progress} / ${jobStatus.total} 日)`
+              : "ファイルの作成を待っています"}
+          </p>
+        )}
+        {errorMessage && (
+          <p className="text-red-600 text-center">{errorMessage}</p>
+        )}
       </form>
     </div>
   );
@@ -1,10 +1,19 @@
-import { fetchCustomDateFile, type DownloadCustomDateEeIndexReq } from "@/api";
+import {
+  buildJobResultUrl,
+  submitEeIndexJobByRange,
+  waitForJob,
+  type DownloadCustomDateEeIndexReq,
+  type JobStatus,
+} from "@/api";
 
-export const downloadFile = async (fileParams: {
-  startDate: string;
-  endDate: string;
-  stationCode: string;
-}) => {
+export const downloadFile = async (
+  fileParams: {
+    startDate: string;
+    endDate: string;
+    stationCode: string;
+  },
+  onProgress?: (status: JobStatus) => void
+) => {
   const { startDate, endDate, stationCode } = fileParams;
 
   const req: DownloadCustomDateEeIndexReq = {
@@ -13,19 +22,14 @@ export const downloadFile = async (fileParams: {
     stationCode,
   };
 
-  const resp = await fetchCustomDateFile(req);
-  const byteCharacters = atob(resp.base64Zip);
-  const byteNumbers = new Uint8Array(byteCharacters.length);
-  for (let i = 0; i < byteCharacters.length; i++) {
-    byteNumbers[i] = byteCharacters.charCodeAt(i);
-  }
-  const blob = new Blob([byteNumbers], { type: resp.contentType });
-  const url = window.URL.createObjectURL(blob);
+  // サーバー側のジョブとして作成し、完了するまで状態を確認する
+  const job = await submitEeIndexJobByRange(req);
+  await waitForJob(job.jobId, onProgress);
+
+  // ファイル名はレスポンスの Content-Disposition で指定される
   const link = document.createElement("a");
-  link.href = url;
-  link.setAttribute("download", resp.fileName);
+  link.href = buildJobResultUrl(job.jobId);
   document.body.appendChild(link);
   link.click();
   link.remove();
-  window.URL.revokeObjectURL(url);
 };